@@ -60,6 +60,8 @@ def main():
         print("Use ARROW KEYS to move eyes (auto-centers after 5 seconds of inactivity)")
         print("Press W to wink left eye")
         print("Press Q to wink right eye")
+        print("Press C to toggle cyclops mode")
+        print("Move the MOUSE over the window to make the eyes follow it")
         print("Press SPACE to reset to default")
         
         while eyes.is_running():
@@ -69,6 +71,14 @@ def main():
                     eyes.quit()
                     return
                 
+                if event.type == pygame.MOUSEMOTION:
+                    # Map the pointer to normalized gaze coordinates (-1..1)
+                    mouse_x, mouse_y = event.pos
+                    eyes.look_at(
+                        mouse_x / screen_width * 2 - 1,
+                        mouse_y / screen_height * 2 - 1
+                    )
+                
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE:
                         eyes.quit()
@@ -103,6 +113,9 @@ def main():
                     elif event.key == pygame.K_q:
                         eyes.wink(left_eye=False)
                         print("Winking right eye")
+                    elif event.key == pygame.K_c:
+                        eyes.set_cyclops(not eyes.cyclops)
+                        print("Cyclops mode: " + ("ON" if eyes.cyclops else "OFF"))
                     elif event.key == pygame.K_SPACE:
                         # Reset to default
                         eyes.set_mood(DEFAULT)
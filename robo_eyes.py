@@ -8,20 +8,47 @@ Python implementation created as a standalone version
 """
 
 import pygame
-import random
 import time
 import math
+from collections import deque
 
 # Import utility modules
 from utils.animations_utils import AnimationsHandler
 from utils.moods_utils import MoodsHandler, DEFAULT, TIRED, SAD, EXCITED
 from utils.shapes_utils import ShapesHandler, N, NE, E, SE, S, SW, W, NW
+from utils.gaze_utils import GazeHandler, ONE_EURO, SPRING
+from utils.audio_utils import AudioReactiveHandler
+from utils.pacing_utils import FramePacer, CATCH_UP, DROP
+from utils.quality_utils import QualityGovernor, QUALITY_LEVELS
+from utils.palette_utils import PaletteHandler
+from utils.glow_utils import GlowHandler
+from utils.profiling_utils import AllocationMonitor
+from utils.command_log_utils import CommandLog
+from utils.capture_utils import CaptureHandler
+from utils.metrics_utils import RenderMetrics, MetricsServer
+from utils.renderer_utils import create_texture_canvas, SURFACE, TEXTURE
+from utils.async_utils import AsyncRunner
+from utils.postfx_utils import PostProcessHandler, SCANLINES, PHOSPHOR, DITHER, VIGNETTE
+from utils.layout_utils import create_eyes, layout_eyes, LEFT, RIGHT, MAX_EYES
+from utils.scheduler_utils import Animation, POSITION, LIDS, SIZE, OVERRIDE, ADDITIVE
 
 # Colors
 BLACK = (0, 0, 0)
 CYAN = (0, 255, 255)  # Using cyan color for the eyes as shown in the images
 WHITE = (255, 255, 255)
 
+# configure() applies settings in this order (position last, on the settled layout)
+CONFIGURE_ORDER = ("shape", "width", "height", "border_radius", "space_between", "mood", "position")
+
+# Unit steps from the resting position for each cardinal direction
+POSITION_STEPS = {
+    DEFAULT: (0, 0), N: (0, -1), NE: (1, -1), E: (1, 0), SE: (1, 1),
+    S: (0, 1), SW: (-1, 1), W: (-1, 0), NW: (-1, -1),
+}
+
+# Key state used when the display (and keyboard) belongs to a host
+NO_KEYS = {pygame.K_UP: False, pygame.K_DOWN: False, pygame.K_LEFT: False, pygame.K_RIGHT: False}
+
 class RoboEyes:
     def __init__(self):
         # Screen properties
@@ -29,17 +56,47 @@ class RoboEyes:
         self.screen_height = 320  # Default window height
         self.max_fps = 60  # Default max frame rate
         self.screen = None
-        self.clock = None
+        self.owns_display = False  # True when begin() created the window itself
+        self.backend = SURFACE  # Or TEXTURE: SDL2 Renderer with cached eye textures
+        self.window = None  # SDL2 window of the texture backend
+        self.pacer = FramePacer(self.max_fps)
         self.running = False
         
+        # Render target: the screen, or a smaller surface scaled up on present
+        self.canvas = None
+        self.render_scale = 1.0  # Effective scale: the user's, reduced further by the quality governor
+        self.user_render_scale = 1.0
+        self._present_surface = None  # Full-size 8-bit surface for scaled palette frames
+        self.palette = PaletteHandler(self)
+        self.flicker_enabled = True  # Cleared by the quality governor under load
+        self.quality = QualityGovernor(self)
+        self.allocations = None  # AllocationMonitor while allocation debugging is on
+        self.command_log = None  # CommandLog while commands are being recorded
+        self.replay_keys = None  # Arrow key state injected by a command log replay
+        self.captures = CaptureHandler(self)
+        self.metrics = None  # RenderMetrics while the metrics endpoint is enabled
+        self.metrics_server = None
+        self.runner = AsyncRunner(self)  # Drives frames from an asyncio loop in run()
+        self.postfx = PostProcessHandler(self)  # Retro-screen effects on the finished frame
+        
         # Force default mood on startup
         self.startup_complete = False
         
+        # Commands posted from other threads, applied at the start of a frame
+        self.command_queue = deque()
+        
         # Initialize utility handlers (will be properly initialized in begin())
         self.animations = None
         self.moods = None
         self.shapes = None
+        self.gaze = None
+        self.audio = None
+        self.glow = None
 
+        self._init_face_state()
+
+    def _init_face_state(self):
+        """Eye geometry, animation and manual-control state of a fresh face"""
         # Eye properties
         self.eye_l_width = 36
         self.eye_l_height = 36
@@ -48,14 +105,7 @@ class RoboEyes:
         self.eye_r_height = 36
         self.eye_r_border_radius = 8
         self.space_between = 10
-
-        # Current and target values for smooth transitions
-        self.eye_l_width_current = self.eye_l_width
-        self.eye_l_height_current = self.eye_l_height
-        self.eye_l_border_radius_current = self.eye_l_border_radius
-        self.eye_r_width_current = self.eye_r_width
-        self.eye_r_height_current = self.eye_r_height
-        self.eye_r_border_radius_current = self.eye_r_border_radius
+        self.layout_dirty = True  # Eye positions need recomputing before the next frame
 
         # Default values (used for resetting)
         self.eye_l_width_default = self.eye_l_width
@@ -65,17 +115,8 @@ class RoboEyes:
         self.eye_r_height_default = self.eye_r_height
         self.eye_r_border_radius_default = self.eye_r_border_radius
 
-        # Eye positions
-        self.eye_l_x = 0
-        self.eye_l_y = 0
-        self.eye_r_x = 0
-        self.eye_r_y = 0
-
-        # Target positions for smooth transitions
-        self.eye_l_x_next = 0
-        self.eye_l_y_next = 0
-        self.eye_r_x_next = 0
-        self.eye_r_y_next = 0
+        # Eye records (positions, per-eye offsets and smoothed sizes), one per eye
+        self.eyes = create_eyes(2, self.eye_l_width, self.eye_l_height, self.eye_l_border_radius)
 
         # Eyelid properties
         self.eyelids_closed_height = 0
@@ -93,8 +134,10 @@ class RoboEyes:
         self.curiosity = False
         self.h_flicker = False
         self.h_flicker_amplitude = 0
+        self.h_flicker_frequency = 10.0
         self.v_flicker = False
         self.v_flicker_amplitude = 0
+        self.v_flicker_frequency = 10.0
         self.auto_blinker = False
         self.auto_blinker_interval = 3
         self.auto_blinker_variation = 2
@@ -149,22 +192,61 @@ class RoboEyes:
         self.idle_mode_variation = 2
         self.idle_mode_last_time = time.time()
 
-    def begin(self, screen_width, screen_height, max_fps=60):
-        """Initialize the RoboEyes with screen dimensions and frame rate"""
+    def begin(self, screen_width, screen_height, max_fps=60, vsync=False, surface=None, backend=SURFACE):
+        """Initialize the RoboEyes with screen dimensions and frame rate
+
+        Pass a surface to render into it instead of opening a window; the
+        display and event loop then belong to a host (see utils.hosting_utils).
+        backend=TEXTURE draws through an SDL2 Renderer instead of pygame.draw.
+        """
         self.screen_width = screen_width
         self.screen_height = screen_height
         self.max_fps = max_fps
         
-        # Initialize pygame
-        pygame.init()
-        self.screen = pygame.display.set_mode((screen_width, screen_height))
-        pygame.display.set_caption("RoboEyes Python")
-        self.clock = pygame.time.Clock()
+        self.screen = surface
+        self.owns_display = surface is None
+        if self.owns_display:
+            # Initialize pygame
+            pygame.init()
+        self.backend = SURFACE
+        if backend == TEXTURE:
+            if not self.owns_display:
+                print("Warning: The texture backend needs its own window, using the surface backend.")
+            else:
+                created = create_texture_canvas("RoboEyes Python", (screen_width, screen_height), vsync)
+                if created is not None:
+                    self.window, self.screen = created
+                    self.backend = TEXTURE
+        if self.owns_display and vsync and self.screen is None:
+            # Vsync needs a renderer-backed display; fall back to software pacing if refused
+            try:
+                self.screen = pygame.display.set_mode((screen_width, screen_height), pygame.SCALED, vsync=1)
+            except pygame.error:
+                print("Warning: Vsync not available, using software frame pacing.")
+        if self.screen is None:
+            self.screen = pygame.display.set_mode((screen_width, screen_height))
+        if self.owns_display and self.backend == SURFACE:
+            pygame.display.set_caption("RoboEyes Python")
+        self.set_render_scale(self.user_render_scale)
+        self.pacer.set_fps(max_fps)
+        if self.backend == TEXTURE:
+            self.pacer.vsync = vsync
+        else:
+            self.pacer.vsync = vsync and self.owns_display and bool(self.screen.get_flags() & pygame.SCALED)
         
+        self._start_face()
+        self.running = True
+        return True
+
+    def _start_face(self):
+        """Create the utility handlers and settle the startup layout and mood"""
         # Initialize utility handlers
         self.animations = AnimationsHandler(self)
         self.moods = MoodsHandler(self)
         self.shapes = ShapesHandler(self)
+        self.gaze = GazeHandler(self)
+        self.audio = AudioReactiveHandler(self)
+        self.glow = GlowHandler(self)
         
         # Calculate initial eye positions
         self._calculate_eye_positions()
@@ -176,38 +258,124 @@ class RoboEyes:
         self.eye_r_width = int(self.eye_r_width * 0.95)  # Right eye slightly narrower
         self.eye_r_height = int(self.eye_r_height * 1.05)  # Right eye slightly taller
         
-        # Force default mood on startup
-        self.moods.set_mood(DEFAULT)
-        
-        self.running = True
+        # Force default mood on startup (snap, no cross-fade)
+        self.moods.set_mood(DEFAULT, duration=0)
         self.startup_complete = True
+
+    def reset(self):
+        """Return a begun face to its startup state, keeping its surface, pacer and capture workers
+
+        Lets a host hand a released face to a new session instead of building another.
+        """
+        self.command_queue.clear()
+        self.replay_keys = None
+        self.audio.stop()
+        self.set_debug_allocations(False)
+        self.stop_command_log()
+        self.stop_metrics_server()
+        self.captures.clear()
+        self.quality.set_enabled(False)
+        if self.palette.enabled:
+            self.palette.release_surfaces()
+        self.palette = PaletteHandler(self)
+        self.postfx = PostProcessHandler(self)
+        self.pacer.set_fps(self.max_fps)
+        self.set_render_scale(1.0)
+        self._init_face_state()
+        self._start_face()
+        self.running = True
         return True
 
+    def _invalidate_layout(self):
+        """Mark eye positions stale; they are recomputed once before the next frame"""
+        self.layout_dirty = True
+
+    def _update_layout(self):
+        """Recompute eye positions if any size or spacing changed since the last pass"""
+        if self.layout_dirty:
+            self._calculate_eye_positions()
+
     def _calculate_eye_positions(self):
         """Calculate the eye positions based on screen size and eye properties"""
-        # Calculate positions for both eyes (cyclops mode disabled)
-        total_width = self.eye_l_width + self.eye_r_width + self.space_between
-        self.eye_l_x = (self.screen_width - total_width) // 2
-        self.eye_l_y = (self.screen_height - self.eye_l_height) // 2
-        self.eye_r_x = self.eye_l_x + self.eye_l_width + self.space_between
-        self.eye_r_y = (self.screen_height - self.eye_r_height) // 2
-        
-        self.eye_l_x_next = self.eye_l_x
-        self.eye_l_y_next = self.eye_l_y
-        self.eye_r_x_next = self.eye_r_x
-        self.eye_r_y_next = self.eye_r_y
+        self.layout_dirty = False
+        layout_eyes(self.eyes, self.screen_width, self.screen_height,
+                    (self.eye_l_width, self.eye_r_width), (self.eye_l_height, self.eye_r_height),
+                    self.space_between)
+        # Keep the cardinal position across relayouts (e.g. every frame of a mood fade)
+        self._apply_position_step()
+
+    def _apply_position_step(self):
+        """Move every eye's target from its resting point toward the current position"""
+        # Offset for eye movement (about 10% of eye size)
+        offset_x = int(self.eye_l_width * 0.1)
+        offset_y = int(self.eye_l_height * 0.1)
+        step_x, step_y = POSITION_STEPS.get(self.position, (0, 0))
+        for eye in self.eyes:
+            eye.x_next = eye.x + step_x * offset_x
+            eye.y_next = eye.y + step_y * offset_y
 
     def update(self):
         """Update eyes drawings with frame rate limitation"""
+        if not self._render_frame():
+            return False
+        
+        # Limit frame rate (sleep, then spin to the perf_counter deadline)
+        self._frame_finished(self.pacer.wait())
+        return True
+
+    async def run(self, frames=None):
+        """Asyncio alternative to calling update() in a loop (paced with loop timers)"""
+        return await self.runner.run(frames)
+
+    async def send(self, name, *args):
+        """Queue a command from a coroutine; resolves once its frame is presented"""
+        return await self.runner.send(name, *args)
+
+    async def next_frame(self):
+        """Wait for the next presented frame while run() is active"""
+        return await self.runner.next_frame()
+
+    def _render_frame(self):
+        """Poll events, render and present one frame; False once the eyes have stopped"""
         if not self.running:
             return False
             
-        # Handle pygame events
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                self.running = False
-                pygame.quit()
-                return False
+        # Handle pygame events (event.get() never blocks)
+        if self.owns_display:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self.running = False
+                    pygame.quit()
+                    return False
+        
+        # Draw the frame
+        if self.allocations is not None:
+            self.allocations.frame_start()
+            self.render()
+            self.allocations.frame_end()
+        else:
+            self.render()
+        
+        # Update display
+        self._present()
+        self.frame_presented()
+        return True
+
+    def _frame_finished(self, now, work_time=None):
+        """Per-frame statistics once pacing has started the next frame (hosts pass each face's work time)"""
+        if work_time is None:
+            work_time = self.pacer.last_work_time
+        self.quality.record(work_time)
+        if self.metrics is not None:
+            self.metrics.record_frame(work_time, now)
+
+    def render(self):
+        """Advance animations and draw one frame into the surface (no events, flip or pacing)"""
+        if not self.running:
+            return False
+        
+        # Apply commands queued by controllers since the last frame
+        self._apply_commands()
                 
         # Force default mood on first frame
         if not self.startup_complete:
@@ -215,7 +383,15 @@ class RoboEyes:
             self.startup_complete = True
         
         # Handle arrow key input for manual eye control with velocity
-        keys = pygame.key.get_pressed()
+        # (get_pressed() builds a 512-entry tuple, so skip it without keyboard focus)
+        if self.replay_keys is not None:
+            keys = self.replay_keys
+        elif self.owns_display and pygame.key.get_focused():
+            keys = pygame.key.get_pressed()
+        else:
+            keys = NO_KEYS
+        if self.command_log is not None:
+            self.command_log.record_keys(keys)
         key_pressed = keys[pygame.K_UP] or keys[pygame.K_DOWN] or keys[pygame.K_LEFT] or keys[pygame.K_RIGHT]
         
         if key_pressed:
@@ -270,7 +446,7 @@ class RoboEyes:
             self.manual_y_velocity = 0
         
         # Clear the screen
-        self.screen.fill(BLACK)
+        self.canvas.fill(BLACK)
         
         # Update animations
         self._update_animations()
@@ -278,129 +454,182 @@ class RoboEyes:
         # Draw the eyes
         self._draw_eyes()
         
-        # Update display
-        pygame.display.flip()
+        # Scale a reduced-resolution frame up to the window
+        if self.canvas is not self.screen:
+            self._present_canvas()
         
-        # Limit frame rate
-        self.clock.tick(self.max_fps)
+        # Post-process the final frame (scanlines, phosphor, dither, vignette)
+        if self.postfx.enabled:
+            self.postfx.apply(self.screen)
         
         return True
 
+    def _present(self):
+        """Show the finished frame in the window this instance owns"""
+        if self.backend == TEXTURE:
+            # Renderer contents are undefined after present, so read captures back first
+            self.captures.frame_presented()
+            self.screen.present()
+        elif self.owns_display:
+            pygame.display.flip()
+
+    def frame_presented(self):
+        """Bookkeeping once the frame is on screen (called by update() or a host)"""
+        self.gaze.frame_presented()
+        if self.backend != TEXTURE:
+            self.captures.frame_presented()  # The texture backend reads captures back in _present()
+
+    def post_command(self, name, *args):
+        """Queue a RoboEyes method call to run on the render thread (thread-safe)"""
+        if name.startswith("_") or not callable(getattr(self, name, None)):
+            print(f"Warning: Unknown RoboEyes command '{name}'.")
+            return False
+        self.command_queue.append((name, args))
+        return True
+
+    def _apply_commands(self):
+        """Run queued commands in arrival order"""
+        queue = self.command_queue
+        while queue:
+            name, args = queue.popleft()
+            getattr(self, name)(*args)
+
     def _update_animations(self):
         """Update all active animations"""
         current_time = time.time()
         
-        # Use the animations handler to update all animations
-        self.animations.update_animations(current_time)
+        # Advance any mood cross-fade before animations read eye sizes
+        self.moods.update(current_time)
+        
+        # One layout pass per frame, however many setters ran since the last one
+        self._update_layout()
         
-        # Update flicker (keeping this in main class for now)
-        if self.h_flicker:
-            offset = random.randint(-self.h_flicker_amplitude, self.h_flicker_amplitude)
-            self.eye_l_x_next = self.eye_l_x + offset
-            self.eye_r_x_next = self.eye_r_x + offset
+        # Eye color, tint and glow (a single palette write in 8-bit mode)
+        self.palette.update(current_time)
         
-        if self.v_flicker:
-            offset = random.randint(-self.v_flicker_amplitude, self.v_flicker_amplitude)
-            self.eye_l_y_next = self.eye_l_y + offset
-            self.eye_r_y_next = self.eye_r_y + offset
+        # Apply the audio envelope for this frame (height scale, flicker)
+        self.audio.update()
+        
+        # Run the active animations (blink, laugh, confused, flicker, idle, custom)
+        self.animations.update_animations(current_time)
+        
+        # Consume the newest gaze sample, if any, and advance its filter
+        self.gaze.update()
 
     def _draw_eyes(self):
         """Draw the eyes with current properties"""
-        # Smooth transitions for all properties
-        self.eye_l_width_current = (self.eye_l_width_current + self.eye_l_width) / 2
-        self.eye_l_height_current = (self.eye_l_height_current + self.eye_l_height) / 2
-        self.eye_l_border_radius_current = (self.eye_l_border_radius_current + self.eye_l_border_radius) / 2
-        self.eye_r_width_current = (self.eye_r_width_current + self.eye_r_width) / 2
-        self.eye_r_height_current = (self.eye_r_height_current + self.eye_r_height) / 2
-        self.eye_r_border_radius_current = (self.eye_r_border_radius_current + self.eye_r_border_radius) / 2
-        
-        # Smooth transitions for positions
-        eye_l_x_current = (self.eye_l_x + self.eye_l_x_next) / 2
-        eye_l_y_current = (self.eye_l_y + self.eye_l_y_next) / 2
-        eye_r_x_current = (self.eye_r_x + self.eye_r_x_next) / 2
-        eye_r_y_current = (self.eye_r_y + self.eye_r_y_next) / 2
-        
-        # Apply manual control offsets if enabled
+        # Per-side targets (plus any SIZE animation offset), scaled per eye
+        size_w, size_h = self.animations.size_offset
+        height_scale = self.audio.height_scale
+        widths = (self.eye_l_width, self.eye_r_width)
+        heights = (self.eye_l_height, self.eye_r_height)
+        radii = (self.eye_l_border_radius, self.eye_r_border_radius)
+        
+        # Offsets shared by every eye: manual control and continuous gaze
+        offset_x = self.gaze.x_offset
+        offset_y = self.gaze.y_offset
         if self.manual_control:
-            eye_l_x_current += self.manual_x_offset
-            eye_l_y_current += self.manual_y_offset
-            eye_r_x_current += self.manual_x_offset
-            eye_r_y_current += self.manual_y_offset
+            offset_x += self.manual_x_offset
+            offset_y += self.manual_y_offset
+        scale = self.render_scale
+        
+        for eye in self.eyes:
+            side = eye.side
+            # Smooth transitions for all properties
+            eye.width_current = (eye.width_current + widths[side] * eye.scale + size_w) / 2
+            eye.height_current = (eye.height_current + (heights[side] * eye.scale + size_h) * height_scale) / 2
+            eye.border_radius_current = (eye.border_radius_current + radii[side]) / 2
+            
+            # Smooth transitions for positions, mapped to the (possibly reduced) canvas
+            eye.draw_x = ((eye.x + eye.x_next) / 2 + offset_x) * scale
+            eye.draw_y = ((eye.y + eye.y_next) / 2 + offset_y) * scale
+            eye.draw_width = eye.width_current * scale
+            eye.draw_height = eye.height_current * scale
         
         # Use the shapes handler to draw the eyes
-        self.shapes.draw_eyes(
-            self.screen,
-            eye_l_x_current, eye_l_y_current,
-            eye_r_x_current, eye_r_y_current,
-            self.eye_l_width_current, self.eye_l_height_current,
-            self.eye_r_width_current, self.eye_r_height_current,
-            CYAN
-        )
+        self.shapes.draw_eyes(self.canvas, self.eyes, self.palette.draw_color)
         
         # Use the animations handler to draw eyelids for blinking/winking
-        self.animations.draw_eyelids(
-            self.screen,
-            eye_l_x_current, eye_l_y_current,
-            eye_r_x_current, eye_r_y_current,
-            self.eye_l_width_current, self.eye_l_height_current,
-            self.eye_r_width_current, self.eye_r_height_current
-        )
+        self.animations.draw_eyelids(self.canvas, self.eyes)
         
         # Use the moods handler to draw mood-specific elements
-        self.moods.draw_mood_elements(
-            self.screen,
-            eye_l_x_current, eye_l_y_current,
-            eye_r_x_current, eye_r_y_current,
-            self.eye_l_width_current, self.eye_l_height_current,
-            self.eye_r_width_current, self.eye_r_height_current
-        )
-        
-        # Draw tired eyelids if in TIRED mood
-        if self.mood == TIRED and eyelids_tired_height > 0:
-            # Left eye (or single eye in cyclops mode)
-            pygame.draw.rect(
-                self.screen,
-                BLACK,
-                (
-                    eye_l_x_current,
-                    eye_l_y_current,
-                    self.eye_l_width_current,
-                    eyelids_tired_height
-                ),
-                0
-            )
-            
-            # Right eye (if not in cyclops mode)
-            if not self.cyclops:
-                pygame.draw.rect(
-                    self.screen,
-                    BLACK,
-                    (
-                        eye_r_x_current,
-                        eye_r_y_current,
-                        self.eye_r_width_current,
-                        eyelids_tired_height
-                    ),
-                    0
-                )
-        
-
+        self.moods.draw_mood_elements(self.canvas, self.eyes)
 
     # Eye shape configuration methods
     def set_width(self, left_eye, right_eye):
         """Set the width of both eyes"""
         self.eye_l_width = left_eye
         self.eye_r_width = right_eye
-        self._calculate_eye_positions()
+        self._invalidate_layout()
         return True
 
     def set_height(self, left_eye, right_eye):
         """Set the height of both eyes"""
         self.eye_l_height = left_eye
         self.eye_r_height = right_eye
-        self._calculate_eye_positions()
+        self._invalidate_layout()
+        return True
+
+    def configure(self, **settings):
+        """Apply several settings as one batch with a single layout pass
+
+        Accepts width, height, border_radius (left/right pairs), space_between,
+        shape, mood and position. Every value is checked first: an unknown key
+        or an invalid value rejects the whole batch and nothing is applied.
+        """
+        unknown = [key for key in settings if key not in CONFIGURE_ORDER]
+        if unknown:
+            print(f"Warning: Unknown configure settings {unknown}. Valid settings are: {list(CONFIGURE_ORDER)}")
+            return False
+        for key, value in settings.items():
+            problem = self._check_configure_value(key, value)
+            if problem:
+                print(f"Warning: Invalid configure setting {key}={value!r}: {problem}.")
+                return False
+        for key in CONFIGURE_ORDER:
+            if key not in settings:
+                continue
+            value = settings[key]
+            if key == "width":
+                self.set_width(*value)
+            elif key == "height":
+                self.set_height(*value)
+            elif key == "border_radius":
+                self.set_border_radius(*value)
+            elif key == "space_between":
+                self.set_space_between(value)
+            elif key == "shape":
+                self.shapes.set_eye_shape(value)
+            elif key == "mood":
+                self.set_mood(value)
+            elif key == "position":
+                self.set_position(value)
+        self._update_layout()
         return True
 
+    def _check_configure_value(self, key, value):
+        """Describe what is wrong with one configure value, or return None if it is valid"""
+        if key in ("width", "height", "border_radius"):
+            if not isinstance(value, (tuple, list)) or len(value) != 2:
+                return "expected a (left, right) pair"
+            minimum = 0 if key == "border_radius" else 1
+            for number in value:
+                if isinstance(number, bool) or not isinstance(number, (int, float)) or number < minimum:
+                    return f"values must be numbers of at least {minimum}"
+        elif key == "space_between":
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+                return "expected a number of at least 0"
+        elif key == "shape":
+            if value not in self.shapes.valid_shapes:
+                return f"valid shapes are {self.shapes.valid_shapes}"
+        elif key == "mood":
+            if value not in self.moods.presets:
+                return f"valid moods are {list(self.moods.presets)}"
+        elif key == "position":
+            if value not in POSITION_STEPS:
+                return "expected a position constant (DEFAULT, N, NE, E, SE, S, SW, W, NW)"
+        return None
+
     def set_border_radius(self, left_eye, right_eye):
         """Set the border radius of both eyes"""
         self.eye_l_border_radius = left_eye
@@ -410,83 +639,65 @@ class RoboEyes:
     def set_space_between(self, space):
         """Set the space between eyes"""
         self.space_between = space
-        self._calculate_eye_positions()
+        self._invalidate_layout()
         return True
 
     def set_cyclops(self, state):
-        """Set cyclops mode (single eye) - DISABLED"""
-        # Always set to False to disable cyclops mode
-        self.cyclops = False
-        self._calculate_eye_positions()
+        """Set cyclops mode (single eye)"""
+        self.set_eye_count(1 if state else 2)
         return True
 
-    # Mood and expression methods
-    def set_mood(self, mood):
-        """Set the mood expression"""
-        return self.moods.set_mood(mood)
-        
+    def set_eye_count(self, count):
+        """Set the number of eyes: 1 (cyclops), 2, or up to 8 for spider-style faces"""
+        if not 1 <= count <= MAX_EYES:
+            print(f"Warning: Eye count must be between 1 and {MAX_EYES}.")
+            return False
+        if count != len(self.eyes):
+            self.eyes = create_eyes(count, self.eye_l_width, self.eye_l_height, self.eye_l_border_radius)
+        self.cyclops = count == 1
+        self._invalidate_layout()
+        return True
+
+    def set_eye_offsets(self, offsets):
+        """Set per-eye layout offsets in pixels, one (x, y) pair per eye"""
+        if len(offsets) != len(self.eyes):
+            print(f"Warning: Expected {len(self.eyes)} eye offsets, got {len(offsets)}.")
+            return False
+        for eye, (x, y) in zip(self.eyes, offsets):
+            eye.offset_x = x
+            eye.offset_y = y
+        self._invalidate_layout()
+        return True
+
+    def set_eye_scales(self, scales):
+        """Set per-eye sizes relative to the left/right width and height, one per eye"""
+        if len(scales) != len(self.eyes):
+            print(f"Warning: Expected {len(self.eyes)} eye scales, got {len(scales)}.")
+            return False
+        for eye, scale in zip(self.eyes, scales):
+            eye.scale = scale
+        self._invalidate_layout()
         return True
 
+    # Mood and expression methods
+    def set_mood(self, mood, duration=None):
+        """Set the mood expression, cross-fading over duration seconds"""
+        return self.moods.set_mood(mood, duration)
+
+    def set_mood_mix(self, weights, duration=None):
+        """Blend several moods, e.g. {TIRED: 0.7, SAD: 0.3}"""
+        return self.moods.set_mood_mix(weights, duration)
+
+    def set_mood_transition_duration(self, duration):
+        """Set the default mood cross-fade duration in seconds"""
+        return self.moods.set_transition_duration(duration)
+
     def set_position(self, position):
         """Set the eye position using cardinal directions"""
+        # Settle pending size changes first; later layout passes re-apply the position
+        self._update_layout()
         self.position = position
-        
-        # Calculate base positions
-        base_l_x = (self.screen_width - (self.eye_l_width + self.eye_r_width + self.space_between)) // 2
-        base_l_y = (self.screen_height - self.eye_l_height) // 2
-        base_r_x = base_l_x + self.eye_l_width + self.space_between
-        base_r_y = (self.screen_height - self.eye_r_height) // 2
-        
-        # Offset for eye movement (about 10% of eye size)
-        offset_x = int(self.eye_l_width * 0.1)
-        offset_y = int(self.eye_l_height * 0.1)
-        
-        # Set positions based on direction
-        if position == DEFAULT:
-            self.eye_l_x_next = base_l_x
-            self.eye_l_y_next = base_l_y
-            self.eye_r_x_next = base_r_x
-            self.eye_r_y_next = base_r_y
-        elif position == N:  # North (top)
-            self.eye_l_x_next = base_l_x
-            self.eye_l_y_next = base_l_y - offset_y
-            self.eye_r_x_next = base_r_x
-            self.eye_r_y_next = base_r_y - offset_y
-        elif position == NE:  # Northeast (top right)
-            self.eye_l_x_next = base_l_x + offset_x
-            self.eye_l_y_next = base_l_y - offset_y
-            self.eye_r_x_next = base_r_x + offset_x
-            self.eye_r_y_next = base_r_y - offset_y
-        elif position == E:  # East (right)
-            self.eye_l_x_next = base_l_x + offset_x
-            self.eye_l_y_next = base_l_y
-            self.eye_r_x_next = base_r_x + offset_x
-            self.eye_r_y_next = base_r_y
-        elif position == SE:  # Southeast (bottom right)
-            self.eye_l_x_next = base_l_x + offset_x
-            self.eye_l_y_next = base_l_y + offset_y
-            self.eye_r_x_next = base_r_x + offset_x
-            self.eye_r_y_next = base_r_y + offset_y
-        elif position == S:  # South (bottom)
-            self.eye_l_x_next = base_l_x
-            self.eye_l_y_next = base_l_y + offset_y
-            self.eye_r_x_next = base_r_x
-            self.eye_r_y_next = base_r_y + offset_y
-        elif position == SW:  # Southwest (bottom left)
-            self.eye_l_x_next = base_l_x - offset_x
-            self.eye_l_y_next = base_l_y + offset_y
-            self.eye_r_x_next = base_r_x - offset_x
-            self.eye_r_y_next = base_r_y + offset_y
-        elif position == W:  # West (left)
-            self.eye_l_x_next = base_l_x - offset_x
-            self.eye_l_y_next = base_l_y
-            self.eye_r_x_next = base_r_x - offset_x
-            self.eye_r_y_next = base_r_y
-        elif position == NW:  # Northwest (top left)
-            self.eye_l_x_next = base_l_x - offset_x
-            self.eye_l_y_next = base_l_y - offset_y
-            self.eye_r_x_next = base_r_x - offset_x
-            self.eye_r_y_next = base_r_y - offset_y
+        self._apply_position_step()
         
         # Apply curiosity effect if enabled
         if self.curiosity and (position == E or position == W):
@@ -500,6 +711,18 @@ class RoboEyes:
         
         return True
 
+    def look_at(self, x, y, timestamp=None):
+        """Look toward a normalized point (-1..1 on each axis); thread-safe, any rate"""
+        return self.gaze.look_at(x, y, timestamp)
+
+    def set_gaze_filter(self, kind, **params):
+        """Set the gaze filter: ONE_EURO (min_cutoff, beta, d_cutoff) or SPRING (frequency)"""
+        return self.gaze.set_filter(kind, **params)
+
+    def get_gaze_latency(self):
+        """Get input-to-render latency statistics for gaze samples"""
+        return self.gaze.get_latency_stats()
+
     def set_curiosity(self, state):
         """Enable/disable curiosity effect"""
         self.curiosity = state
@@ -522,49 +745,59 @@ class RoboEyes:
         return True
 
     # Flicker methods
-    def set_h_flicker(self, state, amplitude=2):
-        """Set horizontal flicker"""
+    def set_h_flicker(self, state, amplitude=2, frequency=None):
+        """Set horizontal flicker (frequency in noise cells per second)"""
         self.h_flicker = state
         self.h_flicker_amplitude = amplitude
+        if frequency is not None:
+            self.h_flicker_frequency = frequency
         return True
 
-    def set_v_flicker(self, state, amplitude=2):
-        """Set vertical flicker"""
+    def set_v_flicker(self, state, amplitude=2, frequency=None):
+        """Set vertical flicker (frequency in noise cells per second)"""
         self.v_flicker = state
         self.v_flicker_amplitude = amplitude
+        if frequency is not None:
+            self.v_flicker_frequency = frequency
         return True
 
+    def set_micro_saccades(self, state, amplitude=2, interval=1.5):
+        """Set occasional micro-saccades (amplitude in pixels, mean interval in seconds)"""
+        return self.animations.set_micro_saccades(state, amplitude, interval)
+
     # Animation methods
     def blink(self, left_eye=True, right_eye=True):
         """Blink animation"""
-        if not self.is_blinking:
-            self.is_blinking = True
-            self.is_winking = False  # Not winking, normal blink
-            self.blink_start_time = time.time()
-        return True
+        return self.animations.blink()
         
     def wink(self, left_eye=True):
         """Wink animation (blink with only one eye)"""
-        if not self.is_blinking:
-            self.is_blinking = True
-            self.is_winking = True
-            self.wink_left_eye = left_eye  # Which eye to wink
-            self.blink_start_time = time.time()
-        return True
+        return self.animations.wink(left_eye)
 
     def anim_laugh(self):
         """Laughing animation"""
-        if not self.is_laughing:
-            self.is_laughing = True
-            self.laugh_start_time = time.time()
-        return True
+        return self.animations.anim_laugh()
 
     def anim_confused(self):
         """Confused animation"""
-        if not self.is_confused:
-            self.is_confused = True
-            self.confused_start_time = time.time()
-        return True
+        return self.animations.anim_confused()
+
+    # Custom animations
+    def add_animation(self, name, animation, channels=(POSITION,), priority=0, blend=OVERRIDE):
+        """Register a custom animation (Animation object or generator function)"""
+        return self.animations.add_animation(name, animation, channels, priority, blend)
+
+    def remove_animation(self, name):
+        """Unregister a custom animation"""
+        return self.animations.remove_animation(name)
+
+    def start_animation(self, name):
+        """Start a registered animation"""
+        return self.animations.start_animation(name)
+
+    def stop_animation(self, name):
+        """Stop a running animation"""
+        return self.animations.stop_animation(name)
 
     # Macro animators
     def set_auto_blinker(self, state, interval=3, variation=2):
@@ -581,14 +814,14 @@ class RoboEyes:
         self.idle_mode_interval = interval
         self.idle_mode_variation = variation
         self.idle_mode_last_time = time.time()
-        return True
+        return self.animations.set_idle_mode(state, interval, variation)
         
     def set_eye_shape(self, shape):
         """Set the eye shape"""
-        if shape in ["round", "square", "oval", "teardrop", "pill"]:
-            self.eye_shape = shape
-            return True
-        return False
+        if not self.shapes.set_eye_shape(shape):
+            return False
+        self.eye_shape = shape
+        return True
         
     def set_manual_control(self, state):
         """Enable/disable manual control with arrow keys"""
@@ -608,11 +841,200 @@ class RoboEyes:
         self.set_v_flicker(True, 3)
         return True
 
+    def start_audio(self, path, play=False):
+        """Make the eyes pulse and squash with a WAV file (requires numpy)"""
+        return self.audio.start(path, play)
+
+    def stop_audio(self):
+        """Stop the audio-reactive mode"""
+        return self.audio.stop()
+
+    def set_audio_reaction(self, squash=0.3, flicker_amplitude=3, gain=4.0, lookahead=0.0):
+        """Configure how strongly the eyes react to audio"""
+        self.audio.squash = squash
+        self.audio.flicker_amplitude = flicker_amplitude
+        self.audio.gain = gain
+        self.audio.lookahead = lookahead
+        return True
+
+    def set_frame_pacing(self, spin_budget=0.002, policy=DROP, max_catch_up=3):
+        """Configure frame pacing: spin budget (s) and stall policy (DROP or CATCH_UP)"""
+        self.pacer.spin_budget = spin_budget
+        self.pacer.policy = policy
+        self.pacer.max_catch_up = max_catch_up
+        return True
+
+    def set_render_scale(self, scale):
+        """Render at a fraction of the window resolution (1.0 renders directly to the window)"""
+        self.user_render_scale = max(0.1, min(1.0, scale))
+        return self._apply_render_scale(self.user_render_scale * self.quality.resolution_scale)
+
+    def _apply_render_scale(self, scale):
+        """Switch the effective render scale (user scale times the quality level's factor)"""
+        self.render_scale = max(0.1, min(1.0, scale))
+        if self.screen is not None:
+            self._create_canvas()
+        return True
+
+    def _create_canvas(self):
+        """(Re)create the render target for the current scale and color mode"""
+        size = (max(1, int(self.screen_width * self.render_scale)),
+                max(1, int(self.screen_height * self.render_scale)))
+        self._present_surface = None
+        if self.backend == TEXTURE:
+            # The renderer scales the reduced logical resolution up to the window
+            self.canvas = self.screen
+            self.screen.renderer.logical_size = size
+        elif self.palette.enabled:
+            self.palette.release_surfaces()
+            self.canvas = self.palette.make_surface(size)
+            if self.render_scale != 1.0:
+                self._present_surface = self.palette.make_surface(self.screen.get_size())
+        elif self.render_scale == 1.0:
+            self.canvas = self.screen
+        elif self.canvas is None or self.canvas is self.screen or self.canvas.get_size() != size \
+                or self.canvas.get_bitsize() != self.screen.get_bitsize():
+            self.canvas = pygame.Surface(size, 0, self.screen)
+
+    def _present_canvas(self):
+        """Copy the canvas to the window, scaling and/or converting from 8-bit"""
+        if self._present_surface is not None:
+            # Scale while still 8-bit, then convert once
+            pygame.transform.scale(self.canvas, self._present_surface.get_size(), self._present_surface)
+            self.screen.blit(self._present_surface, (0, 0))
+        elif self.palette.enabled:
+            self.screen.blit(self.canvas, (0, 0))
+        else:
+            pygame.transform.scale(self.canvas, self.screen.get_size(), self.screen)
+
+    def set_palette_mode(self, state):
+        """Render into an 8-bit palette-indexed canvas; colors change via the palette"""
+        if state and self.backend == TEXTURE:
+            print("Warning: Palette mode is not available with the texture backend.")
+            return False
+        self.palette.set_enabled(state)
+        if self.screen is not None:
+            self._create_canvas()
+        return True
+
+    def set_subpixel(self, state, phases=4):
+        """Position the eyes with subpixel accuracy using cached anti-aliased sprites"""
+        return self.shapes.set_subpixel(state, phases)
+
+    def set_postfx(self, effect, state=True, **params):
+        """Toggle a post-process effect at runtime (SCANLINES, PHOSPHOR, DITHER, VIGNETTE; needs numpy)"""
+        return self.postfx.set_effect(effect, state, **params)
+
+    def set_postfx_budget(self, budget):
+        """Set the per-frame time budget for post-processing; effects are shed above it"""
+        return self.postfx.set_budget(budget)
+
+    def get_postfx_stats(self):
+        """Get post-processing time, budget and which effects are running"""
+        return self.postfx.get_stats()
+
+    def set_eye_color(self, color):
+        """Set the eye color"""
+        return self.palette.set_eye_color(color)
+
+    def set_glow_pulse(self, state, period=2.0, minimum=0.6):
+        """Pulse the eye brightness between minimum and full over period seconds"""
+        return self.palette.set_pulse(state, period, minimum)
+
+    def set_glow(self, state, radius=12, intensity=0.6):
+        """Enable/disable the soft halo around the eyes (requires numpy; not drawn in palette mode)"""
+        return self.glow.set_glow(state, radius, intensity)
+
+    def set_mood_tints(self, state):
+        """Tint the eyes per mood"""
+        self.palette.mood_tints = state
+        return True
+
+    def set_adaptive_quality(self, state, budget=None):
+        """Enable/disable the adaptive quality governor (budget: frame work time in seconds)"""
+        return self.quality.set_enabled(state, budget)
+
+    def get_quality_level(self):
+        """Get the governor's current quality level as (index, name)"""
+        return self.quality.get_level()
+
+    def set_debug_allocations(self, state):
+        """Report per-frame allocations (tracemalloc) and GC pauses; slows frames while on"""
+        if state and self.allocations is None:
+            self.allocations = AllocationMonitor()
+            self.allocations.start()
+        elif not state and self.allocations is not None:
+            self.allocations.stop()
+            self.allocations = None
+        return True
+
+    def get_allocation_report(self):
+        """Get the allocation/GC report gathered since debugging was enabled"""
+        return self.allocations.get_report() if self.allocations is not None else None
+
+    def capture(self, format="png", size=None, max_age=None):
+        """Encode the current frame off the render thread; returns a Future of bytes"""
+        return self.captures.capture(format, size, max_age)
+
+    def thumbnail(self, width=160, format="jpeg", max_age=None):
+        """Encode a downscaled frame off the render thread; returns a Future of bytes"""
+        return self.captures.thumbnail(width, format, max_age)
+
+    def start_metrics_server(self, port=9464, host="127.0.0.1"):
+        """Serve render health in Prometheus text format at http://host:port/metrics"""
+        self.stop_metrics_server()
+        self.metrics = RenderMetrics(self)
+        self.metrics_server = MetricsServer(self.metrics, host, port)
+        if not self.metrics_server.start():
+            self.metrics = None
+            self.metrics_server = None
+            return False
+        return True
+
+    def stop_metrics_server(self):
+        """Stop the metrics endpoint and per-frame counters"""
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+        self.metrics = None
+        self.metrics_server = None
+        return True
+
+    def start_command_log(self, path):
+        """Record applied commands and arrow-key input to an append-only binary log"""
+        self.stop_command_log()
+        log = CommandLog(path)
+        if not log.attach(self):
+            return False
+        self.command_log = log
+        return True
+
+    def stop_command_log(self):
+        """Stop recording commands"""
+        if self.command_log is not None:
+            self.command_log.detach()
+            self.command_log = None
+        return True
+
+    def get_frame_stats(self):
+        """Get frame interval, jitter and missed-deadline statistics"""
+        return self.pacer.get_stats()
+
     def is_running(self):
         """Check if the animation is still running"""
         return self.running
 
     def quit(self):
-        """Quit pygame and clean up"""
+        """Quit pygame and clean up (hosted instances leave pygame running)"""
         self.running = False
-        pygame.quit()
+        if self.audio is not None:
+            self.audio.stop()
+        self.set_debug_allocations(False)
+        self.stop_command_log()
+        self.captures.shutdown()
+        self.stop_metrics_server()
+        if self.window is not None:
+            self.screen.clear_cache()
+            self.window.destroy()
+            self.window = None
+        if self.owns_display:
+            pygame.quit()
@@ -0,0 +1,37 @@
+"""
+Allocation regression test for the RoboEyes draw path
+Renders headless frames with the allocation monitor on and checks that
+steady-state frames stay within a small transient allocation budget.
+"""
+
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from robo_eyes import RoboEyes
+
+WARMUP_FRAMES = 120  # Fill caches and settle the startup mood before measuring
+MEASURED_FRAMES = 240
+MAX_TRANSIENT_BYTES = 512  # Per frame on average; about 390 B/frame at the time of writing
+
+
+def test_frame_allocations_stay_bounded():
+    eyes = RoboEyes()
+    eyes.begin(640, 320, 0)  # Unpaced: frames render back to back
+    try:
+        for _ in range(WARMUP_FRAMES):
+            assert eyes.update()
+        eyes.set_debug_allocations(True)
+        for _ in range(MEASURED_FRAMES):
+            assert eyes.update()
+        report = eyes.get_allocation_report()
+    finally:
+        eyes.quit()
+        pygame.quit()
+
+    assert report["frames"] == MEASURED_FRAMES
+    assert report["transient_bytes_avg"] < MAX_TRANSIENT_BYTES, report
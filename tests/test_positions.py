@@ -0,0 +1,69 @@
+"""
+Position regression tests for RoboEyes
+Checks that a cardinal position survives the layout passes of a mood
+cross-fade, whether set directly or as part of a configure() batch.
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+import pytest
+
+from robo_eyes import RoboEyes, N
+from utils.moods_utils import SAD, TIRED
+
+FADE_SECONDS = 0.4  # Longer than the default 0.25 s mood cross-fade
+
+
+@pytest.fixture
+def eyes():
+    face = RoboEyes()
+    face.begin(640, 320, 0)
+    # Idle gazing and blinks would move the targets on their own
+    face.set_idle_mode(False)
+    face.set_auto_blinker(False)
+    for _ in range(5):
+        face.update()
+    yield face
+    face.quit()
+    pygame.quit()
+
+
+def run_for(eyes, seconds):
+    end = time.time() + seconds
+    while time.time() < end:
+        assert eyes.update()
+
+
+def resting_y(eyes):
+    eyes._calculate_eye_positions()
+    return [eye.y for eye in eyes.eyes]
+
+
+def test_position_survives_mood_fade(eyes):
+    eyes.set_mood(TIRED)
+    eyes.set_position(N)
+    run_for(eyes, FADE_SECONDS)
+
+    assert eyes.position == N
+    offset_y = int(eyes.eye_l_height * 0.1)
+    assert offset_y > 0
+    assert [eye.y_next for eye in eyes.eyes] == [y - offset_y for y in resting_y(eyes)]
+
+
+def test_configure_keeps_position_with_mood(eyes):
+    assert eyes.configure(mood=SAD, position=N)
+    for _ in range(3):
+        assert eyes.update()
+    offset_y = int(eyes.eye_l_height * 0.1)
+    assert [eye.y_next for eye in eyes.eyes] == [y - offset_y for y in resting_y(eyes)]
+
+    run_for(eyes, FADE_SECONDS)
+    offset_y = int(eyes.eye_l_height * 0.1)
+    assert [eye.x_next for eye in eyes.eyes] == [eye.x for eye in eyes.eyes]
+    assert [eye.y_next for eye in eyes.eyes] == [y - offset_y for y in resting_y(eyes)]
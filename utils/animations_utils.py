@@ -1,7 +1,10 @@
 """
 Animations utilities for RoboEyes
 Handles all animation-related functionality including blinking, winking, 
-laughing, confused animations, and idle mode.
+laughing, confused animations, flicker (noise-table micro-motion) and
+idle mode. Each one is an
+Animation run by the AnimationScheduler, so custom animations can be
+registered next to the built-in ones.
 """
 
 import random
@@ -9,24 +12,112 @@ import time
 import math
 import pygame
 
+from utils.idle_utils import IdleGazeEngine
+from utils.noise_utils import MicroMotion
+from utils.scheduler_utils import (
+    Animation, AnimationScheduler, CoroutineAnimation,
+    POSITION, LIDS, SIZE, OVERRIDE, ADDITIVE,
+)
+
+BLACK = (0, 0, 0)
+
+# Built-in animation priorities (higher wins an OVERRIDE channel)
+IDLE_PRIORITY = -10  # Below the default 0, so custom animations override idle gazing
+SHAKE_PRIORITY = 20
+FLICKER_PRIORITY = 30
+BLINK_PRIORITY = 100
+
+
+class BlinkAnimation(Animation):
+    """Close and reopen the lids (one eye when winking)"""
+
+    channels = (LIDS,)
+    priority = BLINK_PRIORITY
+    blend = OVERRIDE
+
+    def __init__(self, handler):
+        self.handler = handler
+
+    def update(self, now, dt):
+        progress = (now - self.start_time) / self.handler.blink_duration
+        if progress >= 1.0:
+            self.handler.is_winking = False  # Reset winking state when done
+            return None
+        # First half closes eyes, second half opens them
+        if progress < 0.5:
+            return {LIDS: progress * 2}
+        return {LIDS: 1 - (progress - 0.5) * 2}
+
+
+class ShakeAnimation(Animation):
+    """Oscillate the eyes along one axis (laugh: vertical, confused: horizontal)"""
+
+    channels = (POSITION,)
+    priority = SHAKE_PRIORITY
+    blend = ADDITIVE
+
+    def __init__(self, duration, horizontal, amplitude=5):
+        self.duration = duration
+        self.horizontal = horizontal
+        self.amplitude = amplitude
+
+    def update(self, now, dt):
+        progress = (now - self.start_time) / self.duration
+        if progress >= 1.0:
+            return None
+        offset = int(math.sin(progress * 10) * self.amplitude)
+        return {POSITION: (offset, 0) if self.horizontal else (0, offset)}
+
+
+class FlickerAnimation(Animation):
+    """Smooth noise jitter while flicker or micro-saccades are switched on"""
+
+    channels = (POSITION,)
+    priority = FLICKER_PRIORITY
+    blend = ADDITIVE
+
+    def __init__(self, parent, motion):
+        self.parent = parent
+        self.motion = motion
+
+    def update(self, now, dt):
+        parent = self.parent
+        amplitude_x = parent.h_flicker_amplitude if parent.h_flicker else 0
+        amplitude_y = (parent.v_flicker_amplitude if parent.v_flicker else 0) + parent.audio.flicker
+        return {POSITION: self.motion.sample(now, amplitude_x, amplitude_y,
+                                             parent.h_flicker_frequency, parent.v_flicker_frequency)}
+
+    def stop(self):
+        self.motion.reset()
+
+
+class IdleAnimation(Animation):
+    """Persistent idle gaze driven by the IdleGazeEngine"""
+
+    channels = (POSITION,)
+    priority = IDLE_PRIORITY
+    blend = OVERRIDE
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def update(self, now, dt):
+        return {POSITION: self.engine.update(now)}
+
+    def stop(self):
+        self.engine.reset()
+
+
 class AnimationsHandler:
     def __init__(self, parent):
         """Initialize animations with reference to parent RoboEyes object"""
         self.parent = parent
         
-        # Animation state flags
-        self.is_blinking = False
+        # Blink/wink timing
         self.is_winking = False
-        self.blink_start_time = 0
         self.blink_duration = 0.3  # seconds
         self.wink_left_eye = True  # Which eye to wink
-        
-        self.is_laughing = False
-        self.laugh_start_time = 0
         self.laugh_duration = 1.0  # seconds
-        
-        self.is_confused = False
-        self.confused_start_time = 0
         self.confused_duration = 1.0  # seconds
         
         # Auto animations
@@ -40,166 +131,138 @@ class AnimationsHandler:
         self.idle_mode_interval = 1  # Minimum 1 second as mentioned in the video
         self.idle_mode_variation = 3  # Random variation to make it 1-4 seconds as mentioned in the video
         self.idle_mode_last_time = time.time()
-        self.idle_target_position = 0  # Target position to move to
-        self.idle_current_position = 0  # Current position
-        self.idle_velocity_x = 0  # X velocity for smooth movement
-        self.idle_velocity_y = 0  # Y velocity for smooth movement
-        self.idle_acceleration = 0.2  # Acceleration factor
-        self.idle_deceleration = 0.9  # Deceleration factor (friction)
-        self.idle_max_velocity = 3  # Maximum velocity
-        self.idle_moving = False  # Whether currently moving to a target
+        self.idle = IdleGazeEngine()
+        self.idle.set_timing(self.idle_mode_interval, self.idle_mode_variation)
         
         # Eyelid properties
         self.eyelids_closed_height = 0
         self.eyelids_closed_height_next = 0
+        
+        # Precomputed noise tables behind flicker and micro-saccades
+        self.micro_motion = MicroMotion()
+        
+        # Eye size offset from the SIZE channel, added by the parent when drawing
+        self.size_offset = (0, 0)
+        
+        # Built-in animations; only the active ones are ticked each frame
+        self.scheduler = AnimationScheduler()
+        self.scheduler.register("blink", BlinkAnimation(self))
+        self.scheduler.register("laugh", ShakeAnimation(self.laugh_duration, horizontal=False))
+        self.scheduler.register("confused", ShakeAnimation(self.confused_duration, horizontal=True))
+        self.scheduler.register("flicker", FlickerAnimation(parent, self.micro_motion))
+        self.scheduler.register("idle", IdleAnimation(self.idle))
+        self.scheduler.start("idle", time.time())
+        self._position_active = False
+        
+        # Preallocated rects reused every frame when drawing eyelids
+        self._lid_top = pygame.Rect(0, 0, 0, 0)
+        self._lid_bottom = pygame.Rect(0, 0, 0, 0)
+    
+    @property
+    def is_blinking(self):
+        return self.scheduler.is_active("blink")
+    
+    @property
+    def is_laughing(self):
+        return self.scheduler.is_active("laugh")
+    
+    @property
+    def is_confused(self):
+        return self.scheduler.is_active("confused")
     
     def update_animations(self, current_time):
         """Update all active animations"""
+        scheduler = self.scheduler
+        parent = self.parent
+        
         # Update auto blinker
         if self.auto_blinker and not self.is_blinking:
             if current_time - self.auto_blinker_last_time > self.auto_blinker_interval + random.uniform(0, self.auto_blinker_variation):
                 self.blink()
                 self.auto_blinker_last_time = current_time
         
-        # Update idle mode with smooth movement
-        if self.idle_mode:
-            # Import the constants directly from shapes_utils
-            from utils.shapes_utils import DEFAULT, N, NE, E, SE, S, SW, W, NW
-            
-            # Check if it's time to select a new target position
-            if not self.idle_moving or (current_time - self.idle_mode_last_time > self.idle_mode_interval + random.uniform(0, self.idle_mode_variation)):
-                # Randomly select a new position
-                directions = [DEFAULT, N, NE, E, SE, S, SW, W, NW]
-                self.idle_target_position = random.choice(directions)
-                self.idle_moving = True
-                self.idle_mode_last_time = current_time
-                
-                # Set target coordinates based on the selected position
-                if self.idle_target_position == N:
-                    target_x = 0
-                    target_y = -1
-                elif self.idle_target_position == NE:
-                    target_x = 1
-                    target_y = -1
-                elif self.idle_target_position == E:
-                    target_x = 1
-                    target_y = 0
-                elif self.idle_target_position == SE:
-                    target_x = 1
-                    target_y = 1
-                elif self.idle_target_position == S:
-                    target_x = 0
-                    target_y = 1
-                elif self.idle_target_position == SW:
-                    target_x = -1
-                    target_y = 1
-                elif self.idle_target_position == W:
-                    target_x = -1
-                    target_y = 0
-                elif self.idle_target_position == NW:
-                    target_x = -1
-                    target_y = -1
-                else:  # DEFAULT
-                    target_x = 0
-                    target_y = 0
-                
-                # Apply acceleration toward target
-                self.idle_velocity_x += target_x * self.idle_acceleration
-                self.idle_velocity_y += target_y * self.idle_acceleration
-                
-                # Apply velocity limits
-                self.idle_velocity_x = max(-self.idle_max_velocity, min(self.idle_max_velocity, self.idle_velocity_x))
-                self.idle_velocity_y = max(-self.idle_max_velocity, min(self.idle_max_velocity, self.idle_velocity_y))
-            
-            # Apply deceleration when close to target
-            if self.idle_moving and self.idle_target_position == DEFAULT:
-                self.idle_velocity_x *= self.idle_deceleration
-                self.idle_velocity_y *= self.idle_deceleration
-                
-                # Stop when velocity is very small
-                if abs(self.idle_velocity_x) < 0.1 and abs(self.idle_velocity_y) < 0.1:
-                    self.idle_velocity_x = 0
-                    self.idle_velocity_y = 0
-                    self.idle_moving = False
-            
-            # Apply the velocity to the eye position
-            base_offset = 10  # Base offset for eye movement
-            self.parent.eye_l_x_next = self.parent.eye_l_x + int(self.idle_velocity_x * base_offset)
-            self.parent.eye_l_y_next = self.parent.eye_l_y + int(self.idle_velocity_y * base_offset)
-            self.parent.eye_r_x_next = self.parent.eye_r_x + int(self.idle_velocity_x * base_offset)
-            self.parent.eye_r_y_next = self.parent.eye_r_y + int(self.idle_velocity_y * base_offset)
-        
-        # Update blinking animation
-        if self.is_blinking:
-            progress = (current_time - self.blink_start_time) / self.blink_duration
-            if progress >= 1.0:
-                self.is_blinking = False
-                self.eyelids_closed_height_next = 0
-                self.is_winking = False  # Reset winking state when done
+        # Flicker runs while an axis, audio onsets or micro-saccades call for it and the quality governor allows it
+        flicker = (parent.h_flicker or parent.v_flicker or parent.audio.flicker
+                   or self.micro_motion.saccades) and parent.flicker_enabled
+        if flicker != scheduler.is_active("flicker"):
+            if flicker:
+                scheduler.start("flicker", current_time)
             else:
-                # First half closes eyes, second half opens them
-                if progress < 0.5:
-                    self.eyelids_closed_height_next = int(self.parent.eye_l_height * (progress * 2))
-                else:
-                    self.eyelids_closed_height_next = int(self.parent.eye_l_height * (1 - (progress - 0.5) * 2))
+                scheduler.stop("flicker")
         
-        # Update laughing animation
-        if self.is_laughing:
-            progress = (current_time - self.laugh_start_time) / self.laugh_duration
-            if progress >= 1.0:
-                self.is_laughing = False
-                self.parent.eye_l_y_next = self.parent.eye_l_y
-                self.parent.eye_r_y_next = self.parent.eye_r_y
-            else:
-                # Oscillate the eyes up and down
-                offset = int(math.sin(progress * 10) * 5)
-                self.parent.eye_l_y_next = self.parent.eye_l_y + offset
-                self.parent.eye_r_y_next = self.parent.eye_r_y + offset
+        values = scheduler.tick(current_time)
         
-        # Update confused animation
-        if self.is_confused:
-            progress = (current_time - self.confused_start_time) / self.confused_duration
-            if progress >= 1.0:
-                self.is_confused = False
-                self.parent.eye_l_x_next = self.parent.eye_l_x
-                self.parent.eye_r_x_next = self.parent.eye_r_x
-            else:
-                # Oscillate the eyes left and right
-                offset = int(math.sin(progress * 10) * 5)
-                self.parent.eye_l_x_next = self.parent.eye_l_x + offset
-                self.parent.eye_r_x_next = self.parent.eye_r_x + offset
+        # Position: offset from the resting position, reset once when nothing drives it
+        position = values.get(POSITION)
+        if position is not None:
+            offset_x, offset_y = position
+            if not parent.shapes.subpixel:
+                # Whole pixels unless the eyes are drawn with subpixel sprites
+                offset_x = int(round(offset_x))
+                offset_y = int(round(offset_y))
+            for eye in parent.eyes:
+                eye.x_next = eye.x + offset_x
+                eye.y_next = eye.y + offset_y
+            self._position_active = True
+        elif self._position_active:
+            for eye in parent.eyes:
+                eye.x_next = eye.x
+                eye.y_next = eye.y
+            self._position_active = False
+        
+        lids = values.get(LIDS)
+        self.eyelids_closed_height_next = 0 if lids is None else int(parent.eye_l_height * lids)
+        
+        self.size_offset = values.get(SIZE, (0, 0))
     
     def blink(self):
         """Blink animation with both eyes"""
         if not self.is_blinking:
-            self.is_blinking = True
             self.is_winking = False  # Not winking, normal blink
-            self.blink_start_time = time.time()
+            self.scheduler.start("blink", time.time())
         return True
     
     def wink(self, left_eye=True):
         """Wink animation (blink with only one eye)"""
         if not self.is_blinking:
-            self.is_blinking = True
             self.is_winking = True
             self.wink_left_eye = left_eye  # Which eye to wink
-            self.blink_start_time = time.time()
+            self.scheduler.start("blink", time.time())
         return True
     
     def anim_laugh(self):
         """Laughing animation - eyes shaking up and down"""
         if not self.is_laughing:
-            self.is_laughing = True
-            self.laugh_start_time = time.time()
+            self.scheduler.start("laugh", time.time())
         return True
     
     def anim_confused(self):
         """Confused animation - eyes shaking left and right"""
         if not self.is_confused:
-            self.is_confused = True
-            self.confused_start_time = time.time()
+            self.scheduler.start("confused", time.time())
         return True
     
+    def add_animation(self, name, animation, channels=(POSITION,), priority=0, blend=OVERRIDE):
+        """Register a custom animation: an Animation object or a generator function"""
+        if not isinstance(animation, Animation):
+            if not callable(animation):
+                print(f"Warning: Animation '{name}' must be an Animation or a generator function.")
+                return False
+            animation = CoroutineAnimation(animation, channels, priority, blend)
+        return self.scheduler.register(name, animation)
+    
+    def remove_animation(self, name):
+        """Unregister a custom animation"""
+        return self.scheduler.unregister(name)
+    
+    def start_animation(self, name):
+        """Start a registered animation"""
+        return self.scheduler.start(name, time.time())
+    
+    def stop_animation(self, name):
+        """Stop a running animation"""
+        return self.scheduler.stop(name)
+    
     def set_auto_blinker(self, state, interval=3, variation=2):
         """Set auto blinker state and timing parameters"""
         self.auto_blinker = state
@@ -208,128 +271,54 @@ class AnimationsHandler:
         self.auto_blinker_last_time = time.time()
         return True
     
+    def set_micro_saccades(self, state, amplitude=2, interval=1.5):
+        """Set scheduled micro-saccades (small jumps of the resting point)"""
+        return self.micro_motion.set_saccades(state, amplitude, interval)
+    
     def set_idle_mode(self, state, interval=1, variation=3):
         """Set idle mode state and timing parameters"""
         self.idle_mode = state
         self.idle_mode_interval = interval
         self.idle_mode_variation = variation
         self.idle_mode_last_time = time.time()
+        self.idle.set_timing(interval, variation)
+        if state:
+            if not self.scheduler.is_active("idle"):
+                self.scheduler.start("idle", time.time())
+        else:
+            self.scheduler.stop("idle")  # Also recenters the engine
         return True
     
-    def draw_eyelids(self, screen, eye_l_x_current, eye_l_y_current, eye_r_x_current, eye_r_y_current, 
-                    eye_l_width_current, eye_l_height_current, eye_r_width_current, eye_r_height_current):
+    def draw_eyelids(self, screen, eyes):
         """Draw eyelids based on current animation state"""
-        # Convert all position and size values to integers to avoid float errors
-        eye_l_x = int(eye_l_x_current)
-        eye_l_y = int(eye_l_y_current)
-        eye_r_x = int(eye_r_x_current)
-        eye_r_y = int(eye_r_y_current)
-        eye_l_width = int(eye_l_width_current)
-        eye_l_height = int(eye_l_height_current)
-        eye_r_width = int(eye_r_width_current)
-        eye_r_height = int(eye_r_height_current)
-        
         # Smooth transitions for eyelids
-        eyelids_closed_height = int((self.eyelids_closed_height + self.eyelids_closed_height_next) / 2)
+        eyelids_closed_height = int((self.eyelids_closed_height + self.eyelids_closed_height_next) / 2
+                                    * self.parent.render_scale)
         
-        # Draw closed eyelids if needed
-        if eyelids_closed_height > 0:
-            # For winking, only close one eye
-            if self.is_winking:
-                # Left eye wink
-                if self.wink_left_eye:
-                    pygame.draw.rect(
-                        screen,
-                        (0, 0, 0),  # BLACK
-                        (
-                            eye_l_x,
-                            eye_l_y,
-                            eye_l_width,
-                            eyelids_closed_height
-                        ),
-                        0
-                    )
-                    pygame.draw.rect(
-                        screen,
-                        (0, 0, 0),  # BLACK
-                        (
-                            eye_l_x,
-                            eye_l_y + eye_l_height - eyelids_closed_height,
-                            eye_l_width,
-                            eyelids_closed_height
-                        ),
-                        0
-                    )
-                # Right eye wink
-                else:
-                    pygame.draw.rect(
-                        screen,
-                        (0, 0, 0),  # BLACK
-                        (
-                            eye_r_x,
-                            eye_r_y,
-                            eye_r_width,
-                            eyelids_closed_height
-                        ),
-                        0
-                    )
-                    pygame.draw.rect(
-                        screen,
-                        (0, 0, 0),  # BLACK
-                        (
-                            eye_r_x,
-                            eye_r_y + eye_r_height - eyelids_closed_height,
-                            eye_r_width,
-                            eyelids_closed_height
-                        ),
-                        0
-                    )
-            # Regular blink (both eyes)
-            else:
-                # Left eye
-                pygame.draw.rect(
-                    screen,
-                    (0, 0, 0),  # BLACK
-                    (
-                        eye_l_x,
-                        eye_l_y,
-                        eye_l_width,
-                        eyelids_closed_height
-                    ),
-                    0
-                )
-                pygame.draw.rect(
-                    screen,
-                    (0, 0, 0),  # BLACK
-                    (
-                        eye_l_x,
-                        eye_l_y + eye_l_height - eyelids_closed_height,
-                        eye_l_width,
-                        eyelids_closed_height
-                    ),
-                    0
-                )
-                
-                # Right eye
-                pygame.draw.rect(
-                    screen,
-                    (0, 0, 0),  # BLACK
-                    (
-                        eye_r_x,
-                        eye_r_y,
-                        eye_r_width,
-                        eyelids_closed_height
-                    ),
-                    0
-                )
-                pygame.draw.rect(
-                    screen,
-                    (0, 0, 0),  # BLACK
-                    (
-                        eye_r_x,
-                        eye_r_y + eye_r_height - eyelids_closed_height,
-                        eye_r_width,
-                        eyelids_closed_height
-                    ),
-                    0
-                )
+        # Nothing to draw while the eyes are open
+        if eyelids_closed_height <= 0:
+            return
+        
+        # For winking, only close the eyes on one side (a cyclops winks with its only eye);
+        # a regular blink closes all of them
+        one_side = self.is_winking and len(eyes) > 1
+        for eye in eyes:
+            if one_side and eye.is_left != self.wink_left_eye:
+                continue
+            self._draw_lid_pair(
+                screen, int(eye.draw_x), int(eye.draw_y),
+                int(eye.draw_width), int(eye.draw_height), eyelids_closed_height
+            )
+
+    def _draw_lid_pair(self, screen, x, y, width, height, closed_height):
+        """Draw the top and bottom lid of one eye using the preallocated rects"""
+        top = self._lid_top
+        bottom = self._lid_bottom
+        if self.parent.shapes.subpixel:
+            # Cover the extra anti-aliased column/row of the subpixel sprite
+            width += 1
+            height += 1
+        top.update(x, y, width, closed_height)
+        bottom.update(x, y + height - closed_height, width, closed_height)
+        screen.fill(BLACK, top)
+        screen.fill(BLACK, bottom)
@@ -0,0 +1,73 @@
+"""
+Async utilities for RoboEyes
+Handles running the eyes inside an asyncio application: frames are paced
+with loop timers instead of blocking sleeps (the last stretch before a
+deadline yields with sleep(0) rather than spinning), SDL events are polled
+without blocking, and commands can be awaited until the frame that applied
+them is on screen. Other tasks on the loop only ever wait for one frame's
+render work, never for the pacing delay.
+"""
+
+import asyncio
+import time
+
+
+class AsyncRunner:
+    def __init__(self, parent):
+        """Asyncio frame loop with reference to parent RoboEyes object"""
+        self.parent = parent
+        self.active = False  # True while run() is rendering
+        self._frame_waiters = []
+
+    async def run(self, frames=None):
+        """Render until the eyes stop (window closed or quit()); returns frames rendered"""
+        parent = self.parent
+        pacer = parent.pacer
+        if self.active:
+            print("Warning: RoboEyes.run() is already active.")
+            return 0
+        self.active = True
+        count = 0
+        try:
+            while frames is None or count < frames:
+                if not parent._render_frame():
+                    break
+                self._release_waiters(True)
+
+                # Timer sleep to just before the deadline, then yield until it passes
+                target = pacer.schedule()
+                remaining = target - time.perf_counter()
+                if remaining > pacer.spin_budget:
+                    await asyncio.sleep(remaining - pacer.spin_budget)
+                else:
+                    await asyncio.sleep(0)  # Let other tasks run even when behind
+                while time.perf_counter() < target:
+                    await asyncio.sleep(0)
+
+                parent._frame_finished(pacer.frame_started())
+                count += 1
+        finally:
+            self.active = False
+            self._release_waiters(False)
+        return count
+
+    async def next_frame(self):
+        """Wait until the next frame has been presented; False if run() is not active"""
+        if not self.active:
+            return False
+        waiter = asyncio.get_running_loop().create_future()
+        self._frame_waiters.append(waiter)
+        return await waiter
+
+    async def send(self, name, *args):
+        """Queue a command and wait until the frame that applied it has been presented"""
+        if not self.parent.post_command(name, *args):
+            return False
+        return await self.next_frame()
+
+    def _release_waiters(self, presented):
+        waiters = self._frame_waiters
+        self._frame_waiters = []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(presented)
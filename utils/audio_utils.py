@@ -0,0 +1,205 @@
+"""
+Audio utilities for RoboEyes
+Handles the audio-reactive mode: WAV audio is read in chunks on a worker
+thread, turned into RMS/onset envelopes and applied to eye height and
+vertical flicker at frame boundaries.
+"""
+
+import queue
+import threading
+import time
+import wave
+
+import pygame
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, only this mode needs it
+    np = None
+
+HOPS_PER_BATCH = 32  # Frames of audio analysed per vectorized batch
+
+
+class AudioReactiveHandler:
+    def __init__(self, parent):
+        """Initialize the audio-reactive mode with reference to parent RoboEyes object"""
+        self.parent = parent
+
+        # Reaction parameters
+        self.squash = 0.3  # Height reduction at full loudness (0..1)
+        self.gain = 4.0  # RMS to envelope gain (full scale RMS ~0.25 -> 1.0)
+        self.flicker_amplitude = 3  # Max vertical flicker on strong onsets
+        self.onset_threshold = 0.15  # Onset strength that starts flicker
+        self.attack = 0.02  # Envelope rise time constant (seconds)
+        self.release = 0.12  # Envelope fall time constant (seconds)
+        self.lookahead = 0.0  # Seconds to read ahead, e.g. audio output latency
+
+        # Output read by RoboEyes when drawing
+        self.height_scale = 1.0
+        self.flicker = 0  # Vertical flicker amplitude added on onsets (pixels)
+        self.envelope = 0.0
+        self.onset = 0.0
+
+        # Stream state
+        self.active = False
+        self.sample_rate = 0
+        self.hop = 0
+        self.start_time = 0
+        self.last_update_time = 0
+        self._queue = None
+        self._worker = None
+        self._stop = threading.Event()
+        self._latest = (-1, 0.0, 0.0)  # (hop index, rms envelope, onset)
+        self._finished = False
+        self._playing = False
+
+    def start(self, path, play=False, start_time=None):
+        """Start reacting to a WAV file (optionally playing it through pygame.mixer)"""
+        if np is None:
+            print("Warning: numpy is required for the audio-reactive mode (pip install numpy).")
+            return False
+        self.stop()
+
+        try:
+            reader = wave.open(path, "rb")
+        except (OSError, wave.Error) as e:
+            print(f"Warning: Could not open WAV file '{path}': {e}")
+            return False
+
+        self.sample_rate = reader.getframerate()
+        # One hop of audio per rendered frame keeps envelopes on the frame clock
+        self.hop = max(1, int(round(self.sample_rate / self.parent.max_fps)))
+        # Bounded lookahead: at most one second of envelope values in flight
+        self._queue = queue.Queue(maxsize=max(HOPS_PER_BATCH, self.parent.max_fps))
+        self._latest = (-1, 0.0, 0.0)
+        self._finished = False
+        self._stop.clear()
+
+        if play:
+            try:
+                if not pygame.mixer.get_init():
+                    pygame.mixer.init()
+                pygame.mixer.music.load(path)  # streamed, not decoded up front
+                pygame.mixer.music.play()
+                self._playing = True
+            except pygame.error as e:
+                print(f"Warning: Could not play '{path}': {e}")
+
+        self.start_time = time.perf_counter() if start_time is None else start_time
+        self.last_update_time = self.start_time
+        self._worker = threading.Thread(target=self._run, args=(reader,), daemon=True)
+        self._worker.start()
+        self.active = True
+        return True
+
+    def stop(self):
+        """Stop the audio-reactive mode and restore the eyes"""
+        if self._worker is not None:
+            self._stop.set()
+            # Unblock a worker waiting on a full queue
+            try:
+                while True:
+                    self._queue.get_nowait()
+            except queue.Empty:
+                pass
+            self._worker.join()
+            self._worker = None
+        if self._playing:
+            if pygame.mixer.get_init():
+                pygame.mixer.music.stop()
+            self._playing = False
+        if self.active:
+            self.active = False
+            self.height_scale = 1.0
+            self.flicker = 0
+            self.envelope = 0.0
+            self.onset = 0.0
+        return True
+
+    def _run(self, reader):
+        """Worker thread: read fixed-size batches and compute envelopes"""
+        sample_width = reader.getsampwidth()
+        channels = reader.getnchannels()
+        hop = self.hop
+        index = 0
+        previous_envelope = 0.0
+        try:
+            while not self._stop.is_set():
+                raw = reader.readframes(hop * HOPS_PER_BATCH)
+                if not raw:
+                    break
+                samples = self._decode(raw, sample_width, channels)
+                hops = len(samples) // hop
+                if hops == 0:
+                    break
+                # (hops, hop) view of mono samples -> one RMS value per frame
+                frames = samples[:hops * hop].reshape(hops, hop)
+                rms = np.sqrt(np.mean(frames * frames, axis=1))
+                envelope = np.clip(rms * self.gain, 0.0, 1.0)
+                onset = np.maximum(np.diff(envelope, prepend=previous_envelope), 0.0)
+                previous_envelope = envelope[-1]
+                for i in range(hops):
+                    item = (index, float(envelope[i]), float(onset[i]))
+                    index += 1
+                    while not self._stop.is_set():
+                        try:
+                            self._queue.put(item, timeout=0.1)
+                            break
+                        except queue.Full:
+                            continue
+        finally:
+            reader.close()
+            self._finished = True
+
+    @staticmethod
+    def _decode(raw, sample_width, channels):
+        """Convert raw PCM bytes to mono float32 samples in -1..1"""
+        if sample_width == 1:
+            data = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+        elif sample_width == 2:
+            data = np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768.0
+        elif sample_width == 3:
+            b = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+            data = (b[:, 0] | (b[:, 1] << 8) | (b[:, 2] << 16))
+            data = np.where(data >= 1 << 23, data - (1 << 24), data).astype(np.float32) / 8388608.0
+        else:
+            data = np.frombuffer(raw, dtype="<i4").astype(np.float32) / 2147483648.0
+        if channels > 1:
+            data = data[:len(data) - len(data) % channels].reshape(-1, channels).mean(axis=1)
+        return data
+
+    def update(self, current_time=None):
+        """Pick the envelope for this frame's audio position and apply it"""
+        if not self.active:
+            return
+        now = time.perf_counter() if current_time is None else current_time
+        dt = max(0.0, now - self.last_update_time)
+        self.last_update_time = now
+
+        # Hop index that belongs to this frame on the shared clock
+        target = int((now - self.start_time + self.lookahead) * self.sample_rate / self.hop)
+        latest = self._latest
+        while latest[0] < target:
+            try:
+                latest = self._queue.get_nowait()
+            except queue.Empty:
+                break
+        self._latest = latest
+
+        if latest[0] < target and self._finished and self._queue.empty():
+            self.stop()
+            return
+
+        # Attack/release smoothing on real frame time
+        _, envelope, onset = latest
+        tau = self.attack if envelope > self.envelope else self.release
+        k = 1.0 if tau <= 0 else min(1.0, dt / tau)
+        self.envelope += (envelope - self.envelope) * k
+        self.onset = onset
+
+        self.height_scale = 1.0 - self.squash * self.envelope
+        # Added to the user's own flicker by the flicker animation, never via set_v_flicker
+        if onset > self.onset_threshold:
+            self.flicker = max(1, int(round(self.flicker_amplitude * min(1.0, onset * 2))))
+        else:
+            self.flicker = 0
@@ -0,0 +1,161 @@
+"""
+Capture utilities for RoboEyes
+Handles non-blocking screenshots and thumbnails: the presented frame is
+copied once on the render thread, encoded to PNG/JPEG (optionally
+downscaled) in a small worker pool, and delivered through a future.
+Recent encodes are served from a cache so frequent polling stays cheap.
+"""
+
+import io
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+
+import pygame
+
+FORMATS = {"png": "capture.png", "jpeg": "capture.jpg", "jpg": "capture.jpg"}
+
+
+class CaptureHandler:
+    def __init__(self, parent, max_workers=2, max_age=0.5, max_entries=16):
+        """Initialize frame capture with reference to parent RoboEyes object"""
+        self.parent = parent
+        self.max_workers = max_workers
+        self.max_age = max_age  # Seconds an encode is reused for repeated requests
+        self.max_entries = max_entries  # Cached encodes kept, least recently used dropped first
+        self.closed = False  # Set by shutdown(); later requests fail immediately
+
+        self._executor = None  # Created on first capture
+        self._lock = threading.Lock()
+        self._pending = {}  # (format, size) -> Future waiting for the next frame
+        self._cache = OrderedDict()  # (format, size) -> (encode time, bytes), least recent first
+        self._in_flight = {}  # Caller future -> pool task, until the encode finishes
+        self.hits = 0
+        self.misses = 0
+
+    def capture(self, format="png", size=None, max_age=None):
+        """Request the current frame encoded as PNG/JPEG; returns a Future of bytes
+
+        size=(width, height) downscales the frame first. Safe to call from any
+        thread; the copy is taken after the next presented frame.
+        """
+        format = format.lower()
+        if format not in FORMATS:
+            print(f"Warning: Unsupported capture format '{format}', use png or jpeg.")
+            return None
+        key = (format, tuple(size) if size else None)
+        max_age = self.max_age if max_age is None else max_age
+        with self._lock:
+            if self.closed:
+                future = Future()
+                future.set_exception(RuntimeError("Capture handler has been shut down"))
+                return future
+            cached = self._cache.get(key)
+            if cached is not None and time.perf_counter() - cached[0] <= max_age:
+                self.hits += 1
+                self._cache.move_to_end(key)
+                future = Future()
+                future.set_result(cached[1])
+                return future
+            self.misses += 1
+            # Requests for the same encode before the next frame share one future
+            future = self._pending.get(key)
+            if future is None:
+                future = Future()
+                self._pending[key] = future
+            return future
+
+    def thumbnail(self, width=160, format="jpeg", max_age=None):
+        """Request a downscaled frame keeping the aspect ratio"""
+        screen_w, screen_h = self.parent.screen_width, self.parent.screen_height
+        height = max(1, int(round(screen_h * width / screen_w)))
+        return self.capture(format, (width, height), max_age)
+
+    def frame_presented(self):
+        """Copy the frame once for all pending requests and hand it to the pool"""
+        if not self._pending:
+            return
+        with self._lock:
+            pending = self._pending
+            self._pending = {}
+        screen = self.parent.screen
+        if screen is None:
+            for future in pending.values():
+                future.cancel()
+            return
+
+        if not isinstance(screen, pygame.Surface):
+            screen = screen.to_surface()  # Texture backend: read the renderer back
+        frame = (pygame.image.tobytes(screen, "RGB"), screen.get_size())
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="robo-eyes-capture")
+        for key, future in pending.items():
+            if future.set_running_or_notify_cancel():
+                task = self._executor.submit(self._encode, frame, key, future)
+                with self._lock:
+                    self._in_flight[future] = task
+                task.add_done_callback(lambda _, future=future: self._finished(future))
+
+    def _finished(self, future):
+        with self._lock:
+            self._in_flight.pop(future, None)
+
+    def _encode(self, frame, key, future):
+        """Worker: rebuild the frame, scale it and encode it"""
+        try:
+            data, size = frame
+            format, target = key
+            surface = pygame.image.frombytes(data, size, "RGB")
+            if target is not None and target != size:
+                surface = pygame.transform.smoothscale(surface, target)
+            buffer = io.BytesIO()
+            pygame.image.save(surface, buffer, FORMATS[format])
+            encoded = buffer.getvalue()
+        except Exception as error:
+            future.set_exception(error)
+            return
+        with self._lock:
+            self._cache[key] = (time.perf_counter(), encoded)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        future.set_result(encoded)
+
+    def get_cache_stats(self):
+        """Get capture cache hit counters"""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def clear(self):
+        """Drop cached encodes and cancel requests still waiting for a frame"""
+        with self._lock:
+            pending = self._pending
+            self._pending = {}
+            self._cache.clear()
+        for future in pending.values():
+            future.cancel()
+        return True
+
+    def shutdown(self):
+        """Cancel pending requests and stop the worker pool; later requests fail"""
+        with self._lock:
+            self.closed = True
+            pending = self._pending
+            self._pending = {}
+            in_flight = list(self._in_flight.items())
+        for future in pending.values():
+            future.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        # Encodes dropped from the queue never run: fail their futures instead of leaving them pending
+        for future, task in in_flight:
+            if task.cancelled() and not future.done():
+                future.set_exception(CancelledError())
+        return True
@@ -0,0 +1,394 @@
+"""
+Command log utilities for RoboEyes
+Records every command applied to a RoboEyes instance (moods and mood mixes,
+positions, blinks, shapes, configure batches, flicker, gaze and arrow-key
+input) with timestamps into an append-only binary log, and replays a log at
+1x, Nx or maximum speed while reporting throughput and frame-time statistics.
+
+Replay a recorded session headless with:
+    python -m utils.command_log_utils session.rel --speed 4
+"""
+
+import argparse
+import os
+import struct
+import threading
+import time
+
+import pygame
+
+# Record layout: varint delta in microseconds, command id byte, arg count byte,
+# kwarg count byte, then tagged values (kwargs are preceded by their name).
+MAGIC = b"REL1"
+SESSION = 0  # Command id 0 starts a session: float64 wall-clock start time
+
+# Command ids are part of the file format: only ever append to this tuple
+RECORDED_COMMANDS = (
+    None,  # SESSION
+    "set_mood",
+    "set_position",
+    "blink",
+    "wink",
+    "anim_laugh",
+    "anim_confused",
+    "set_eye_shape",
+    "set_h_flicker",
+    "set_v_flicker",
+    "look_at",
+    "keys",
+    "set_micro_saccades",
+    "configure",
+    "set_mood_mix",
+)
+COMMAND_IDS = {name: index for index, name in enumerate(RECORDED_COMMANDS) if name}
+
+# Value tags
+TAG_NONE = 0
+TAG_FALSE = 1
+TAG_TRUE = 2
+TAG_INT = 3
+TAG_FLOAT = 4
+TAG_STR = 5
+TAG_TUPLE = 6  # Count byte, then the tagged items (lists replay as tuples)
+TAG_DICT = 7  # Count byte, then tagged key/value pairs
+
+# Arrow keys packed into the "keys" command bitmask
+KEY_BITS = ((pygame.K_UP, 1), (pygame.K_DOWN, 2), (pygame.K_LEFT, 4), (pygame.K_RIGHT, 8))
+
+_FLOAT = struct.Struct("<d")
+_INT = struct.Struct("<i")
+
+
+def _encode_varint(value, out):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _encode_value(value, out):
+    if value is None:
+        out.append(TAG_NONE)
+    elif value is True:
+        out.append(TAG_TRUE)
+    elif value is False:
+        out.append(TAG_FALSE)
+    elif isinstance(value, int) and -2**31 <= value < 2**31:
+        out.append(TAG_INT)
+        out += _INT.pack(value)
+    elif isinstance(value, (int, float)):
+        out.append(TAG_FLOAT)
+        out += _FLOAT.pack(value)
+    elif isinstance(value, (tuple, list)):
+        out.append(TAG_TUPLE)
+        out.append(min(len(value), 255))
+        for item in value[:255]:
+            _encode_value(item, out)
+    elif isinstance(value, dict):
+        items = list(value.items())[:255]
+        out.append(TAG_DICT)
+        out.append(len(items))
+        for key, item in items:
+            _encode_value(key, out)
+            _encode_value(item, out)
+    else:
+        data = str(value).encode("utf-8")[:255]
+        out.append(TAG_STR)
+        out.append(len(data))
+        out += data
+
+
+def _decode_value(data, pos):
+    """Read one tagged value at pos; returns (value, next position)"""
+    tag = data[pos]
+    pos += 1
+    if tag == TAG_NONE:
+        return None, pos
+    if tag == TAG_FALSE:
+        return False, pos
+    if tag == TAG_TRUE:
+        return True, pos
+    if tag == TAG_INT:
+        return _INT.unpack_from(data, pos)[0], pos + _INT.size
+    if tag == TAG_FLOAT:
+        return _FLOAT.unpack_from(data, pos)[0], pos + _FLOAT.size
+    if tag == TAG_TUPLE:
+        items = []
+        count = data[pos]
+        pos += 1
+        for _ in range(count):
+            item, pos = _decode_value(data, pos)
+            items.append(item)
+        return tuple(items), pos
+    if tag == TAG_DICT:
+        items = {}
+        count = data[pos]
+        pos += 1
+        for _ in range(count):
+            key, pos = _decode_value(data, pos)
+            items[key], pos = _decode_value(data, pos)
+        return items, pos
+    length = data[pos]
+    return data[pos + 1:pos + 1 + length].decode("utf-8"), pos + 1 + length
+
+
+def keys_to_mask(keys):
+    """Pack arrow key states into a bitmask"""
+    mask = 0
+    for key, bit in KEY_BITS:
+        if keys[key]:
+            mask |= bit
+    return mask
+
+
+def mask_to_keys(mask):
+    """Unpack a bitmask into an arrow key state mapping"""
+    return {key: bool(mask & bit) for key, bit in KEY_BITS}
+
+
+class CommandLog:
+    def __init__(self, path):
+        """Append-only binary log of commands applied to a RoboEyes instance"""
+        self.path = path
+        self.file = None
+        self.parent = None
+        self.records = 0
+        self._lock = threading.Lock()
+        self._last_time = 0.0
+        self._last_flush = 0.0
+        self._last_keys = 0
+        self._local = threading.local()  # Per-thread call depth: only the outermost recorded call is logged
+
+    def attach(self, parent):
+        """Open the log and start recording commands applied to parent"""
+        try:
+            self.file = open(self.path, "ab")
+        except OSError as error:
+            print(f"Warning: Could not open command log '{self.path}': {error}")
+            return False
+        if self.file.tell() == 0:
+            self.file.write(MAGIC)
+
+        self.parent = parent
+        self._last_time = time.perf_counter()
+        self._last_flush = self._last_time
+        self._last_keys = 0
+        out = bytearray()
+        _encode_varint(0, out)
+        out.append(SESSION)
+        out += _FLOAT.pack(time.time())
+        self.file.write(out)
+
+        # Shadow the recorded methods on the instance so the class stays untouched
+        for name in COMMAND_IDS:
+            if name != "keys":
+                setattr(parent, name, self._wrap(name, getattr(parent, name)))
+        return True
+
+    def detach(self):
+        """Stop recording and close the log"""
+        if self.parent is not None:
+            for name in COMMAND_IDS:
+                self.parent.__dict__.pop(name, None)
+            self.parent = None
+        if self.file is not None:
+            with self._lock:
+                self.file.close()
+                self.file = None
+        return True
+
+    def _wrap(self, name, method):
+        command_id = COMMAND_IDS[name]
+
+        def recorded(*args, **kwargs):
+            local = self._local
+            depth = getattr(local, "depth", 0)
+            if depth == 0:
+                self.record(command_id, args, kwargs)
+            local.depth = depth + 1
+            try:
+                return method(*args, **kwargs)
+            finally:
+                local.depth = depth
+
+        recorded.__name__ = name
+        recorded.__doc__ = method.__doc__
+        return recorded
+
+    def record_keys(self, keys):
+        """Log the arrow key state when it changes (called once per frame)"""
+        mask = keys_to_mask(keys)
+        if mask != self._last_keys:
+            self._last_keys = mask
+            self.record(COMMAND_IDS["keys"], (mask,), None)
+
+    def record(self, command_id, args, kwargs):
+        """Append one command record"""
+        now = time.perf_counter()
+        out = bytearray()
+        with self._lock:
+            if self.file is None:
+                return
+            _encode_varint(max(0, int(round((now - self._last_time) * 1e6))), out)
+            self._last_time = now
+            out.append(command_id)
+            out.append(len(args))
+            out.append(len(kwargs) if kwargs else 0)
+            for value in args:
+                _encode_value(value, out)
+            if kwargs:
+                for key, value in kwargs.items():
+                    _encode_value(key, out)
+                    _encode_value(value, out)
+            self.file.write(out)
+            self.records += 1
+            # Keep the log useful after a crash without flushing every record
+            if now - self._last_flush > 1.0:
+                self.file.flush()
+                self._last_flush = now
+
+
+def read_command_log(path):
+    """Yield (seconds since the first record, name, args, kwargs) from a log"""
+    with open(path, "rb") as file:
+        data = file.read()
+    if data[:4] != MAGIC:
+        raise ValueError(f"'{path}' is not a RoboEyes command log")
+
+    pos = 4
+    end = len(data)
+    elapsed = 0.0
+    try:
+        while pos < end:
+            delta = 0
+            shift = 0
+            while True:
+                byte = data[pos]
+                pos += 1
+                delta |= (byte & 0x7F) << shift
+                if byte < 0x80:
+                    break
+                shift += 7
+            command_id = data[pos]
+            pos += 1
+            if command_id == SESSION:
+                # Sessions are concatenated back to back; the wall-clock start is informational
+                pos += _FLOAT.size
+                continue
+            elapsed += delta / 1e6
+
+            argc = data[pos]
+            kwargc = data[pos + 1]
+            pos += 2
+            values = []
+            for _ in range(argc + kwargc * 2):
+                value, pos = _decode_value(data, pos)
+                values.append(value)
+            kwargs = {values[i]: values[i + 1] for i in range(argc, len(values), 2)}
+            yield elapsed, RECORDED_COMMANDS[command_id], tuple(values[:argc]), kwargs
+    except (IndexError, struct.error):
+        print(f"Warning: Command log '{path}' ends with a truncated record.")
+
+
+def _frame_summary(frame_times):
+    count = len(frame_times)
+    if count == 0:
+        return {"frames": 0}
+    ordered = sorted(frame_times)
+    return {
+        "frames": count,
+        "frame_time_avg": sum(ordered) / count,
+        "frame_time_p95": ordered[min(count - 1, int(count * 0.95))],
+        "frame_time_max": ordered[-1],
+    }
+
+
+def replay_command_log(eyes, path, speed=1.0, report_interval=None):
+    """Feed a recorded log back into an initialized RoboEyes
+
+    speed scales log time (2.0 replays twice as fast); None or 0 replays at
+    maximum speed, rendering one unpaced frame per batch of commands.
+    Animations still run on wall-clock time. Returns throughput and
+    frame-time statistics; report_interval prints them periodically.
+    """
+    records = list(read_command_log(path))
+    unpaced = not speed
+    frame_times = []
+    commands = 0
+    index = 0
+    start = time.perf_counter()
+    last_report = start
+
+    try:
+        while index < len(records) and eyes.is_running():
+            # Apply every command that is due in (scaled) log time
+            now = time.perf_counter()
+            log_time = records[index][0] if unpaced else (now - start) * speed
+            while index < len(records) and records[index][0] <= log_time:
+                _, name, args, kwargs = records[index]
+                if name == "keys":
+                    eyes.replay_keys = mask_to_keys(args[0])
+                else:
+                    getattr(eyes, name)(*args, **kwargs)
+                commands += 1
+                index += 1
+
+            if unpaced:
+                frame_start = time.perf_counter()
+                eyes.render()
+                if eyes.owns_display:
+                    pygame.display.flip()
+                frame_times.append(time.perf_counter() - frame_start)
+            else:
+                eyes.update()
+                frame_times.append(eyes.pacer.last_work_time)
+
+            if report_interval and now - last_report >= report_interval:
+                last_report = now
+                elapsed = now - start
+                print(f"replay: {index}/{len(records)} commands, "
+                      f"{commands / elapsed:.0f} cmd/s, {len(frame_times) / elapsed:.1f} fps")
+    finally:
+        eyes.replay_keys = None
+
+    elapsed = max(1e-9, time.perf_counter() - start)
+    stats = _frame_summary(frame_times)
+    stats.update({
+        "commands": commands,
+        "elapsed": elapsed,
+        "commands_per_second": commands / elapsed,
+        "frames_per_second": len(frame_times) / elapsed,
+        "log_duration": records[-1][0] if records else 0.0,
+    })
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a RoboEyes command log and report frame stats")
+    parser.add_argument("log")
+    parser.add_argument("--speed", type=float, default=1.0, help="log time multiplier, 0 for maximum speed")
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=320)
+    parser.add_argument("--fps", type=int, default=60)
+    parser.add_argument("--headless", action="store_true", help="render without opening a window")
+    args = parser.parse_args()
+
+    if args.headless:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+
+    from robo_eyes import RoboEyes
+
+    eyes = RoboEyes()
+    eyes.begin(args.width, args.height, args.fps)
+    eyes.animations.set_auto_blinker(False)  # Only replay what was recorded
+    eyes.set_idle_mode(False)
+    try:
+        stats = replay_command_log(eyes, args.log, args.speed, report_interval=1.0)
+    finally:
+        eyes.quit()
+    for key, value in stats.items():
+        print(f"{key}: {value:.6g}" if isinstance(value, float) else f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,387 @@
+"""
+Export utilities for RoboEyes
+Handles offline export of animation clips for microcontrollers: blink,
+wink, laugh, confused, every mood and the mood transitions are rendered
+with the regular RoboEyes code on a frame-stepped clock, quantized to a
+chosen bit depth, and encoded as a keyframe followed by XOR-delta frames,
+all run-length encoded. Clips are written to a binary pack with an index
+table, optionally also as a C header with a reference decoder. Clips are
+always rendered in worker processes, since rendering steps a fake
+time.time() for the whole process.
+
+Export with:
+    python -m utils.export_utils eyes.pack --width 128 --height 64 --bpp 1 --header eyes.h
+"""
+
+import argparse
+import os
+import random
+import struct
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, only the exporter needs it
+    np = None
+
+from utils.moods_utils import DEFAULT, TIRED, SAD, EXCITED
+
+PACK_MAGIC = b"REYE"
+PACK_VERSION = 2  # 2: 32-bit frame lengths
+HEADER = struct.Struct("<4sBBBBHHHH")  # magic, version, bpp, fps, reserved, width, height, clips, reserved
+INDEX_ENTRY = struct.Struct("<24sIHH")  # name (NUL-padded), data offset, frame count, reserved
+FRAME_HEADER = struct.Struct("<BI")  # frame type, encoded length
+KEYFRAME = 0
+DELTA = 1
+
+MOODS = {"default": DEFAULT, "tired": TIRED, "sad": SAD, "excited": EXCITED}
+
+
+def _build_clips():
+    """name -> (duration in seconds, setup calls, trigger calls); calls are (method, args)"""
+    clips = {
+        "blink": (0.4, [], [("blink", ())]),
+        "wink_left": (0.4, [], [("wink", (True,))]),
+        "wink_right": (0.4, [], [("wink", (False,))]),
+        "laugh": (1.1, [], [("anim_laugh", ())]),
+        "confused": (1.1, [], [("anim_confused", ())]),
+    }
+    for name, mood in MOODS.items():
+        # A settled mood is a single still frame
+        clips[f"mood_{name}"] = (0.0, [("set_mood", (mood, 0))], [])
+    for name, mood in MOODS.items():
+        if mood == DEFAULT:
+            continue
+        clips[f"default_to_{name}"] = (0.4, [], [("set_mood", (mood,))])
+        clips[f"{name}_to_default"] = (0.4, [("set_mood", (mood, 0))], [("set_mood", (DEFAULT,))])
+    return clips
+
+
+CLIPS = _build_clips()
+
+
+class _FrameClock:
+    """Stand-in for time.time() that only advances when told to"""
+
+    def __init__(self, start=1000.0):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+
+def render_clip(name, width, height, fps, bpp):
+    """Render one clip with RoboEyes on a stepped clock; returns quantized (h, w) frames
+
+    Replaces time.time() process-wide while it runs, so only call it in a
+    worker process (export_clips() does).
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    from robo_eyes import RoboEyes
+
+    duration, setup, trigger = CLIPS[name]
+    clock = _FrameClock()
+    real_time = time.time
+    time.time = clock  # Animations read time.time(); step it per frame instead
+    random.seed(0)
+    try:
+        surface = pygame.Surface((width, height))
+        eyes = RoboEyes()
+        eyes.begin(width, height, fps, surface=surface)
+        eyes.animations.set_auto_blinker(False)
+        eyes.set_idle_mode(False)
+        for method, args in setup:
+            getattr(eyes, method)(*args)
+        # Let position and size smoothing settle before the clip starts
+        for _ in range(30):
+            clock.now += 1.0 / fps
+            eyes.render()
+        for method, args in trigger:
+            getattr(eyes, method)(*args)
+
+        frames = []
+        for _ in range(max(1, int(round(duration * fps)))):
+            clock.now += 1.0 / fps
+            eyes.render()
+            frames.append(quantize(pygame.surfarray.array3d(surface), bpp))
+        eyes.quit()
+    finally:
+        time.time = real_time
+    return frames
+
+
+def quantize(rgb, bpp):
+    """(w, h, 3) RGB array -> (h, w) luminance levels with 2**bpp steps"""
+    rgb = rgb.astype(np.uint16)
+    lum = (rgb[:, :, 0] * 77 + rgb[:, :, 1] * 150 + rgb[:, :, 2] * 29) >> 8
+    levels = (1 << bpp) - 1
+    return ((lum.T * levels + 127) // 255).astype(np.uint8)
+
+
+def pack_pixels(levels, bpp):
+    """Pack (h, w) levels MSB-first, each row padded to whole bytes"""
+    if bpp == 8:
+        return levels.tobytes()
+    per_byte = 8 // bpp
+    height, width = levels.shape
+    padded_width = -(-width // per_byte) * per_byte
+    rows = np.zeros((height, padded_width), dtype=np.uint8)
+    rows[:, :width] = levels
+    shifts = (bpp * np.arange(per_byte - 1, -1, -1)).astype(np.uint8)
+    grouped = rows.reshape(height, padded_width // per_byte, per_byte) << shifts
+    return np.bitwise_or.reduce(grouped, axis=2).astype(np.uint8).tobytes()
+
+
+def rle_encode(data):
+    """PackBits-style RLE: 0x80|n-1 + byte for runs, n-1 + bytes for literals (n <= 128)"""
+    arr = np.frombuffer(data, dtype=np.uint8)
+    size = len(arr)
+    out = bytearray()
+    if size == 0:
+        return bytes(out)
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(arr)) + 1))
+    lengths = np.diff(np.concatenate((starts, [size])))
+
+    literal_start = None
+
+    def flush_literal(end):
+        position = literal_start
+        while position < end:
+            count = min(128, end - position)
+            out.append(count - 1)
+            out.extend(data[position:position + count])
+            position += count
+
+    for start, length in zip(starts.tolist(), lengths.tolist()):
+        if length >= 3:
+            if literal_start is not None:
+                flush_literal(start)
+                literal_start = None
+            value = data[start]
+            while length > 0:
+                count = min(128, length)
+                out.append(0x80 | (count - 1))
+                out.append(value)
+                length -= count
+        elif literal_start is None:
+            literal_start = start
+    if literal_start is not None:
+        flush_literal(size)
+    return bytes(out)
+
+
+def rle_decode(data, size):
+    """Reference decoder for rle_encode()"""
+    out = bytearray()
+    i = 0
+    end = len(data)
+    while i < end:
+        control = data[i]
+        i += 1
+        if control & 0x80:
+            out.extend(data[i:i + 1] * ((control & 0x7F) + 1))
+            i += 1
+        else:
+            count = control + 1
+            out.extend(data[i:i + count])
+            i += count
+    if len(out) != size:
+        raise ValueError(f"Decoded {len(out)} bytes, expected {size}")
+    return bytes(out)
+
+
+def _xor(a, b):
+    return (int.from_bytes(a, "little") ^ int.from_bytes(b, "little")).to_bytes(len(a), "little")
+
+
+def encode_clip(frames, bpp):
+    """Keyframe + XOR delta frames, each RLE encoded; returns (frame records, raw size)"""
+    records = []
+    previous = None
+    raw_size = 0
+    for levels in frames:
+        packed = pack_pixels(levels, bpp)
+        raw_size += len(packed)
+        if previous is None:
+            records.append((KEYFRAME, rle_encode(packed)))
+        else:
+            records.append((DELTA, rle_encode(_xor(packed, previous))))
+        previous = packed
+    return records, raw_size
+
+
+def _export_clip(job):
+    """Worker entry: render and encode one clip"""
+    name, width, height, fps, bpp = job
+    started = time.perf_counter()
+    frames = render_clip(name, width, height, fps, bpp)
+    records, raw_size = encode_clip(frames, bpp)
+    return name, records, raw_size, time.perf_counter() - started
+
+
+def decode_clip(records, frame_size):
+    """Decode every frame of a clip (what the MCU does); returns the packed frames"""
+    frames = []
+    previous = None
+    for kind, data in records:
+        frame = rle_decode(data, frame_size)
+        if kind == DELTA:
+            frame = _xor(frame, previous)
+        frames.append(frame)
+        previous = frame
+    return frames
+
+
+def write_pack(path, clips, width, height, fps, bpp):
+    """Write [(name, records), ...] as a pack file; returns its bytes"""
+    index_size = HEADER.size + INDEX_ENTRY.size * len(clips)
+    body = bytearray()
+    index = bytearray()
+    for name, records in clips:
+        index += INDEX_ENTRY.pack(name.encode("ascii")[:23], index_size + len(body), len(records), 0)
+        for kind, data in records:
+            body += FRAME_HEADER.pack(kind, len(data))
+            body += data
+    pack = HEADER.pack(PACK_MAGIC, PACK_VERSION, bpp, fps, 0, width, height, len(clips), 0) + bytes(index) + bytes(body)
+    with open(path, "wb") as file:
+        file.write(pack)
+    return pack
+
+
+C_DECODER = """
+/* Decode one frame record at src into dst (frame bytes, row-major, MSB-first).
+ * Delta frames are XORed onto the previous frame already in dst.
+ * Returns a pointer to the next frame record. */
+static inline const uint8_t *robo_eyes_decode_frame(const uint8_t *src, uint8_t *dst)
+{
+    uint8_t type = src[0];
+    uint32_t length = (uint32_t)src[1] | ((uint32_t)src[2] << 8) | ((uint32_t)src[3] << 16) | ((uint32_t)src[4] << 24);
+    const uint8_t *in = src + 5;
+    const uint8_t *end = in + length;
+    while (in < end) {
+        uint8_t control = *in++;
+        uint16_t count = (uint16_t)(control & 0x7F) + 1;
+        if (control & 0x80) {
+            uint8_t value = *in++;
+            while (count--) { *dst = type ? (uint8_t)(*dst ^ value) : value; dst++; }
+        } else {
+            while (count--) { *dst = type ? (uint8_t)(*dst ^ *in) : *in; dst++; in++; }
+        }
+    }
+    return end;
+}
+"""
+
+
+def write_c_header(path, pack, clips, width, height, fps, bpp):
+    """Write the pack as a C array with clip defines and a reference decoder"""
+    guard = "ROBO_EYES_PACK_H"
+    frame_bytes = height * (-(-width * bpp // 8))
+    lines = [
+        f"#ifndef {guard}",
+        f"#define {guard}",
+        "",
+        "/* Pack layout (little-endian): 16-byte header, then one 32-byte index entry per clip",
+        " * (char name[24], uint32 data offset, uint16 frame count, uint16 reserved).",
+        " * Clip data is a sequence of frame records: uint8 type (0 key, 1 XOR delta),",
+        " * uint32 length, PackBits RLE bytes. */",
+        "",
+        "#include <stdint.h>",
+        "",
+        f"#define ROBO_EYES_WIDTH {width}",
+        f"#define ROBO_EYES_HEIGHT {height}",
+        f"#define ROBO_EYES_BPP {bpp}",
+        f"#define ROBO_EYES_FPS {fps}",
+        f"#define ROBO_EYES_FRAME_BYTES {frame_bytes}",
+        f"#define ROBO_EYES_HEADER_BYTES {HEADER.size}",
+        f"#define ROBO_EYES_INDEX_ENTRY_BYTES {INDEX_ENTRY.size}",
+        "",
+    ]
+    for number, (name, records) in enumerate(clips):
+        lines.append(f"#define ROBO_EYES_CLIP_{name.upper()} {number}  /* {len(records)} frames */")
+    lines += ["", f"static const uint8_t robo_eyes_pack[{len(pack)}] = {{"]
+    for start in range(0, len(pack), 16):
+        lines.append("    " + ", ".join(f"0x{byte:02x}" for byte in pack[start:start + 16]) + ",")
+    lines += ["};", C_DECODER, f"#endif /* {guard} */", ""]
+    with open(path, "w") as file:
+        file.write("\n".join(lines))
+
+
+def export_clips(path, width=128, height=64, fps=30, bpp=1, names=None, header=None, workers=None):
+    """Render, encode and write clips in parallel; returns per-clip statistics"""
+    if np is None:
+        print("Warning: numpy is required for exporting clips (pip install numpy).")
+        return None
+    if bpp not in (1, 2, 4, 8):
+        print(f"Warning: Unsupported bit depth {bpp}, use 1, 2, 4 or 8.")
+        return None
+    names = list(CLIPS) if names is None else names
+    unknown = [name for name in names if name not in CLIPS]
+    if unknown:
+        print(f"Warning: Unknown clips {unknown}. Valid clips are: {list(CLIPS)}")
+        return None
+
+    jobs = [(name, width, height, fps, bpp) for name in names]
+    # Even a single worker is a separate process: rendering fakes time.time() process-wide
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(_export_clip, jobs))
+
+    frame_size = height * (-(-width * bpp // 8))
+    clips = []
+    stats = {}
+    for name, records, raw_size, render_time in results:
+        encoded = sum(FRAME_HEADER.size + len(data) for _, data in records)
+        started = time.perf_counter()
+        decode_clip(records, frame_size)
+        decode_time = time.perf_counter() - started
+        clips.append((name, records))
+        stats[name] = {
+            "frames": len(records),
+            "raw_bytes": raw_size,
+            "encoded_bytes": encoded,
+            "ratio": raw_size / encoded if encoded else 0.0,
+            "decode_us_per_frame": decode_time / len(records) * 1e6,
+            "export_seconds": render_time,
+        }
+
+    pack = write_pack(path, clips, width, height, fps, bpp)
+    if header:
+        write_c_header(header, pack, clips, width, height, fps, bpp)
+    stats["total"] = {
+        "frames": sum(s["frames"] for s in stats.values()),
+        "raw_bytes": sum(s["raw_bytes"] for s in stats.values()),
+        "pack_bytes": len(pack),
+    }
+    stats["total"]["ratio"] = stats["total"]["raw_bytes"] / len(pack)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export RoboEyes animation clips as a compressed frame pack")
+    parser.add_argument("output")
+    parser.add_argument("--width", type=int, default=128)
+    parser.add_argument("--height", type=int, default=64)
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--bpp", type=int, default=1, choices=(1, 2, 4, 8))
+    parser.add_argument("--clips", help="comma-separated clip names (default: all)")
+    parser.add_argument("--header", help="also write a C header with the pack and a decoder")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    names = args.clips.split(",") if args.clips else None
+    stats = export_clips(args.output, args.width, args.height, args.fps, args.bpp, names, args.header, args.workers)
+    if stats is None:
+        sys.exit(1)
+    total = stats.pop("total")
+    for name, clip in stats.items():
+        print(f"{name:20s} {clip['frames']:3d} frames  {clip['raw_bytes']:7d} -> {clip['encoded_bytes']:6d} bytes "
+              f"({clip['ratio']:5.1f}x)  decode {clip['decode_us_per_frame']:7.1f} us/frame")
+    print(f"{'total':20s} {total['frames']:3d} frames  {total['raw_bytes']:7d} -> {total['pack_bytes']:6d} bytes "
+          f"({total['ratio']:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
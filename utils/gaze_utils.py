@@ -0,0 +1,212 @@
+"""
+Gaze utilities for RoboEyes
+Handles continuous gaze input (face trackers, mouse, ...) including
+per-frame sample coalescing, low-latency filtering and latency reporting.
+"""
+
+import math
+import threading
+import time
+
+# Filter names
+ONE_EURO = "one_euro"
+SPRING = "spring"
+
+
+class OneEuroFilter:
+    """One-Euro filter: smooths jitter at low speed, follows quickly at high speed"""
+
+    def __init__(self, min_cutoff=1.0, beta=0.05, d_cutoff=1.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.value = None
+        self.derivative = 0.0
+
+    @staticmethod
+    def _alpha(cutoff, dt):
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def reset(self, value=None):
+        """Forget filter history"""
+        self.value = value
+        self.derivative = 0.0
+
+    def filter(self, target, dt):
+        """Filter one sample taken dt seconds after the previous one"""
+        if self.value is None or dt <= 0:
+            self.value = target
+            return target
+        derivative = (target - self.value) / dt
+        a_d = self._alpha(self.d_cutoff, dt)
+        self.derivative += a_d * (derivative - self.derivative)
+        cutoff = self.min_cutoff + self.beta * abs(self.derivative)
+        self.value += self._alpha(cutoff, dt) * (target - self.value)
+        return self.value
+
+
+class SpringFilter:
+    """Critically damped spring: eases toward the target without overshoot"""
+
+    def __init__(self, frequency=12.0):
+        self.frequency = frequency  # angular frequency (rad/s), higher is snappier
+        self.value = None
+        self.velocity = 0.0
+
+    def reset(self, value=None):
+        """Forget filter history"""
+        self.value = value
+        self.velocity = 0.0
+
+    def filter(self, target, dt):
+        """Advance the spring by dt seconds toward target"""
+        if self.value is None:
+            self.value = target
+            return target
+        if dt <= 0:
+            return self.value
+        # Exact solution of the critically damped oscillator over dt
+        omega = self.frequency
+        x = self.value - target
+        decay = math.exp(-omega * dt)
+        temp = (self.velocity + omega * x) * dt
+        self.velocity = (self.velocity - omega * temp) * decay
+        self.value = target + (x + temp) * decay
+        return self.value
+
+
+def make_filter(kind, **params):
+    """Create a gaze filter by name"""
+    if kind == ONE_EURO:
+        return OneEuroFilter(**params)
+    if kind == SPRING:
+        return SpringFilter(**params)
+    raise ValueError(f"Unknown gaze filter '{kind}'. Valid filters are: {[ONE_EURO, SPRING]}")
+
+
+class GazeHandler:
+    def __init__(self, parent):
+        """Initialize gaze input with reference to parent RoboEyes object"""
+        self.parent = parent
+
+        # Newest unconsumed sample (x, y, timestamp); older ones are overwritten
+        self._lock = threading.Lock()
+        self._pending = None
+        self.samples_received = 0
+        self.samples_coalesced = 0
+
+        # Filtering
+        self.filter_kind = ONE_EURO
+        self.filter_params = {}
+        self.filter_x = make_filter(self.filter_kind)
+        self.filter_y = make_filter(self.filter_kind)
+        self.last_update_time = None
+
+        # Gaze target and output (normalized -1..1 and pixel offsets)
+        self.target_x = 0.0
+        self.target_y = 0.0
+        self.x_offset = 0.0
+        self.y_offset = 0.0
+        self.offset_max = 50  # Maximum pixel offset at |x| or |y| == 1
+        self.hold_time = 2.0  # Seconds without samples before easing back to center
+        self.last_sample_time = 0
+        self.active = False
+
+        # Input-to-render latency (seconds)
+        self._rendering_sample_time = None
+        self.latency_last = 0.0
+        self.latency_avg = 0.0
+        self.latency_max = 0.0
+        self.latency_count = 0
+
+    def look_at(self, x, y, timestamp=None):
+        """Queue a gaze sample; safe to call from any thread at any rate"""
+        if timestamp is None:
+            timestamp = time.perf_counter()
+        with self._lock:
+            if self._pending is not None:
+                self.samples_coalesced += 1
+            self._pending = (x, y, timestamp)
+            self.samples_received += 1
+        return True
+
+    def set_filter(self, kind, **params):
+        """Select the gaze filter (ONE_EURO or SPRING) and its parameters"""
+        if kind not in (ONE_EURO, SPRING):
+            print(f"Warning: Unknown gaze filter '{kind}'. Valid filters are: {[ONE_EURO, SPRING]}")
+            return False
+        try:
+            filter_x = make_filter(kind, **params)
+            filter_y = make_filter(kind, **params)
+        except TypeError as error:
+            print(f"Warning: Invalid parameters for gaze filter '{kind}': {error}")
+            return False
+        self.filter_x = filter_x
+        self.filter_y = filter_y
+        self.filter_kind = kind
+        self.filter_params = params
+        return True
+
+    def update(self):
+        """Consume the newest sample and advance the filter (once per frame)"""
+        now = time.perf_counter()
+        dt = 0.0 if self.last_update_time is None else now - self.last_update_time
+        self.last_update_time = now
+
+        with self._lock:
+            sample = self._pending
+            self._pending = None
+
+        if sample is not None:
+            x, y, sample_time = sample
+            self.target_x = max(-1.0, min(1.0, x))
+            self.target_y = max(-1.0, min(1.0, y))
+            self.last_sample_time = sample_time
+            self._rendering_sample_time = sample_time
+            self.active = True
+        elif self.active and now - self.last_sample_time > self.hold_time:
+            # Input went quiet, drift back to center
+            self.target_x = 0.0
+            self.target_y = 0.0
+            self.active = False
+
+        if not self.active and abs(self.x_offset) < 0.5 and abs(self.y_offset) < 0.5:
+            # Idle and centered: nothing to do
+            self.x_offset = 0.0
+            self.y_offset = 0.0
+            self.filter_x.reset()
+            self.filter_y.reset()
+            return
+
+        if self.filter_x.value is None:
+            self.filter_x.reset(self.x_offset)
+            self.filter_y.reset(self.y_offset)
+        self.x_offset = self.filter_x.filter(self.target_x * self.offset_max, dt)
+        self.y_offset = self.filter_y.filter(self.target_y * self.offset_max, dt)
+
+    def frame_presented(self):
+        """Record input-to-render latency for the sample drawn this frame"""
+        if self._rendering_sample_time is None:
+            return
+        latency = time.perf_counter() - self._rendering_sample_time
+        self._rendering_sample_time = None
+        self.latency_last = latency
+        self.latency_max = max(self.latency_max, latency)
+        self.latency_count += 1
+        # Exponential moving average keeps this O(1)
+        if self.latency_count == 1:
+            self.latency_avg = latency
+        else:
+            self.latency_avg += 0.1 * (latency - self.latency_avg)
+
+    def get_latency_stats(self):
+        """Get input-to-render latency statistics in seconds"""
+        return {
+            "last": self.latency_last,
+            "avg": self.latency_avg,
+            "max": self.latency_max,
+            "frames": self.latency_count,
+            "samples_received": self.samples_received,
+            "samples_coalesced": self.samples_coalesced,
+        }
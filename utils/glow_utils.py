@@ -0,0 +1,141 @@
+"""
+Glow utilities for RoboEyes
+Handles the soft Cosmo-style halo around the eyes. Halo sprites are blurred
+once per (shape, size bucket, color, radius) with a separable NumPy blur,
+kept in bounded caches and blitted with a max blend after each eye body.
+"""
+
+from collections import OrderedDict
+
+import pygame
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, only the glow needs it
+    np = None
+
+SIZE_BUCKET = 8  # Eye sizes are rounded to this many pixels for caching
+COLOR_STEP = 16  # Halo colors are quantized to this step for caching
+
+
+class GlowHandler:
+    def __init__(self, parent, max_masks=32, max_sprites=64):
+        """Initialize the glow layer with reference to parent RoboEyes object"""
+        self.parent = parent
+        self.enabled = False
+        self.radius = 12  # Blur radius in pixels
+        self.intensity = 0.6  # Peak halo brightness relative to the eye color
+
+        # Blurred intensity masks keyed without color, and colored sprites built from them
+        self.max_masks = max_masks
+        self.max_sprites = max_sprites
+        self._masks = OrderedDict()
+        self._sprites = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def set_glow(self, state, radius=12, intensity=0.6):
+        """Enable/disable the glow and set its radius and brightness"""
+        if state and np is None:
+            print("Warning: numpy is required for the glow layer (pip install numpy).")
+            return False
+        if radius != self.radius or intensity != self.intensity:
+            self._masks.clear()
+            self._sprites.clear()
+        self.enabled = state
+        self.radius = max(1, int(radius))
+        self.intensity = max(0.0, min(1.0, intensity))
+        return True
+
+    def draw(self, screen, shape, x, y, width, height, color, is_left_eye=True):
+        """Blit the halo for one eye with a max blend, centered on the eye box"""
+        if width <= 0 or height <= 0:
+            return
+        radius = max(1, int(self.radius * self.parent.render_scale))
+        bucket_w = max(SIZE_BUCKET, int(round(width / SIZE_BUCKET)) * SIZE_BUCKET)
+        bucket_h = max(SIZE_BUCKET, int(round(height / SIZE_BUCKET)) * SIZE_BUCKET)
+        side = is_left_eye if shape == "angry" else None
+        quantized = tuple(min(255, int(round(c / COLOR_STEP)) * COLOR_STEP) for c in color[:3])
+
+        key = (shape, side, bucket_w, bucket_h, quantized, radius)
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            self.misses += 1
+            sprite = self._colorize(self._mask(shape, side, bucket_w, bucket_h, radius), quantized)
+            self._sprites[key] = sprite
+            if len(self._sprites) > self.max_sprites:
+                self._sprites.popitem(last=False)
+        else:
+            self.hits += 1
+            self._sprites.move_to_end(key)
+
+        sprite_w, sprite_h = sprite.get_size()
+        screen.blit(sprite, (x + (width - sprite_w) // 2, y + (height - sprite_h) // 2),
+                    special_flags=pygame.BLEND_RGB_MAX)
+
+    def _mask(self, shape, side, width, height, radius):
+        """Blurred 0..1 coverage of a shape, padded by the blur radius"""
+        key = (shape, side, width, height, radius)
+        mask = self._masks.get(key)
+        if mask is not None:
+            self._masks.move_to_end(key)
+            return mask
+
+        # Rasterize the shape in white on black using the regular shape code
+        pad = radius * 2
+        surface = pygame.Surface((width + pad * 2, height + pad * 2))
+        self._draw_shape(surface, shape, side, pad, pad, width, height)
+        coverage = pygame.surfarray.array_red(surface).astype(np.float32) / 255.0
+
+        # Separable Gaussian blur: one 1-D pass per axis
+        sigma = radius / 2.0
+        offsets = np.arange(-radius, radius + 1, dtype=np.float32)
+        kernel = np.exp(-(offsets * offsets) / (2 * sigma * sigma))
+        kernel /= kernel.sum()
+        mask = self._blur_axis(self._blur_axis(coverage, kernel, 0), kernel, 1)
+
+        self._masks[key] = mask
+        if len(self._masks) > self.max_masks:
+            self._masks.popitem(last=False)
+        return mask
+
+    @staticmethod
+    def _blur_axis(array, kernel, axis):
+        """Convolve along one axis with vectorized shifted adds"""
+        radius = len(kernel) // 2
+        pad = [(0, 0), (0, 0)]
+        pad[axis] = (radius, radius)
+        padded = np.pad(array, pad)
+        out = np.zeros_like(array)
+        length = array.shape[axis]
+        for i, weight in enumerate(kernel):
+            if axis == 0:
+                out += weight * padded[i:i + length, :]
+            else:
+                out += weight * padded[:, i:i + length]
+        return out
+
+    def _draw_shape(self, surface, shape, side, x, y, width, height):
+        """Draw a white eye body for the mask"""
+        self.parent.shapes.draw_shape(surface, (255, 255, 255), shape, pygame.Rect(x, y, width, height),
+                                      side, bg_color=(0, 0, 0))
+
+    def _colorize(self, mask, color):
+        """Build an RGB sprite (black where there is no glow) for max-blended blits"""
+        width, height = mask.shape
+        rgb = np.empty((width, height, 3), dtype=np.uint8)
+        strength = mask * self.intensity
+        for channel in range(3):
+            rgb[:, :, channel] = np.minimum(strength * color[channel], 255).astype(np.uint8)
+        return pygame.surfarray.make_surface(rgb)
+
+    def get_cache_stats(self):
+        """Get halo cache sizes and hit counters"""
+        total = self.hits + self.misses
+        return {
+            "masks": len(self._masks),
+            "sprites": len(self._sprites),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
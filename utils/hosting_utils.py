@@ -0,0 +1,228 @@
+"""
+Hosting utilities for RoboEyes
+Handles running many RoboEyes faces in one process: a DisplayHost owns
+pygame, the (optional) window, the event loop and frame pacing, while each
+face renders into its own surface. A FacePool creates, reuses and evicts
+faces for avatar sessions; released faces are reset and handed to the next
+session rather than rebuilt.
+"""
+
+import math
+import time
+from collections import OrderedDict
+
+import pygame
+
+from robo_eyes import RoboEyes
+from utils.pacing_utils import FramePacer
+
+
+class DisplayHost:
+    def __init__(self, width=640, height=320, max_fps=60, headless=False, caption="RoboEyes Host"):
+        """Own pygame, the window (unless headless) and the frame loop for hosted faces"""
+        self.width = width
+        self.height = height
+        self.max_fps = max_fps
+        self.headless = headless
+        self.caption = caption
+        self.screen = None
+        self.running = False
+        self.faces = []  # Faces rendered each frame, in draw order
+        self.pacer = FramePacer(max_fps)
+        self.event_handlers = []  # Callables receiving each pygame event
+
+    def begin(self):
+        """Initialize pygame and open the window (no window when headless)"""
+        # Headless hosts need no display: surfaces and drawing work without one
+        if not self.headless:
+            pygame.init()
+            self.screen = pygame.display.set_mode((self.width, self.height))
+            pygame.display.set_caption(self.caption)
+        self.pacer.set_fps(self.max_fps)
+        self.running = True
+        return True
+
+    def create_face(self, width, height, surface=None):
+        """Create a RoboEyes instance rendering into its own surface and attach it"""
+        if surface is None:
+            surface = pygame.Surface((width, height))
+        face = RoboEyes()
+        face.begin(width, height, self.max_fps, surface=surface)
+        self.attach(face)
+        return face
+
+    def attach(self, face):
+        """Render a face every host frame"""
+        if face not in self.faces:
+            self.faces.append(face)
+        return True
+
+    def detach(self, face):
+        """Stop rendering a face; the face keeps its state and surface"""
+        if face in self.faces:
+            self.faces.remove(face)
+        return True
+
+    def add_event_handler(self, handler):
+        """Receive pygame events polled by the host"""
+        self.event_handlers.append(handler)
+        return True
+
+    def update(self):
+        """Poll events, render every attached face, present and pace one frame"""
+        if not self.running:
+            return False
+
+        if not self.headless:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self.quit()
+                    return False
+                for handler in self.event_handlers:
+                    handler(event)
+
+        # Each face's render time feeds its quality governor and metrics
+        work_times = []
+        for face in self.faces:
+            started = time.perf_counter()
+            face.render()
+            work_times.append(time.perf_counter() - started)
+
+        if self.screen is not None:
+            self._compose()
+            pygame.display.flip()
+        for face in self.faces:
+            face.frame_presented()
+
+        now = self.pacer.wait()
+        for face, work_time in zip(self.faces, work_times):
+            face._frame_finished(now, work_time)
+        return True
+
+    def _compose(self):
+        """Tile face surfaces into the window"""
+        self.screen.fill((0, 0, 0))
+        count = len(self.faces)
+        if count == 0:
+            return
+        if count == 1:
+            face_surface = self.faces[0].screen
+            if face_surface.get_size() == (self.width, self.height):
+                self.screen.blit(face_surface, (0, 0))
+            else:
+                pygame.transform.scale(face_surface, (self.width, self.height), self.screen)
+            return
+        columns = math.ceil(math.sqrt(count))
+        rows = math.ceil(count / columns)
+        cell_w = self.width // columns
+        cell_h = self.height // rows
+        for index, face in enumerate(self.faces):
+            x = (index % columns) * cell_w
+            y = (index // columns) * cell_h
+            self.screen.blit(pygame.transform.scale(face.screen, (cell_w, cell_h)), (x, y))
+
+    def is_running(self):
+        """Check if the host loop is still running"""
+        return self.running
+
+    def quit(self):
+        """Stop all faces and shut down pygame"""
+        self.running = False
+        for face in self.faces:
+            face.quit()
+        self.faces = []
+        pygame.quit()
+
+
+class FacePool:
+    def __init__(self, host, face_width=320, face_height=160, max_faces=256, idle_timeout=300.0):
+        """Create, reuse and evict hosted faces for sessions"""
+        self.host = host
+        self.face_width = face_width
+        self.face_height = face_height
+        self.max_faces = max_faces
+        self.idle_timeout = idle_timeout  # Seconds without use before a session is evicted
+        self.sessions = OrderedDict()  # session id -> (face, last used), least recent first
+        self._free_faces = []  # Released faces, reset and reused by new sessions
+        self.created = 0
+        self.reused = 0
+        self.evicted = 0
+
+    def acquire(self, session_id):
+        """Get the face for a session, creating (or recycling) one if needed"""
+        entry = self.sessions.get(session_id)
+        if entry is not None:
+            self.sessions[session_id] = (entry[0], time.monotonic())
+            self.sessions.move_to_end(session_id)
+            return entry[0]
+
+        if len(self.sessions) >= self.max_faces:
+            # Evict the least recently used session to make room
+            oldest = next(iter(self.sessions))
+            self.release(oldest)
+            self.evicted += 1
+
+        if self._free_faces:
+            face = self._free_faces.pop()
+            face.reset()
+            self.host.attach(face)
+            self.reused += 1
+        else:
+            face = self.host.create_face(self.face_width, self.face_height)
+            self.created += 1
+        self.sessions[session_id] = (face, time.monotonic())
+        return face
+
+    def touch(self, session_id):
+        """Mark a session as used without fetching its face"""
+        if session_id in self.sessions:
+            self.sessions[session_id] = (self.sessions[session_id][0], time.monotonic())
+            self.sessions.move_to_end(session_id)
+            return True
+        return False
+
+    def release(self, session_id):
+        """End a session; its face is kept for reuse"""
+        entry = self.sessions.pop(session_id, None)
+        if entry is None:
+            return False
+        face = entry[0]
+        self.host.detach(face)
+        self._free_faces.append(face)
+        return True
+
+    def evict_idle(self, now=None):
+        """Release sessions idle for longer than idle_timeout; returns how many"""
+        if now is None:
+            now = time.monotonic()
+        count = 0
+        while self.sessions:
+            session_id, (face, last_used) = next(iter(self.sessions.items()))
+            if now - last_used <= self.idle_timeout:
+                break
+            self.release(session_id)
+            count += 1
+        self.evicted += count
+        return count
+
+    def close(self):
+        """End every session and quit the pooled faces"""
+        for session_id in list(self.sessions):
+            self.release(session_id)
+        for face in self._free_faces:
+            face.quit()
+        self._free_faces = []
+        return True
+
+    def __len__(self):
+        return len(self.sessions)
+
+    def get_stats(self):
+        """Get pool occupancy and reuse counters"""
+        return {
+            "active": len(self.sessions),
+            "free_faces": len(self._free_faces),
+            "created": self.created,
+            "reused": self.reused,
+            "evicted": self.evicted,
+        }
@@ -0,0 +1,142 @@
+"""
+Idle gaze utilities for RoboEyes
+Handles the idle mode: a small Markov behavior table (glance, dwell,
+return to center) picks where to look next, retarget deadlines are
+scheduled once per step, and the eyes follow with a critically damped
+spring on real frame time.
+"""
+
+import bisect
+import random
+
+from utils.gaze_utils import SpringFilter
+from utils.shapes_utils import DEFAULT, N, NE, E, SE, S, SW, W, NW
+
+# Unit gaze vector per direction constant
+DIRECTION_VECTORS = {
+    DEFAULT: (0.0, 0.0),
+    N: (0.0, -1.0),
+    NE: (1.0, -1.0),
+    E: (1.0, 0.0),
+    SE: (1.0, 1.0),
+    S: (0.0, 1.0),
+    SW: (-1.0, 1.0),
+    W: (-1.0, 0.0),
+    NW: (-1.0, -1.0),
+}
+GLANCE_DIRECTIONS = (N, NE, E, SE, S, SW, W, NW)
+
+# Behavior states
+CENTER = "center"  # Rest in the middle
+GLANCE = "glance"  # Quick look in a random direction
+DWELL = "dwell"  # Keep looking where the last glance went
+RETURN = "return"  # Drift back to the middle
+
+# state -> (duration range in seconds, [(next state, probability), ...])
+# A duration of None uses the idle interval/variation set through set_idle_mode().
+DEFAULT_BEHAVIOR = {
+    CENTER: (None, [(GLANCE, 0.8), (CENTER, 0.2)]),
+    GLANCE: ((0.3, 0.8), [(DWELL, 0.4), (RETURN, 0.4), (GLANCE, 0.2)]),
+    DWELL: ((1.0, 2.5), [(RETURN, 0.7), (GLANCE, 0.3)]),
+    RETURN: ((0.4, 0.8), [(CENTER, 1.0)]),
+}
+
+
+class IdleGazeEngine:
+    def __init__(self, behavior=None, offset=15, frequency=8.0):
+        """Table-driven idle gaze with a critically damped spring"""
+        self.offset = offset  # Pixels per unit of gaze vector
+        self.interval = 1
+        self.variation = 3
+        self.spring_x = SpringFilter(frequency)
+        self.spring_y = SpringFilter(frequency)
+        self.spring_x.reset(0.0)
+        self.spring_y.reset(0.0)
+        self.set_behavior(DEFAULT_BEHAVIOR if behavior is None else behavior)
+
+        self.state = CENTER
+        self.target_x = 0.0
+        self.target_y = 0.0
+        self.next_retarget_time = None
+        self.last_time = None
+        self.settled = True
+        self.x = 0.0  # Current offset in pixels
+        self.y = 0.0
+
+    def set_behavior(self, behavior):
+        """Compile a behavior table into cumulative transition lists"""
+        compiled = {}
+        for state, (duration, transitions) in behavior.items():
+            total = sum(p for _, p in transitions)
+            cumulative = []
+            running = 0.0
+            for _, p in transitions:
+                running += p / total
+                cumulative.append(running)
+            compiled[state] = (duration, [s for s, _ in transitions], cumulative)
+        self.behavior = compiled
+        return True
+
+    def set_timing(self, interval, variation):
+        """Set how long the eyes rest at center between glances"""
+        self.interval = interval
+        self.variation = variation
+        self.next_retarget_time = None
+        return True
+
+    def _enter(self, state, current_time):
+        """Switch behavior state and schedule its end once"""
+        self.state = state
+        duration, _, _ = self.behavior[state]
+        if duration is None:
+            hold = self.interval + random.uniform(0, self.variation)
+        else:
+            hold = random.uniform(duration[0], duration[1])
+        self.next_retarget_time = current_time + hold
+
+        if state == GLANCE:
+            self.target_x, self.target_y = DIRECTION_VECTORS[random.choice(GLANCE_DIRECTIONS)]
+        elif state in (CENTER, RETURN):
+            self.target_x, self.target_y = DIRECTION_VECTORS[DEFAULT]
+        # DWELL keeps the current target
+        self.settled = False
+
+    def update(self, current_time):
+        """Advance idle gaze; returns the (x, y) offset in pixels"""
+        dt = 0.0 if self.last_time is None else current_time - self.last_time
+        self.last_time = current_time
+
+        if self.next_retarget_time is None:
+            self._enter(self.state, current_time)
+        elif current_time >= self.next_retarget_time:
+            _, states, cumulative = self.behavior[self.state]
+            index = bisect.bisect_left(cumulative, random.random())
+            self._enter(states[min(index, len(states) - 1)], current_time)
+
+        if self.settled:
+            return self.x, self.y
+
+        goal_x = self.target_x * self.offset
+        goal_y = self.target_y * self.offset
+        self.x = self.spring_x.filter(goal_x, dt)
+        self.y = self.spring_y.filter(goal_y, dt)
+        if (abs(self.x - goal_x) < 0.05 and abs(self.y - goal_y) < 0.05
+                and abs(self.spring_x.velocity) < 0.05 and abs(self.spring_y.velocity) < 0.05):
+            # Close enough: snap and stop integrating until the next retarget
+            self.x = goal_x
+            self.y = goal_y
+            self.spring_x.reset(goal_x)
+            self.spring_y.reset(goal_y)
+            self.settled = True
+        return self.x, self.y
+
+    def reset(self):
+        """Return to center immediately"""
+        self.state = CENTER
+        self.target_x = self.target_y = 0.0
+        self.x = self.y = 0.0
+        self.spring_x.reset(0.0)
+        self.spring_y.reset(0.0)
+        self.next_retarget_time = None
+        self.last_time = None
+        self.settled = True
@@ -0,0 +1,106 @@
+"""
+Layout utilities for RoboEyes
+Handles eye geometry as an array of eye records: 1 eye (cyclops), 2 (the
+classic pair) or up to 8 for spider-style faces. Each record carries its
+side (which left/right size settings and angry cut it uses), a per-eye
+layout offset and size scale, and its animated geometry, so drawing and
+animation loop over the array instead of handling each eye by name.
+"""
+
+import pygame
+
+# Sides: which of the left/right size settings an eye follows
+LEFT = 0
+RIGHT = 1
+
+MAX_EYES = 8
+MAX_COLUMNS = 4  # Faces with more eyes than this wrap into two rows
+
+
+class Eye:
+    __slots__ = (
+        "index", "side", "offset_x", "offset_y", "scale",
+        "x", "y", "x_next", "y_next",
+        "width_current", "height_current", "border_radius_current",
+        "draw_x", "draw_y", "draw_width", "draw_height", "rect",
+    )
+
+    def __init__(self, index, side, width=36, height=36, border_radius=8):
+        """One eye: layout slot, per-eye offset/scale and animated geometry"""
+        self.index = index
+        self.side = side
+        self.offset_x = 0  # Per-eye layout offset in pixels
+        self.offset_y = 0
+        self.scale = 1.0  # Per-eye size relative to its side's width/height
+
+        # Resting position from the layout, and the target animations move toward
+        self.x = 0
+        self.y = 0
+        self.x_next = 0
+        self.y_next = 0
+
+        # Smoothed size, eased toward the side's target every frame
+        self.width_current = width
+        self.height_current = height
+        self.border_radius_current = border_radius
+
+        # This frame's geometry in canvas pixels (filled by RoboEyes._draw_eyes)
+        self.draw_x = 0.0
+        self.draw_y = 0.0
+        self.draw_width = 0.0
+        self.draw_height = 0.0
+        self.rect = pygame.Rect(0, 0, 0, 0)  # Preallocated integer draw rect
+
+    @property
+    def is_left(self):
+        return self.side == LEFT
+
+
+def create_eyes(count, width=36, height=36, border_radius=8):
+    """Build count eye records, ordered row by row, left to right"""
+    eyes = []
+    index = 0
+    for row in layout_rows(count):
+        for column in range(row):
+            # The middle eye of an odd row (and a cyclops) follows the left settings
+            side = LEFT if column < (row + 1) // 2 else RIGHT
+            eyes.append(Eye(index, side, width, height, border_radius))
+            index += 1
+    return eyes
+
+
+def layout_rows(count):
+    """Eyes per row: one row up to MAX_COLUMNS, otherwise two (the top one gets the odd eye)"""
+    if count <= MAX_COLUMNS:
+        return [count]
+    return [(count + 1) // 2, count // 2]
+
+
+def layout_eyes(eyes, screen_width, screen_height, widths, heights, space_between):
+    """Center the rows of eyes on the screen and set each eye's resting position
+
+    widths and heights are (left, right) pairs, scaled per eye. Vertical
+    positions are computed in doubled coordinates so a single row matches
+    (screen_height - height) // 2 exactly.
+    """
+    rows = layout_rows(len(eyes))
+    row_sizes = []
+    start = 0
+    for count in rows:
+        row = eyes[start:start + count]
+        start += count
+        sizes = [(int(widths[eye.side] * eye.scale), int(heights[eye.side] * eye.scale)) for eye in row]
+        row_sizes.append((row, sizes, max(height for _, height in sizes)))
+
+    block_height = sum(row_height for _, _, row_height in row_sizes) + space_between * (len(rows) - 1)
+    top2 = screen_height - block_height  # Twice the top edge of the block
+    for row, sizes, row_height in row_sizes:
+        total_width = sum(width for width, _ in sizes) + space_between * (len(row) - 1)
+        x = (screen_width - total_width) // 2
+        for eye, (width, height) in zip(row, sizes):
+            eye.x = x + eye.offset_x
+            eye.y = (top2 + row_height - height) // 2 + eye.offset_y
+            eye.x_next = eye.x
+            eye.y_next = eye.y
+            x += width + space_between
+        top2 += 2 * (row_height + space_between)
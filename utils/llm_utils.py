@@ -0,0 +1,288 @@
+"""
+LLM utilities for RoboEyes
+Handles LLM-driven expressions: prompts are streamed to an OpenAI-compatible
+chat completions endpoint and expression directives such as [mood:tired] or
+[blink] are applied to the eyes as soon as they appear in the stream.
+"""
+
+import asyncio
+import json
+import ssl
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+from utils.moods_utils import DEFAULT, TIRED, SAD, EXCITED
+
+# Directive vocabulary understood by the parser
+MOOD_NAMES = {"default": DEFAULT, "neutral": DEFAULT, "tired": TIRED, "sad": SAD,
+              "angry": SAD, "excited": EXCITED, "happy": EXCITED}
+LOOK_DIRECTIONS = {"center": (0, 0), "n": (0, -1), "ne": (1, -1), "e": (1, 0), "se": (1, 1),
+                   "s": (0, 1), "sw": (-1, 1), "w": (-1, 0), "nw": (-1, -1)}
+
+SYSTEM_PROMPT = (
+    "You control a pair of animated robot eyes. Reply briefly and put expression tags "
+    "inline, as early as possible, where the emotion changes: [mood:default|tired|sad|excited], "
+    "[blink], [wink:left|right], [laugh], [confused], [look:center|n|ne|e|se|s|sw|w|nw]."
+)
+
+MAX_DIRECTIVE_LENGTH = 32  # Longer bracketed text is treated as plain text
+
+
+def parse_directive(text):
+    """Turn the inside of a [tag] into a (RoboEyes method, args) command, or None"""
+    name, _, arg = text.strip().lower().partition(":")
+    name = name.strip()
+    arg = arg.strip()
+    if name == "mood" and arg in MOOD_NAMES:
+        return ("set_mood", (MOOD_NAMES[arg],))
+    if name == "blink":
+        return ("blink", ())
+    if name == "wink":
+        return ("wink", (arg != "right",))
+    if name == "laugh":
+        return ("anim_laugh", ())
+    if name == "confused":
+        return ("anim_confused", ())
+    if name == "look" and arg in LOOK_DIRECTIONS:
+        x, y = LOOK_DIRECTIONS[arg]
+        return ("look_at", (x * 0.7, y * 0.7))
+    return None
+
+
+class DirectiveParser:
+    """Incremental [tag] parser that works across arbitrary chunk boundaries"""
+
+    def __init__(self):
+        self._pending = ""
+
+    def feed(self, chunk):
+        """Consume a chunk of streamed text; return (plain text, commands)"""
+        data = self._pending + chunk
+        self._pending = ""
+        text = []
+        commands = []
+        pos = 0
+        while True:
+            start = data.find("[", pos)
+            if start < 0:
+                text.append(data[pos:])
+                break
+            text.append(data[pos:start])
+            end = data.find("]", start + 1)
+            if end < 0:
+                if len(data) - start <= MAX_DIRECTIVE_LENGTH:
+                    # Tag may continue in the next chunk
+                    self._pending = data[start:]
+                else:
+                    text.append(data[start:])
+                break
+            command = parse_directive(data[start + 1:end])
+            if command is None:
+                text.append(data[start:end + 1])
+            else:
+                commands.append(command)
+            pos = end + 1
+        return "".join(text), commands
+
+    def flush(self):
+        """Return any text held back waiting for a closing bracket"""
+        pending = self._pending
+        self._pending = ""
+        return pending
+
+
+class TTLCache:
+    """Small LRU cache whose entries expire after ttl seconds"""
+
+    def __init__(self, max_entries=128, ttl=300.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Return the cached value or None"""
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry[0] > self.ttl:
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key, value):
+        """Store a value, evicting the least recently used entry when full"""
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+async def _read_http_body(reader, headers):
+    """Yield body bytes, handling chunked transfer encoding"""
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        while True:
+            size_line = await reader.readline()
+            size = int(size_line.split(b";")[0].strip() or b"0", 16)
+            if size == 0:
+                await reader.readline()
+                return
+            data = await reader.readexactly(size)
+            await reader.readexactly(2)  # CRLF after each chunk
+            yield data
+    else:
+        remaining = int(headers["content-length"]) if "content-length" in headers else None
+        while remaining is None or remaining > 0:
+            data = await reader.read(4096 if remaining is None else min(4096, remaining))
+            if not data:
+                return
+            if remaining is not None:
+                remaining -= len(data)
+            yield data
+
+
+async def stream_chat_completion(base_url, model, messages, api_key=None, timeout=30.0):
+    """Stream content deltas from an OpenAI-compatible /chat/completions endpoint"""
+    url = urlsplit(base_url.rstrip("/") + "/chat/completions")
+    secure = url.scheme == "https"
+    port = url.port or (443 if secure else 80)
+    body = json.dumps({"model": model, "messages": messages, "stream": True}).encode()
+    request_headers = [
+        f"POST {url.path} HTTP/1.1",
+        f"Host: {url.hostname}:{port}",
+        "Content-Type: application/json",
+        "Accept: text/event-stream",
+        f"Content-Length: {len(body)}",
+        "Connection: close",
+    ]
+    if api_key:
+        request_headers.append(f"Authorization: Bearer {api_key}")
+
+    reader, writer = await asyncio.wait_for(
+        asyncio.open_connection(url.hostname, port, ssl=ssl.create_default_context() if secure else None),
+        timeout,
+    )
+    try:
+        writer.write(("\r\n".join(request_headers) + "\r\n\r\n").encode() + body)
+        await writer.drain()
+
+        status_line = await asyncio.wait_for(reader.readline(), timeout)
+        parts = status_line.decode("latin-1").split()
+        status = int(parts[1]) if len(parts) > 1 else 0
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            key, _, value = line.decode("latin-1").partition(":")
+            headers[key.strip().lower()] = value.strip()
+        if status != 200:
+            raise RuntimeError(f"LLM endpoint returned HTTP {status}")
+
+        # Server-sent events: "data: {json}" lines, terminated by "data: [DONE]"
+        buffer = b""
+        async for data in _read_http_body(reader, headers):
+            buffer += data
+            while b"\n" in buffer:
+                line, buffer = buffer.split(b"\n", 1)
+                line = line.strip()
+                if not line.startswith(b"data:"):
+                    continue
+                payload = line[5:].strip()
+                if payload == b"[DONE]":
+                    return
+                try:
+                    event = json.loads(payload)
+                    content = event["choices"][0]["delta"].get("content")
+                except (ValueError, KeyError, IndexError):
+                    continue
+                if content:
+                    yield content
+    finally:
+        writer.close()
+
+
+class LLMExpressionController:
+    def __init__(self, eyes, base_url="http://127.0.0.1:8000/v1", model="gpt-4o-mini",
+                 api_key=None, system_prompt=SYSTEM_PROMPT, cache_size=128, cache_ttl=300.0):
+        """Drive RoboEyes expressions from an OpenAI-compatible streaming LLM"""
+        self.eyes = eyes
+        self.base_url = base_url
+        self.model = model
+        self.api_key = api_key
+        self.system_prompt = system_prompt
+        self.cache = TTLCache(cache_size, cache_ttl)
+        self.loop = None
+        self._thread = None
+
+        # Time from request to first applied expression (seconds)
+        self.first_expression_latency = None
+
+    def _apply(self, commands):
+        """Hand commands to the render thread; never blocks a frame"""
+        for name, args in commands:
+            self.eyes.post_command(name, *args)
+
+    async def ask(self, prompt):
+        """Send a prompt, applying expressions while the reply streams; returns the reply text"""
+        started = time.perf_counter()
+        key = (self.model, self.system_prompt, prompt)
+        cached = self.cache.get(key)
+        if cached is not None:
+            text, commands = cached
+            self._apply(commands)
+            self.first_expression_latency = time.perf_counter() - started if commands else None
+            return text
+
+        messages = [{"role": "system", "content": self.system_prompt},
+                    {"role": "user", "content": prompt}]
+        parser = DirectiveParser()
+        text = []
+        applied = []
+        self.first_expression_latency = None
+        async for chunk in stream_chat_completion(self.base_url, self.model, messages, self.api_key):
+            plain, commands = parser.feed(chunk)
+            text.append(plain)
+            if commands:
+                if self.first_expression_latency is None:
+                    self.first_expression_latency = time.perf_counter() - started
+                self._apply(commands)
+                applied.extend(commands)
+        text.append(parser.flush())
+        reply = "".join(text)
+        self.cache.put(key, (reply, applied))
+        return reply
+
+    def start(self):
+        """Run the controller's event loop on a background thread"""
+        if self._thread is not None:
+            return True
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self._thread.start()
+        return True
+
+    def submit(self, prompt):
+        """Thread-safe: schedule ask(prompt) and return a concurrent.futures.Future"""
+        if self.loop is None:
+            self.start()
+        return asyncio.run_coroutine_threadsafe(self.ask(prompt), self.loop)
+
+    def stop(self):
+        """Stop the background event loop"""
+        if self._thread is None:
+            return True
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+        self.loop = None
+        self._thread = None
+        return True
@@ -0,0 +1,160 @@
+"""
+Metrics utilities for RoboEyes
+Handles render health reporting: cheap per-frame counters maintained by
+RoboEyes.update(), and an optional HTTP endpoint on a background thread
+that serves them in Prometheus text format. Scrapes only read plain
+counters, they never lock or call into the render thread.
+"""
+
+import bisect
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from utils.moods_utils import DEFAULT, TIRED, SAD, EXCITED
+
+# Histogram bucket upper bounds in seconds
+FRAME_TIME_BUCKETS = (0.001, 0.002, 0.004, 0.008, 0.012, 0.016, 0.020, 0.033, 0.050, 0.100, 0.250)
+MOOD_LABELS = {DEFAULT: "default", TIRED: "tired", SAD: "sad", EXCITED: "excited"}
+
+
+class Histogram:
+    def __init__(self, bounds=FRAME_TIME_BUCKETS):
+        """Fixed-bucket histogram; observe() is one bisect and two adds"""
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # Last slot is +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def render(self, name, help_text):
+        """Prometheus text lines (cumulative buckets)"""
+        counts = list(self.counts)
+        lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+        running = 0
+        for bound, count in zip(self.bounds, counts):
+            running += count
+            lines.append(f'{name}_bucket{{le="{bound}"}} {running}')
+        running += counts[-1]
+        lines.append(f'{name}_bucket{{le="+Inf"}} {running}')
+        lines.append(f"{name}_sum {self.total:.6f}")
+        lines.append(f"{name}_count {running}")
+        return lines
+
+
+class RenderMetrics:
+    def __init__(self, parent):
+        """Per-frame counters with reference to parent RoboEyes object"""
+        self.parent = parent
+        self.start_time = time.time()
+        self.frames = 0
+        self.work_time = Histogram()  # Time spent producing each frame
+        self.interval = Histogram()  # Time between frame starts
+        self.fps = 0.0  # Exponentially smoothed achieved frame rate
+        self._last_frame = None
+
+    def record_frame(self, work_time, now):
+        """Called by RoboEyes.update() once per frame after pacing"""
+        self.frames += 1
+        self.work_time.observe(work_time)
+        if self._last_frame is not None:
+            interval = now - self._last_frame
+            self.interval.observe(interval)
+            if interval > 0:
+                self.fps += (1.0 / interval - self.fps) * 0.1
+        self._last_frame = now
+
+    def render(self):
+        """Snapshot all metrics as Prometheus text exposition"""
+        parent = self.parent
+        pacer = parent.pacer
+        lines = []
+
+        def gauge(name, help_text, value, kind="gauge"):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"{name} {value}")
+
+        gauge("robo_eyes_uptime_seconds", "Seconds since metrics were enabled", f"{time.time() - self.start_time:.3f}")
+        gauge("robo_eyes_frames_total", "Frames rendered", self.frames, "counter")
+        gauge("robo_eyes_fps", "Achieved frames per second (smoothed)", f"{self.fps:.2f}")
+        gauge("robo_eyes_target_fps", "Target frames per second", pacer.max_fps)
+        gauge("robo_eyes_missed_deadlines_total", "Frames that overran their slot", pacer.missed_deadlines, "counter")
+        gauge("robo_eyes_dropped_frames_total", "Frame slots skipped after overruns", pacer.dropped_frames, "counter")
+        lines += self.work_time.render("robo_eyes_frame_work_seconds", "Time spent producing a frame")
+        lines += self.interval.render("robo_eyes_frame_interval_seconds", "Time between frame starts")
+        gauge("robo_eyes_command_queue_depth", "Commands waiting for the next frame", len(parent.command_queue))
+        gauge("robo_eyes_quality_level", "Adaptive quality level (0 is full quality)", parent.quality.level)
+
+        lines.append("# HELP robo_eyes_cache_hit_ratio Hit ratio of render caches")
+        lines.append("# TYPE robo_eyes_cache_hit_ratio gauge")
+        texture_cache = parent.screen if parent.window is not None else None
+        for cache, owner in (("glow", parent.glow), ("capture", parent.captures), ("texture", texture_cache)):
+            if owner is not None:
+                total = owner.hits + owner.misses
+                lines.append(f'robo_eyes_cache_hit_ratio{{cache="{cache}"}} {owner.hits / total if total else 0.0:.4f}')
+
+        if parent.moods is not None:
+            mood = MOOD_LABELS.get(parent.moods.current_mood, str(parent.moods.current_mood))
+            lines.append("# HELP robo_eyes_mood Current mood")
+            lines.append("# TYPE robo_eyes_mood gauge")
+            lines.append(f'robo_eyes_mood{{mood="{mood}"}} 1')
+        if parent.shapes is not None:
+            lines.append("# HELP robo_eyes_shape Current eye shape")
+            lines.append("# TYPE robo_eyes_shape gauge")
+            lines.append(f'robo_eyes_shape{{shape="{parent.shapes.eye_shape}"}} 1')
+        lines.append("")
+        return "\n".join(lines)
+
+
+class MetricsServer:
+    def __init__(self, metrics, host="127.0.0.1", port=9464):
+        """Serve /metrics from a daemon thread"""
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        """Bind and start serving; returns False if the port is unavailable"""
+        metrics = self.metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Keep scrapes out of the console
+
+        try:
+            self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        except OSError as error:
+            print(f"Warning: Could not start metrics server on {self.host}:{self.port}: {error}")
+            return False
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]  # Resolve port 0
+        self._thread = threading.Thread(target=self._server.serve_forever, name="robo-eyes-metrics", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        """Stop serving and release the port"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            self._thread = None
+        return True
@@ -0,0 +1,168 @@
+"""
+Mock LLM server for RoboEyes
+A tiny OpenAI-compatible /chat/completions endpoint that streams canned
+replies with expression tags, for testing the LLM controller offline.
+
+Run standalone with:
+    python -m utils.mock_llm_server --port 8000
+"""
+
+import argparse
+import asyncio
+import json
+import threading
+
+# Canned replies picked by keyword in the user's prompt
+MOCK_REPLIES = [
+    (("tired", "sleep", "late"), "[mood:tired] It has been a long day... [blink] I could use a nap."),
+    (("sad", "sorry", "lost"), "[mood:sad] Oh no, I'm sorry to hear that. [look:s]"),
+    (("joke", "funny", "haha"), "[laugh] Ha! That's a good one. [mood:excited]"),
+    (("what", "why", "how"), "[confused] Hmm, let me think about that... [look:ne] Good question!"),
+    (("hello", "hi", "hey"), "[mood:excited] Hello there! [wink:left] Nice to see you."),
+]
+FALLBACK_REPLY = "[mood:default] I see. [blink] Tell me more."
+
+
+def pick_reply(prompt):
+    """Choose a canned reply for a prompt"""
+    lowered = prompt.lower()
+    for keywords, reply in MOCK_REPLIES:
+        if any(keyword in lowered for keyword in keywords):
+            return reply
+    return FALLBACK_REPLY
+
+
+def tokenize(text):
+    """Split a reply into word-sized stream tokens, keeping whitespace"""
+    tokens = []
+    word = ""
+    for char in text:
+        word += char
+        if char == " ":
+            tokens.append(word)
+            word = ""
+    if word:
+        tokens.append(word)
+    return tokens
+
+
+class MockLLMServer:
+    def __init__(self, host="127.0.0.1", port=8000, token_delay=0.03):
+        """Streaming mock of an OpenAI-compatible chat completions server"""
+        self.host = host
+        self.port = port
+        self.token_delay = token_delay  # Seconds between streamed tokens
+        self.requests_served = 0
+        self.loop = None
+        self._server = None
+        self._thread = None
+        self._ready = threading.Event()
+
+    async def _handle(self, reader, writer):
+        """Serve one HTTP request"""
+        try:
+            request_line = await reader.readline()
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                key, _, value = line.decode("latin-1").partition(":")
+                headers[key.strip().lower()] = value.strip()
+            body = await reader.readexactly(int(headers.get("content-length", "0")))
+
+            if b"/chat/completions" not in request_line:
+                writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+                return
+            try:
+                messages = json.loads(body).get("messages", [])
+                prompt = messages[-1]["content"] if messages else ""
+            except (ValueError, KeyError, IndexError, AttributeError):
+                writer.write(b"HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+                return
+
+            self.requests_served += 1
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                         b"Transfer-Encoding: chunked\r\nConnection: close\r\n\r\n")
+            for token in tokenize(pick_reply(prompt)):
+                event = {"object": "chat.completion.chunk",
+                         "choices": [{"index": 0, "delta": {"content": token}}]}
+                self._write_chunk(writer, b"data: " + json.dumps(event).encode() + b"\n\n")
+                await writer.drain()
+                await asyncio.sleep(self.token_delay)
+            self._write_chunk(writer, b"data: [DONE]\n\n")
+            writer.write(b"0\r\n\r\n")
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _write_chunk(writer, data):
+        writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+
+    async def serve(self):
+        """Start listening (asyncio); returns once the socket is bound"""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        # Port 0 picks a free port
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self._server
+
+    def start(self):
+        """Run the server on a background thread"""
+        if self._thread is not None:
+            return True
+        self.loop = asyncio.new_event_loop()
+
+        def run():
+            asyncio.set_event_loop(self.loop)
+            self.loop.run_until_complete(self.serve())
+            self._ready.set()
+            self.loop.run_forever()
+
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        return True
+
+    def stop(self):
+        """Stop the background server"""
+        if self._thread is None:
+            return True
+        self.loop.call_soon_threadsafe(self._server.close)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+        self._thread = None
+        self._ready.clear()
+        return True
+
+    @property
+    def base_url(self):
+        """Base URL to pass to LLMExpressionController"""
+        return f"http://{self.host}:{self.port}/v1"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock OpenAI-compatible streaming server for RoboEyes")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--token-delay", type=float, default=0.03)
+    args = parser.parse_args()
+
+    server = MockLLMServer(args.host, args.port, args.token_delay)
+
+    async def run():
+        await server.serve()
+        print(f"Mock LLM server listening on {server.base_url}")
+        await server._server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
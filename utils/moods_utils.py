@@ -4,14 +4,50 @@ Handles all mood-related functionality including different eye expressions
 and appearance changes based on mood.
 """
 
+import time
 import pygame
 
+BLACK = (0, 0, 0)
+
 # Define mood constants
 DEFAULT = 0
 TIRED = 1
 SAD = 2
 EXCITED = 3
 
+# Mood preset table
+# Each preset is a parameter vector relative to the parent's default eye size:
+# shape, left/right width scale, left/right height scale and the tired eyelid
+# fraction (portion of the eye height covered from the top).
+MOOD_PRESETS = {
+    DEFAULT: {"shape": "square", "width": (1.0, 0.95), "height": (1.0, 1.05), "tired_lid": 0.0},
+    TIRED: {"shape": "square", "width": (1.0, 0.95), "height": (1.0, 1.05), "tired_lid": 0.3},
+    # Angry shape for SAD mood as shown in the image, slightly narrower eyes
+    SAD: {"shape": "angry", "width": (0.9, 0.9), "height": (1.0, 1.0), "tired_lid": 0.0},
+    # Wider, flatter pills with a slightly narrower right eye for more character
+    EXCITED: {"shape": "pill", "width": (1.3, 1.3 * 0.9), "height": (0.8, 0.8), "tired_lid": 0.0},
+}
+
+# Indices into a compiled mood vector
+WIDTH_L = 0
+WIDTH_R = 1
+HEIGHT_L = 2
+HEIGHT_R = 3
+TIRED_LID = 4
+VECTOR_SIZE = 5
+
+DEFAULT_TRANSITION_DURATION = 0.25  # seconds
+
+
+def compile_preset(preset):
+    """Turn a preset dict into a (shape, parameter vector) pair"""
+    width_l, width_r = preset.get("width", (1.0, 1.0))
+    height_l, height_r = preset.get("height", (1.0, 1.0))
+    vector = (float(width_l), float(width_r), float(height_l), float(height_r),
+              float(preset.get("tired_lid", 0.0)))
+    return preset.get("shape", "square"), vector
+
+
 class MoodsHandler:
     def __init__(self, parent):
         """Initialize moods with reference to parent RoboEyes object"""
@@ -21,101 +57,144 @@ class MoodsHandler:
         # Eyelid properties for mood expressions
         self.eyelids_tired_height = 0
         self.eyelids_tired_height_next = 0
-    
-    def set_mood(self, mood):
+
+        # Preallocated rect for the tired eyelids
+        self._lid = pygame.Rect(0, 0, 0, 0)
+
+        # Compiled presets: mood -> (shape, parameter vector)
+        self.presets = {}
+        self.compile_presets()
+
+        # Active blend: mood -> weight (weights sum to 1)
+        self.mood_weights = {DEFAULT: 1.0}
+        self.transition_duration = DEFAULT_TRANSITION_DURATION
+
+        # Cross-fade state, stored as absolute values (pixels / lid fraction)
+        self.blend_from = None
+        self.blend_to = None
+        self.blend_current = None
+        self.blend_shape = "square"
+        self.blend_start_time = 0
+        self.blend_duration = 0
+        self.is_transitioning = False
+
+    def compile_presets(self, presets=None):
+        """Compile the mood preset table into parameter vectors (done once at begin())"""
+        table = MOOD_PRESETS if presets is None else presets
+        self.presets = {mood: compile_preset(preset) for mood, preset in table.items()}
+        return True
+
+    def register_mood(self, mood, shape="square", width=(1.0, 1.0), height=(1.0, 1.0), tired_lid=0.0):
+        """Add or replace a mood preset"""
+        self.presets[mood] = compile_preset(
+            {"shape": shape, "width": width, "height": height, "tired_lid": tired_lid}
+        )
+        return True
+
+    def set_transition_duration(self, duration):
+        """Set the default cross-fade duration in seconds (0 snaps instantly)"""
+        self.transition_duration = max(0.0, duration)
+        return True
+
+    def set_mood(self, mood, duration=None):
         """Set the mood expression"""
-        self.current_mood = mood
-        
-        # Reset all mood-related properties
-        self.eyelids_tired_height_next = 0
-        
-        # Set the appropriate mood properties and eye shapes
-        if mood == TIRED:
-            self.eyelids_tired_height_next = int(self.parent.eye_l_height * 0.3)
-            self.parent.shapes.set_eye_shape("square")
-        elif mood == SAD:
-            # Angry shape for SAD mood as shown in the image
-            self.parent.shapes.set_eye_shape("angry")
-            # Make eyes slightly narrower
-            self.parent.shapes.set_width(
-                int(self.parent.eye_l_width_default * 0.9), 
-                int(self.parent.eye_r_width_default * 0.9)
-            )
-            self.parent.shapes.set_height(
-                self.parent.eye_l_height_default, 
-                self.parent.eye_r_height_default
-            )
-        elif mood == EXCITED:
-            self.parent.shapes.set_eye_shape("pill")
-            # Make eyes wider for excited look
-            self.parent.shapes.set_width(
-                int(self.parent.eye_l_width_default * 1.3), 
-                int(self.parent.eye_r_width_default * 1.3)
-            )
-            self.parent.shapes.set_height(
-                int(self.parent.eye_l_height_default * 0.8), 
-                int(self.parent.eye_r_height_default * 0.8)
-            )
-            # Add asymmetry for more character
-            self.parent.eye_r_width = int(self.parent.eye_r_width * 0.9)  # Right eye slightly narrower
-        else:  # DEFAULT
-            # Reset to default eye shape and size with slight asymmetry
-            self.parent.shapes.set_eye_shape("square")
-            self.parent.shapes.set_width(
-                self.parent.eye_l_width_default, 
-                int(self.parent.eye_r_width_default * 0.95)
-            )
-            self.parent.shapes.set_height(
-                self.parent.eye_l_height_default, 
-                int(self.parent.eye_r_height_default * 1.05)
-            )
-        
+        if mood not in self.presets:
+            mood = DEFAULT
+        return self.set_mood_mix({mood: 1.0}, duration)
+
+    def set_mood_mix(self, weights, duration=None):
+        """Blend several moods, e.g. {TIRED: 0.7, SAD: 0.3}"""
+        weights = {mood: w for mood, w in weights.items() if mood in self.presets and w > 0}
+        total = sum(weights.values())
+        if total <= 0:
+            weights, total = {DEFAULT: 1.0}, 1.0
+        self.mood_weights = {mood: w / total for mood, w in weights.items()}
+
+        # The dominant mood names the expression and picks the discrete eye shape
+        self.current_mood = max(self.mood_weights, key=self.mood_weights.get)
+        self.blend_shape = self.presets[self.current_mood][0]
+
+        # Weighted sum of the preset vectors, scaled by the parent's default size
+        mixed = [0.0] * VECTOR_SIZE
+        for mood, weight in self.mood_weights.items():
+            vector = self.presets[mood][1]
+            for i in range(VECTOR_SIZE):
+                mixed[i] += weight * vector[i]
+        parent = self.parent
+        mixed[WIDTH_L] *= parent.eye_l_width_default
+        mixed[WIDTH_R] *= parent.eye_r_width_default
+        mixed[HEIGHT_L] *= parent.eye_l_height_default
+        mixed[HEIGHT_R] *= parent.eye_r_height_default
+        self.blend_to = tuple(mixed)
+
+        if duration is None:
+            duration = self.transition_duration
+        if self.blend_current is None or duration <= 0:
+            # Nothing to fade from (or a snap was requested): apply immediately
+            self.blend_from = self.blend_to
+            self.blend_duration = 0
+            self.is_transitioning = False
+            self.parent.shapes.set_eye_shape(self.blend_shape)
+            self._apply(self.blend_to)
+        else:
+            self.blend_from = self.blend_current
+            self.blend_start_time = time.time()
+            self.blend_duration = duration
+            self.is_transitioning = True
         return True
 
+    def update(self, current_time):
+        """Advance the active cross-fade; no work once it has settled"""
+        if not self.is_transitioning:
+            return
+        progress = (current_time - self.blend_start_time) / self.blend_duration
+        if progress >= 1.0:
+            self.is_transitioning = False
+            self.parent.shapes.set_eye_shape(self.blend_shape)
+            self._apply(self.blend_to)
+            return
+        if progress < 0:
+            progress = 0.0
+        # Swap the discrete shape halfway through the fade
+        if progress >= 0.5 and self.parent.shapes.eye_shape != self.blend_shape:
+            self.parent.shapes.set_eye_shape(self.blend_shape)
+        # Smoothstep easing
+        t = progress * progress * (3 - 2 * progress)
+        a = self.blend_from
+        b = self.blend_to
+        self._apply(tuple(a[i] + (b[i] - a[i]) * t for i in range(VECTOR_SIZE)))
+
+    def _apply(self, vector):
+        """Write a blended parameter vector to the parent eye properties"""
+        parent = self.parent
+        self.blend_current = vector
+        sizes = (int(vector[WIDTH_L]), int(vector[WIDTH_R]), int(vector[HEIGHT_L]), int(vector[HEIGHT_R]))
+        if sizes != (parent.eye_l_width, parent.eye_r_width, parent.eye_l_height, parent.eye_r_height):
+            parent.eye_l_width, parent.eye_r_width, parent.eye_l_height, parent.eye_r_height = sizes
+            # Layout is recomputed once before the frame draws
+            parent._invalidate_layout()
+        self.eyelids_tired_height_next = int(parent.eye_l_height * vector[TIRED_LID])
+
     def get_current_mood(self):
         """Get the current mood value"""
         return self.current_mood
+
+    def get_mood_weights(self):
+        """Get the active mood blend weights"""
+        return dict(self.mood_weights)
     
-    def draw_mood_elements(self, screen, eye_l_x_current, eye_l_y_current, eye_r_x_current, eye_r_y_current, 
-                          eye_l_width_current, eye_l_height_current, eye_r_width_current, eye_r_height_current):
+    def draw_mood_elements(self, screen, eyes):
         """Draw mood-specific elements"""
-        # Convert all position and size values to integers to avoid float errors
-        eye_l_x = int(eye_l_x_current)
-        eye_l_y = int(eye_l_y_current)
-        eye_r_x = int(eye_r_x_current)
-        eye_r_y = int(eye_r_y_current)
-        eye_l_width = int(eye_l_width_current)
-        eye_l_height = int(eye_l_height_current)
-        eye_r_width = int(eye_r_width_current)
-        eye_r_height = int(eye_r_height_current)
-        
         # Smooth transitions for eyelids
-        eyelids_tired_height = int((self.eyelids_tired_height + self.eyelids_tired_height_next) / 2)
+        eyelids_tired_height = int((self.eyelids_tired_height + self.eyelids_tired_height_next) / 2
+                                   * self.parent.render_scale)
         
-        # Draw tired eyelids if in TIRED mood
-        if self.current_mood == TIRED and eyelids_tired_height > 0:
-            # Left eye
-            pygame.draw.rect(
-                screen,
-                (0, 0, 0),  # BLACK
-                (
-                    eye_l_x,
-                    eye_l_y,
-                    eye_l_width,
-                    eyelids_tired_height
-                ),
-                0
-            )
-            
-            # Right eye
-            pygame.draw.rect(
-                screen,
-                (0, 0, 0),  # BLACK
-                (
-                    eye_r_x,
-                    eye_r_y,
-                    eye_r_width,
-                    eyelids_tired_height
-                ),
-                0
-            )
+        # Draw tired eyelids whenever the blended mood has a tired component
+        if eyelids_tired_height > 0:
+            # Reuse one preallocated rect instead of building tuples every frame
+            lid = self._lid
+            # Subpixel sprites are one pixel wider to hold the anti-aliased edge
+            pad = 1 if self.parent.shapes.subpixel else 0
+            for eye in eyes:
+                lid.update(int(eye.draw_x), int(eye.draw_y), int(eye.draw_width) + pad, eyelids_tired_height)
+                screen.fill(BLACK, lid)
@@ -0,0 +1,154 @@
+"""
+Noise utilities for RoboEyes
+Handles micro-motion: looping 1-D gradient noise is precomputed once into
+tables and sampled by time, so flicker costs two table lookups per axis per
+frame instead of RNG calls, and moves smoothly instead of jumping between
+random pixels. Micro-saccades (small, quick jumps of the resting point)
+follow a precomputed schedule as well. Tables are built once per seed and
+shared by every face; unseeded faces start at random phases so they don't
+move in step.
+"""
+
+import math
+import random
+from functools import lru_cache
+
+TABLE_CELLS = 64  # Gradient lattice cells per table loop
+CELL_SAMPLES = 16  # Table entries per lattice cell
+SCHEDULE_LENGTH = 32  # Precomputed micro-saccades before the schedule repeats
+
+
+def gradient_noise_table(seed=0, cells=TABLE_CELLS, samples=CELL_SAMPLES, octaves=2):
+    """Seamlessly looping 1-D gradient (Perlin) noise, normalized to -1..1"""
+    rng = random.Random(seed)
+    size = cells * samples
+    table = [0.0] * size
+    amplitude = 1.0
+    for octave in range(octaves):
+        # Each octave doubles the lattice, which still divides the loop evenly
+        octave_cells = cells << octave
+        gradients = [rng.uniform(-1.0, 1.0) for _ in range(octave_cells)]
+        step = octave_cells / size
+        # Offset the octaves so their zero crossings (the lattice points) don't line up
+        shift = octave * samples // 3
+        for i in range(size):
+            x = i * step
+            cell = int(x)
+            t = x - cell
+            g0 = gradients[cell % octave_cells]
+            g1 = gradients[(cell + 1) % octave_cells]
+            fade = t * t * t * (t * (t * 6 - 15) + 10)
+            near = g0 * t
+            far = g1 * (t - 1)
+            table[(i + shift) % size] += amplitude * (near + (far - near) * fade)
+        amplitude *= 0.5
+    peak = max(abs(value) for value in table) or 1.0
+    return [value / peak for value in table]
+
+
+@lru_cache(maxsize=16)
+def shared_noise_table(seed):
+    """Read-only noise table for a seed, built on first use and shared afterwards"""
+    return tuple(gradient_noise_table(seed))
+
+
+class MicroMotion:
+    def __init__(self, seed=None):
+        """Smooth per-axis jitter and scheduled micro-saccades from precomputed tables"""
+        rng = random.Random(seed)
+        if seed is None:
+            # Shared default tables; a random starting phase decorrelates faces
+            seed = 0
+            self.start_phase = (rng.uniform(0.0, TABLE_CELLS), rng.uniform(0.0, TABLE_CELLS))
+        else:
+            self.start_phase = (0.0, 0.0)
+        self.x_table = shared_noise_table(seed)
+        self.y_table = shared_noise_table(seed + 1)
+        self.samples = CELL_SAMPLES
+
+        # Micro-saccades: (interval scale, unit x, unit y) entries, scaled at use
+        self.saccades = False
+        self.saccade_amplitude = 2.0  # Pixels
+        self.saccade_interval = 1.5  # Mean seconds between saccades
+        self.saccade_duration = 0.03  # Seconds each jump takes
+        self._schedule = []
+        for _ in range(SCHEDULE_LENGTH):
+            angle = rng.uniform(0.0, 2 * math.pi)
+            radius = math.sqrt(rng.random())  # Uniform over the disk
+            self._schedule.append((rng.uniform(0.5, 1.5), math.cos(angle) * radius, math.sin(angle) * radius))
+
+        self.reset()
+
+    def reset(self):
+        """Restart the noise phase and recenter the saccade offset"""
+        self._last_time = None
+        self._phase_x, self._phase_y = self.start_phase
+        self._saccade_index = 0
+        self._saccade_start = None
+        self._saccade_from = (0.0, 0.0)
+        self._saccade_to = (0.0, 0.0)
+        self._next_saccade = None
+
+    def set_saccades(self, state, amplitude=2.0, interval=1.5):
+        """Enable or disable scheduled micro-saccades"""
+        self.saccades = state
+        self.saccade_amplitude = amplitude
+        self.saccade_interval = interval
+        self._next_saccade = None
+        if not state:
+            self._saccade_from = self._saccade_to = (0.0, 0.0)
+            self._saccade_start = None
+        return True
+
+    def _lookup(self, table, phase):
+        """Linearly interpolated table sample; phase is in lattice cells"""
+        position = phase * self.samples
+        index = int(position)
+        fraction = position - index
+        size = len(table)
+        a = table[index % size]
+        return a + (table[(index + 1) % size] - a) * fraction
+
+    def sample(self, now, amplitude_x, amplitude_y, frequency_x, frequency_y):
+        """Offset in pixels at time now; frequencies are lattice cells per second"""
+        dt = 0.0 if self._last_time is None else max(0.0, now - self._last_time)
+        self._last_time = now
+
+        # Phases accumulate, so changing a frequency never jumps the output
+        offset_x = 0.0
+        offset_y = 0.0
+        if amplitude_x:
+            self._phase_x += dt * frequency_x
+            offset_x = self._lookup(self.x_table, self._phase_x) * amplitude_x
+        if amplitude_y:
+            self._phase_y += dt * frequency_y
+            offset_y = self._lookup(self.y_table, self._phase_y) * amplitude_y
+
+        if self.saccades:
+            saccade_x, saccade_y = self._saccade_offset(now)
+            offset_x += saccade_x
+            offset_y += saccade_y
+        return offset_x, offset_y
+
+    def _saccade_offset(self, now):
+        """Current resting offset, jumping to the next scheduled target when due"""
+        if self._next_saccade is None:
+            self._next_saccade = now + self._schedule[self._saccade_index][0] * self.saccade_interval
+        if now >= self._next_saccade:
+            self._saccade_from = self._saccade_position(now)
+            self._saccade_index = (self._saccade_index + 1) % len(self._schedule)
+            scale, unit_x, unit_y = self._schedule[self._saccade_index]
+            self._saccade_to = (unit_x * self.saccade_amplitude, unit_y * self.saccade_amplitude)
+            self._saccade_start = now
+            self._next_saccade = now + scale * self.saccade_interval
+        return self._saccade_position(now)
+
+    def _saccade_position(self, now):
+        if self._saccade_start is None:
+            return self._saccade_to
+        progress = (now - self._saccade_start) / self.saccade_duration if self.saccade_duration > 0 else 1.0
+        if progress >= 1.0:
+            return self._saccade_to
+        from_x, from_y = self._saccade_from
+        to_x, to_y = self._saccade_to
+        return from_x + (to_x - from_x) * progress, from_y + (to_y - from_y) * progress
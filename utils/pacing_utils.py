@@ -0,0 +1,113 @@
+"""
+Frame pacing utilities for RoboEyes
+Handles frame-rate limiting with perf_counter deadlines: a coarse sleep
+followed by a short spin for precise frame starts, stall recovery policies
+and frame interval / jitter statistics.
+"""
+
+import math
+import time
+from collections import deque
+
+# Stall recovery policies
+CATCH_UP = "catch_up"  # Keep the original schedule, run late frames back to back
+DROP = "drop"  # Skip missed slots and restart the schedule from now
+
+
+class FramePacer:
+    def __init__(self, max_fps=60, spin_budget=0.002, policy=DROP, max_catch_up=3, window=240):
+        """Pace frames to max_fps using perf_counter deadlines"""
+        self.spin_budget = spin_budget  # Seconds before a deadline to stop sleeping and spin
+        self.policy = policy
+        self.max_catch_up = max_catch_up  # Frames CATCH_UP may run behind before realigning
+        self.vsync = False  # When True, flip() blocks on vsync and the pacer only measures
+        self.set_fps(max_fps)
+
+        # Statistics
+        self.intervals = deque(maxlen=window)  # Recent frame intervals (seconds)
+        self.frames = 0
+        self.missed_deadlines = 0
+        self.dropped_frames = 0
+        self.last_frame_time = None
+        self.last_work_time = 0.0  # Time spent between the previous wait() and this one
+        self.deadline = None
+
+    def set_fps(self, max_fps):
+        """Change the target frame rate"""
+        self.max_fps = max_fps
+        self.period = 1.0 / max_fps if max_fps > 0 else 0.0
+        self.deadline = None
+        return True
+
+    def wait(self):
+        """Block until the next frame deadline; call once per frame after presenting"""
+        target = self.schedule()
+        remaining = target - time.perf_counter()
+        if remaining > self.spin_budget:
+            time.sleep(remaining - self.spin_budget)
+        while time.perf_counter() < target:
+            pass
+        return self.frame_started()
+
+    def schedule(self):
+        """Account for the finished frame; returns the perf_counter time the next one should start
+
+        wait() is schedule(), a sleep/spin to the returned time and frame_started();
+        async loops await the delay themselves instead of blocking.
+        """
+        now = time.perf_counter()
+        if self.last_frame_time is not None:
+            self.last_work_time = now - self.last_frame_time
+        if self.period <= 0 or self.vsync:
+            return now
+        if self.deadline is None:
+            self.deadline = now + self.period
+        if now > self.deadline:
+            # The frame overran its slot
+            self.missed_deadlines += 1
+            behind = int((now - self.deadline) / self.period)
+            if self.policy == DROP or behind >= self.max_catch_up:
+                self.dropped_frames += behind
+                self.deadline = now + self.period
+            else:
+                # CATCH_UP: start the next frame immediately, keep the schedule
+                self.deadline += self.period
+            return now
+        target = self.deadline
+        self.deadline += self.period
+        return target
+
+    def frame_started(self):
+        """Record the start of a new frame once its deadline has passed"""
+        now = time.perf_counter()
+        if self.last_frame_time is not None:
+            self.intervals.append(now - self.last_frame_time)
+        self.last_frame_time = now
+        self.frames += 1
+        return now
+
+    def get_stats(self):
+        """Get interval, jitter and missed-deadline statistics (computed on demand)"""
+        intervals = list(self.intervals)
+        count = len(intervals)
+        mean = sum(intervals) / count if count else 0.0
+        variance = sum((i - mean) ** 2 for i in intervals) / count if count else 0.0
+        return {
+            "target_interval": self.period,
+            "mean_interval": mean,
+            "fps": 1.0 / mean if mean > 0 else 0.0,
+            "jitter": math.sqrt(variance),  # Standard deviation of intervals
+            "max_interval": max(intervals) if count else 0.0,
+            "min_interval": min(intervals) if count else 0.0,
+            "frames": self.frames,
+            "missed_deadlines": self.missed_deadlines,
+            "dropped_frames": self.dropped_frames,
+        }
+
+    def reset_stats(self):
+        """Clear accumulated statistics"""
+        self.intervals.clear()
+        self.frames = 0
+        self.missed_deadlines = 0
+        self.dropped_frames = 0
+        return True
@@ -0,0 +1,107 @@
+"""
+Palette utilities for RoboEyes
+Handles eye color, mood tints and pulsing glow, and the optional 8-bit
+palette-indexed render mode where those effects are done by rewriting the
+palette instead of redrawing pixels.
+"""
+
+import math
+
+import pygame
+
+from utils.moods_utils import DEFAULT, TIRED, SAD, EXCITED
+
+# Palette indices used in 8-bit mode
+BACKGROUND_INDEX = 0
+EYE_INDEX = 1
+HIGHLIGHT_INDEX = 2
+PALETTE_SIZE = 256
+
+# Optional per-mood eye tints
+MOOD_TINTS = {
+    DEFAULT: (0, 255, 255),
+    TIRED: (0, 150, 200),
+    SAD: (255, 70, 70),
+    EXCITED: (80, 255, 170),
+}
+
+
+class PaletteHandler:
+    def __init__(self, parent):
+        """Initialize colors and palette mode with reference to parent RoboEyes object"""
+        self.parent = parent
+        self.enabled = False  # 8-bit palette-indexed rendering
+
+        self.background = (0, 0, 0)
+        self.eye_color = (0, 255, 255)
+        self.highlight = (255, 255, 255)
+        self.mood_tints = False
+
+        # Pulsing glow: brightness oscillates between pulse_min and 1.0
+        self.pulse = False
+        self.pulse_period = 2.0  # seconds
+        self.pulse_min = 0.6
+
+        self.current_eye_color = self.eye_color
+        self.palette = [(0, 0, 0)] * PALETTE_SIZE
+        self._surfaces = []  # 8-bit surfaces sharing this palette
+
+    def set_enabled(self, state):
+        """Switch 8-bit palette mode on or off (the parent rebuilds its canvas)"""
+        self.enabled = state
+        self._surfaces = []
+        self._build_palette()
+        return True
+
+    def make_surface(self, size):
+        """Create an 8-bit surface that follows this palette"""
+        surface = pygame.Surface(size, 0, 8)
+        surface.set_palette(self.palette)
+        self._surfaces.append(surface)
+        return surface
+
+    def release_surfaces(self):
+        """Forget surfaces created by make_surface()"""
+        self._surfaces = []
+
+    def _build_palette(self):
+        palette = [self.background] * PALETTE_SIZE
+        palette[EYE_INDEX] = self.current_eye_color
+        palette[HIGHLIGHT_INDEX] = self.highlight
+        self.palette = palette
+        for surface in self._surfaces:
+            surface.set_palette(palette)
+
+    def set_eye_color(self, color):
+        """Set the base eye color"""
+        self.eye_color = tuple(color)
+        return True
+
+    def set_pulse(self, state, period=2.0, minimum=0.6):
+        """Enable/disable a pulsing glow on the eye color"""
+        self.pulse = state
+        self.pulse_period = max(0.01, period)
+        self.pulse_min = max(0.0, min(1.0, minimum))
+        return True
+
+    def update(self, current_time):
+        """Compute this frame's eye color; in palette mode rewrite one palette entry"""
+        color = self.eye_color
+        if self.mood_tints:
+            color = MOOD_TINTS.get(self.parent.moods.current_mood, color)
+        if self.pulse:
+            phase = math.sin(2 * math.pi * current_time / self.pulse_period) * 0.5 + 0.5
+            brightness = self.pulse_min + (1.0 - self.pulse_min) * phase
+            color = (int(color[0] * brightness), int(color[1] * brightness), int(color[2] * brightness))
+        if color == self.current_eye_color:
+            return
+        self.current_eye_color = color
+        if self.enabled:
+            self.palette[EYE_INDEX] = color
+            for surface in self._surfaces:
+                surface.set_palette_at(EYE_INDEX, color)
+
+    @property
+    def draw_color(self):
+        """Color to draw the eyes with: a palette index in 8-bit mode, RGB otherwise"""
+        return EYE_INDEX if self.enabled else self.current_eye_color
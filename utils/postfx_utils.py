@@ -0,0 +1,275 @@
+"""
+Post-processing utilities for RoboEyes
+Handles optional retro-screen effects on the finished frame: scanlines,
+phosphor persistence, ordered dithering and a vignette. They run as NumPy
+operations on a pygame.surfarray view of the frame, restricted to the dirty
+region around the eyes (the rest of the frame is black, which every effect
+leaves black). Scanlines and vignette share one multiplicative mask and the
+dither thresholds are one tiled Bayer matrix, both cached per resolution.
+Effects are shed (dither first) while their measured time exceeds the
+per-frame budget, and come back once there is headroom again.
+"""
+
+import math
+import time
+from collections import deque
+
+import pygame
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, only post-processing needs it
+    np = None
+
+from utils.glow_utils import SIZE_BUCKET
+from utils.renderer_utils import SURFACE
+
+# Effects, in the order they are applied; shed from the end of SHED_ORDER first
+SCANLINES = "scanlines"
+PHOSPHOR = "phosphor"
+DITHER = "dither"
+VIGNETTE = "vignette"
+EFFECTS = (PHOSPHOR, DITHER, SCANLINES, VIGNETTE)
+SHED_ORDER = (SCANLINES, VIGNETTE, PHOSPHOR, DITHER)
+
+BAYER_4X4 = (
+    (0, 8, 2, 10),
+    (12, 4, 14, 6),
+    (3, 11, 1, 9),
+    (15, 7, 13, 5),
+)
+
+MAX_TRAIL_FRAMES = 120  # Upper bound on frames a phosphor trail is tracked
+
+
+class PostProcessHandler:
+    def __init__(self, parent, window=30):
+        """Initialize post-processing with reference to parent RoboEyes object"""
+        self.parent = parent
+        self.active = set()  # Effects switched on
+        self.dirty_only = True  # Process only the region around the eyes (hosts drawing extra content may disable)
+
+        # Effect parameters
+        self.scanline_strength = 0.35  # Fraction of light removed on every other row
+        self.vignette_strength = 0.45  # Fraction of light removed in the corners
+        self.phosphor_decay = 0.7  # Fraction of the previous frame that lingers
+        self.dither_levels = 4  # Intensity levels per channel
+
+        # Budget: effects are shed while recent frames exceed it
+        self.budget = 0.002  # Seconds per frame
+        self.shed = 0  # Number of effects currently suspended (from the end of SHED_ORDER)
+        self.recover_ratio = 0.5
+        self.degrade_delay = 0.5
+        self.recover_delay = 3.0
+        self.work_times = deque(maxlen=window)
+        self.last_change_time = 0
+        self.last_time = 0.0
+        self.last_region = None
+
+        # Caches, rebuilt when the frame size or a parameter changes
+        self._size = None
+        self._mask = None  # uint16 (w, h, 1) scanline * vignette factors, 256 = unchanged
+        self._mask_key = None
+        self._thresholds = None  # uint16 (w, h, 1) Bayer thresholds scaled by 255
+        self._previous = None  # uint8 (w, h, 3) phosphor buffer
+        self._trail = deque()  # Recent dirty regions while their phosphor trails fade
+
+    @property
+    def enabled(self):
+        return bool(self.active)
+
+    def set_effect(self, effect, state=True, **params):
+        """Switch one effect on or off, optionally changing its parameter
+
+        Parameters: scanlines(strength), vignette(strength), phosphor(decay),
+        dither(levels). Takes effect on the next frame.
+        """
+        if effect not in EFFECTS:
+            print(f"Warning: Unknown post-process effect '{effect}'. Valid effects are: {list(EFFECTS)}")
+            return False
+        if state and np is None:
+            print("Warning: numpy is required for post-processing effects (pip install numpy).")
+            return False
+        if state and self.parent.backend != SURFACE:
+            print("Warning: Post-processing effects need the surface backend.")
+            return False
+
+        if effect == SCANLINES:
+            self.scanline_strength = max(0.0, min(1.0, params.get("strength", self.scanline_strength)))
+        elif effect == VIGNETTE:
+            self.vignette_strength = max(0.0, min(1.0, params.get("strength", self.vignette_strength)))
+        elif effect == PHOSPHOR:
+            self.phosphor_decay = max(0.0, min(0.95, params.get("decay", self.phosphor_decay)))
+            self._previous = None
+            self._trail.clear()
+        elif effect == DITHER:
+            self.dither_levels = max(2, min(16, int(params.get("levels", self.dither_levels))))
+
+        if state:
+            self.active.add(effect)
+        else:
+            self.active.discard(effect)
+        self.shed = 0
+        self.work_times.clear()
+        return True
+
+    def set_budget(self, budget):
+        """Set the per-frame time budget for all effects in seconds"""
+        self.budget = max(0.0, budget)
+        self.work_times.clear()
+        return True
+
+    def running_effects(self):
+        """Active effects that are not currently shed for the budget"""
+        kept = [effect for effect in SHED_ORDER if effect in self.active]
+        kept = set(kept[:len(kept) - self.shed])
+        return [effect for effect in EFFECTS if effect in kept]
+
+    def apply(self, surface):
+        """Run the enabled effects on the finished frame in place"""
+        if not self.active or surface.get_bitsize() < 24:
+            return
+        started = time.perf_counter()
+        effects = self.running_effects()
+        size = surface.get_size()
+        if size != self._size:
+            self._size = size
+            self._mask = None
+            self._thresholds = None
+            self._previous = None
+            self._trail.clear()
+
+        region = self._dirty_region(surface) if self.dirty_only else surface.get_rect()
+        if PHOSPHOR in effects:
+            # Keep processing where trails were drawn until they have faded to black
+            self._trail.append(region)
+            while len(self._trail) > self._trail_frames():
+                self._trail.popleft()
+            region = region.unionall(list(self._trail))
+        else:
+            self._previous = None
+            self._trail.clear()
+        region = region.clip(surface.get_rect())
+        self.last_region = region
+        if region.width > 0 and region.height > 0:
+            self._process(surface, region, effects)
+
+        self.last_time = time.perf_counter() - started
+        self._record(self.last_time)
+
+    def _process(self, surface, region, effects):
+        pixels = pygame.surfarray.pixels3d(surface)
+        try:
+            self._run_effects(pixels, region, effects)
+        finally:
+            del pixels  # Unlock the surface before it is presented
+
+    def _run_effects(self, pixels, region, effects):
+        """Apply the effects to the region of a surfarray view, in place"""
+        x0, y0 = region.x, region.y
+        x1, y1 = region.right, region.bottom
+        view = pixels[x0:x1, y0:y1]
+        if PHOSPHOR in effects:
+            if self._previous is None:
+                self._previous = np.zeros(pixels.shape, dtype=np.uint8)
+            previous = self._previous[x0:x1, y0:y1]
+            decay = int(self.phosphor_decay * 256)
+            np.maximum(view, ((previous.astype(np.uint16) * decay) >> 8).astype(np.uint8), out=view)
+            previous[...] = view
+        if DITHER in effects:
+            # Ordered dither in integers: floor(v * (L - 1) / 255 + threshold)
+            levels = self.dither_levels - 1
+            thresholds = self._dither_thresholds()[x0:x1, y0:y1]
+            quantized = (view.astype(np.uint16) * (levels * 16) + thresholds) // 4080
+            view[...] = quantized * 255 // levels
+        if SCANLINES in effects or VIGNETTE in effects:
+            mask = self._factor_mask(SCANLINES in effects, VIGNETTE in effects)[x0:x1, y0:y1]
+            view[...] = (view * mask) >> 8
+
+    def _dirty_region(self, surface):
+        """Bounding box of the eyes (plus glow and rounding margins) in surface pixels"""
+        parent = self.parent
+        eyes = parent.eyes
+        region = eyes[0].rect.unionall([eye.rect for eye in eyes[1:]])
+        margin = 2
+        if parent.glow.enabled:
+            margin += parent.glow.radius * 2 + SIZE_BUCKET
+        region = region.inflate(margin * 2, margin * 2)
+        scale = parent.render_scale
+        if scale != 1.0:
+            # Canvas pixels to window pixels, rounded outward
+            left = int(region.x / scale) - 1
+            top = int(region.y / scale) - 1
+            right = int(math.ceil(region.right / scale)) + 1
+            bottom = int(math.ceil(region.bottom / scale)) + 1
+            region = pygame.Rect(left, top, right - left, bottom - top)
+        return region
+
+    def _trail_frames(self):
+        """Frames until a full-brightness pixel decays to black"""
+        if self.phosphor_decay <= 0:
+            return 1
+        frames = math.log(1.0 / 255) / math.log(self.phosphor_decay) + 2
+        return min(MAX_TRAIL_FRAMES, int(math.ceil(frames)))
+
+    def _factor_mask(self, scanlines, vignette):
+        """Cached per-resolution multiplicative mask (256 leaves a pixel unchanged)"""
+        key = (scanlines, vignette, self.scanline_strength, self.vignette_strength)
+        if self._mask is None or self._mask_key != key:
+            width, height = self._size
+            factors = np.ones((width, height), dtype=np.float32)
+            if scanlines:
+                factors[:, 1::2] *= 1.0 - self.scanline_strength
+            if vignette:
+                xs = np.linspace(-1.0, 1.0, width, dtype=np.float32)[:, None]
+                ys = np.linspace(-1.0, 1.0, height, dtype=np.float32)[None, :]
+                # Smooth falloff reaching full strength in the corners
+                distance = np.minimum(1.0, (xs * xs + ys * ys) / 2.0)
+                factors *= 1.0 - self.vignette_strength * distance * distance
+            self._mask = (factors * 256).astype(np.uint16)[:, :, None]
+            self._mask_key = key
+        return self._mask
+
+    def _dither_thresholds(self):
+        """Cached Bayer 4x4 thresholds tiled to the frame size"""
+        if self._thresholds is None:
+            width, height = self._size
+            bayer = np.array(BAYER_4X4, dtype=np.uint16) * 255  # Threshold / 16, scaled by 4080
+            tiled = np.tile(bayer, ((width + 3) // 4, (height + 3) // 4))[:width, :height]
+            self._thresholds = np.ascontiguousarray(tiled)[:, :, None]
+        return self._thresholds
+
+    def _record(self, work_time):
+        """Shed or restore effects from the upper quartile of recent effect times"""
+        times = self.work_times
+        times.append(work_time)
+        if len(times) < times.maxlen:
+            return
+        now = time.perf_counter()
+        held = now - self.last_change_time
+        recent = sorted(times)[len(times) * 3 // 4]
+        if recent > self.budget and held >= self.degrade_delay:
+            if self.shed < len(self.active):
+                self._change_shed(self.shed + 1, now)
+        elif recent < self.budget * self.recover_ratio and held >= self.recover_delay:
+            if self.shed > 0:
+                self._change_shed(self.shed - 1, now)
+
+    def _change_shed(self, shed, now):
+        self.shed = shed
+        self.last_change_time = now
+        self.work_times.clear()
+
+    def get_stats(self):
+        """Get effect timing, budget and shedding state"""
+        times = list(self.work_times)
+        region = self.last_region
+        return {
+            "active": [effect for effect in EFFECTS if effect in self.active],
+            "running": self.running_effects(),
+            "shed": self.shed,
+            "budget": self.budget,
+            "last_time": self.last_time,
+            "mean_time": sum(times) / len(times) if times else 0.0,
+            "region": tuple(region) if region is not None else None,
+        }
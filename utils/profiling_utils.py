@@ -0,0 +1,102 @@
+"""
+Profiling utilities for RoboEyes
+Handles the allocation debug mode: per-frame memory allocation (via
+tracemalloc) and garbage-collector pauses (via gc callbacks), so frame
+hitches caused by the GC can be traced back to the draw path.
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+from collections import deque
+
+
+class AllocationMonitor:
+    def __init__(self, window=600):
+        """Track allocations and GC pauses per frame over a rolling window"""
+        self.active = False
+        self.frames = deque(maxlen=window)  # One record per frame
+
+        self._frame_start_traced = 0
+        self._frame_start_blocks = 0
+        self._gc_start = 0.0
+        self._gc_pause = 0.0
+        self._gc_pause_max = 0.0
+        self._gc_collections = 0
+        self._started_tracemalloc = False
+
+    def start(self):
+        """Begin tracing allocations and listening to GC events"""
+        if self.active:
+            return True
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        gc.callbacks.append(self._on_gc)
+        self.frames.clear()
+        self.active = True
+        return True
+
+    def stop(self):
+        """Stop tracing (tracemalloc is left running if someone else started it)"""
+        if not self.active:
+            return True
+        gc.callbacks.remove(self._on_gc)
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        self.active = False
+        return True
+
+    def _on_gc(self, phase, info):
+        """gc callback: time each collection"""
+        if phase == "start":
+            self._gc_start = time.perf_counter()
+        else:
+            pause = time.perf_counter() - self._gc_start
+            self._gc_pause += pause
+            self._gc_pause_max = max(self._gc_pause_max, pause)
+            self._gc_collections += 1
+
+    def frame_start(self):
+        """Mark the beginning of a frame"""
+        if not self.active:
+            return
+        tracemalloc.reset_peak()
+        self._frame_start_traced = tracemalloc.get_traced_memory()[0]
+        self._frame_start_blocks = sys.getallocatedblocks()
+        self._gc_pause = 0.0
+        self._gc_pause_max = 0.0
+        self._gc_collections = 0
+
+    def frame_end(self):
+        """Mark the end of a frame and record its allocation statistics"""
+        if not self.active:
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        self.frames.append((
+            peak - self._frame_start_traced,  # Transient bytes allocated during the frame
+            current - self._frame_start_traced,  # Bytes still held after the frame
+            sys.getallocatedblocks() - self._frame_start_blocks,  # Net new memory blocks
+            self._gc_collections,
+            self._gc_pause,
+            self._gc_pause_max,
+        ))
+
+    def get_report(self):
+        """Summarize allocations and GC pauses per frame"""
+        frames = list(self.frames)
+        count = len(frames)
+        if count == 0:
+            return {"frames": 0}
+        return {
+            "frames": count,
+            "transient_bytes_avg": sum(f[0] for f in frames) / count,
+            "transient_bytes_max": max(f[0] for f in frames),
+            "retained_bytes_avg": sum(f[1] for f in frames) / count,
+            "net_blocks_avg": sum(f[2] for f in frames) / count,
+            "gc_collections": sum(f[3] for f in frames),
+            "gc_pause_total": sum(f[4] for f in frames),
+            "gc_pause_max": max(f[5] for f in frames),
+        }
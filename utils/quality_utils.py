@@ -0,0 +1,104 @@
+"""
+Quality utilities for RoboEyes
+Handles the adaptive quality governor: recent frame work times are compared
+with a frame-time budget and the renderer steps through cheaper quality
+levels under load, recovering with hysteresis once load drops.
+"""
+
+import time
+from collections import deque
+
+# Quality levels, best first. Each level is cumulative with respect to cost:
+#   fps_scale          - fraction of max_fps to render at
+#   resolution_scale   - internal render resolution (scaled up on present)
+#   cheap_shapes       - draw angry/rounded shapes with cheaper approximations
+#   flicker            - allow h/v flicker
+QUALITY_LEVELS = [
+    {"name": "full", "fps_scale": 1.0, "resolution_scale": 1.0, "cheap_shapes": False, "flicker": True},
+    {"name": "cheap_shapes", "fps_scale": 1.0, "resolution_scale": 1.0, "cheap_shapes": True, "flicker": True},
+    {"name": "no_flicker", "fps_scale": 1.0, "resolution_scale": 1.0, "cheap_shapes": True, "flicker": False},
+    {"name": "reduced", "fps_scale": 0.75, "resolution_scale": 0.75, "cheap_shapes": True, "flicker": False},
+    {"name": "minimal", "fps_scale": 0.5, "resolution_scale": 0.5, "cheap_shapes": True, "flicker": False},
+]
+
+
+class QualityGovernor:
+    def __init__(self, parent, levels=None, window=30):
+        """Initialize the governor with reference to parent RoboEyes object"""
+        self.parent = parent
+        self.levels = QUALITY_LEVELS if levels is None else levels
+        self.enabled = False
+        self.level = 0
+
+        self.budget = None  # Frame work-time budget in seconds (None: 1 / max_fps)
+        self.degrade_ratio = 1.0  # Step down when recent frames exceed budget * ratio
+        self.recover_ratio = 0.6  # Step up only when frames are well under budget
+        self.degrade_delay = 0.5  # Seconds a level is held before stepping down again
+        self.recover_delay = 3.0  # Seconds a level is held before stepping back up
+        self.work_times = deque(maxlen=window)
+        self.last_change_time = 0
+        self.level_changes = 0
+
+    def set_enabled(self, state, budget=None):
+        """Enable/disable the governor; disabling restores full quality"""
+        self.enabled = state
+        self.budget = budget
+        self.work_times.clear()
+        self.last_change_time = time.perf_counter()
+        if not state:
+            self.set_level(0)
+        return True
+
+    def record(self, work_time):
+        """Feed one frame's work time (rendering, excluding pacing sleep)"""
+        if not self.enabled:
+            return
+        times = self.work_times
+        times.append(work_time)
+        if len(times) < times.maxlen:
+            return
+
+        now = time.perf_counter()
+        held = now - self.last_change_time
+        budget = self.budget
+        if budget is None:
+            if self.parent.max_fps <= 0:
+                return  # Unpaced and no explicit budget: nothing to compare against
+            budget = 1.0 / self.parent.max_fps
+        # Upper quartile of recent frames: robust to a single hitch, quick to see sustained load
+        recent = sorted(times)[len(times) * 3 // 4]
+        if recent > budget * self.degrade_ratio and held >= self.degrade_delay:
+            if self.level < len(self.levels) - 1:
+                self.set_level(self.level + 1)
+        elif recent < budget * self.recover_ratio and held >= self.recover_delay:
+            if self.level > 0:
+                self.set_level(self.level - 1)
+
+    def set_level(self, level):
+        """Apply a quality level to the parent RoboEyes"""
+        level = max(0, min(len(self.levels) - 1, level))
+        settings = self.levels[level]
+        parent = self.parent
+        if level != self.level:
+            self.level_changes += 1
+        self.level = level
+        self.last_change_time = time.perf_counter()
+        self.work_times.clear()
+
+        # Factors apply to the user's settings; unpaced faces (max_fps <= 0) stay unpaced
+        if parent.max_fps > 0:
+            parent.pacer.set_fps(max(1, int(parent.max_fps * settings["fps_scale"])))
+        parent._apply_render_scale(parent.user_render_scale * settings["resolution_scale"])
+        if parent.shapes is not None:
+            parent.shapes.cheap_shapes = settings["cheap_shapes"]
+        parent.flicker_enabled = settings["flicker"]
+        return True
+
+    @property
+    def resolution_scale(self):
+        """Render scale factor of the current level"""
+        return self.levels[self.level]["resolution_scale"]
+
+    def get_level(self):
+        """Get the current level index and name"""
+        return self.level, self.levels[self.level]["name"]
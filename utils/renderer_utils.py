@@ -0,0 +1,147 @@
+"""
+Renderer utilities for RoboEyes
+Handles the optional SDL2 Renderer/Texture backend: eye bodies are drawn
+once into white textures per (shape, size bucket) and each frame becomes a
+few tinted, scaled texture copies plus filled rects for the lids. SDL picks
+an accelerated renderer when one exists and falls back to its software
+renderer (e.g. headless in tests).
+
+Compare the backends with:
+    python -m utils.renderer_utils --frames 600
+"""
+
+import argparse
+import os
+import time
+from collections import OrderedDict
+
+import pygame
+
+try:
+    from pygame._sdl2 import video
+except ImportError:  # Very old pygame builds
+    video = None
+
+# Backends accepted by RoboEyes.begin()
+SURFACE = "surface"  # Software pygame.draw onto the display surface
+TEXTURE = "texture"  # SDL2 Renderer with cached eye textures
+
+SIZE_BUCKET = 8  # Eye textures are built at sizes rounded to this many pixels
+WHITE = (255, 255, 255)
+TRANSPARENT = (0, 0, 0, 0)
+
+
+class TextureCanvas:
+    def __init__(self, renderer, size, max_textures=64):
+        """Draw target for the texture backend (the subset of Surface the draw path uses)"""
+        self.renderer = renderer
+        self.size = size
+        self.max_textures = max_textures
+        self._textures = OrderedDict()
+        self._fill_color = None
+        self.hits = 0
+        self.misses = 0
+
+    def get_size(self):
+        return self.size
+
+    def fill(self, color, rect=None):
+        """Clear the frame, or fill a rect (lids) with a solid color"""
+        if color != self._fill_color:
+            self._fill_color = color
+            self.renderer.draw_color = (color[0], color[1], color[2], 255)
+        if rect is None:
+            self.renderer.clear()
+        else:
+            self.renderer.fill_rect(rect)
+
+    def draw_eye(self, shapes, shape, rect, color, is_left_eye):
+        """Copy the cached eye texture for this shape, tinted and scaled into rect"""
+        if rect.width <= 0 or rect.height <= 0:
+            return
+        bucket_w = max(SIZE_BUCKET, int(round(rect.width / SIZE_BUCKET)) * SIZE_BUCKET)
+        bucket_h = max(SIZE_BUCKET, int(round(rect.height / SIZE_BUCKET)) * SIZE_BUCKET)
+        side = is_left_eye if shape == "angry" else None
+        key = (shape, side, bucket_w, bucket_h, shapes.cheap_shapes)
+
+        texture = self._textures.get(key)
+        if texture is None:
+            self.misses += 1
+            # White body on transparent pixels; the angry cut-out is punched out with alpha 0
+            surface = pygame.Surface((bucket_w, bucket_h), pygame.SRCALPHA)
+            shapes.draw_shape(surface, WHITE, shape, pygame.Rect(0, 0, bucket_w, bucket_h),
+                              is_left_eye, bg_color=TRANSPARENT)
+            texture = video.Texture.from_surface(self.renderer, surface)
+            self._textures[key] = texture
+            if len(self._textures) > self.max_textures:
+                self._textures.popitem(last=False)
+        else:
+            self.hits += 1
+            self._textures.move_to_end(key)
+
+        texture.color = color
+        texture.draw(dstrect=rect)
+
+    def present(self):
+        self.renderer.present()
+
+    def to_surface(self):
+        """Read the current frame back into a Surface (slow; captures only)"""
+        return self.renderer.to_surface()
+
+    def clear_cache(self):
+        self._textures.clear()
+
+
+def create_texture_canvas(title, size, vsync=False):
+    """Open a window with an SDL2 renderer; returns (window, canvas) or None"""
+    if video is None:
+        print("Warning: pygame._sdl2 is not available, using the surface backend.")
+        return None
+    try:
+        window = video.Window(title, size)
+        renderer = video.Renderer(window, vsync=vsync)
+    except pygame.error as error:
+        print(f"Warning: Could not create an SDL2 renderer ({error}), using the surface backend.")
+        return None
+    return window, TextureCanvas(renderer, size)
+
+
+def benchmark(backend, frames=600, size=(640, 320), shape="square"):
+    """Render unpaced frames with one backend; returns the mean frame time in seconds"""
+    from robo_eyes import RoboEyes
+
+    eyes = RoboEyes()
+    eyes.begin(size[0], size[1], 0, backend=backend)
+    eyes.shapes.set_eye_shape(shape)
+    for _ in range(30):  # Warm caches
+        eyes.render()
+        eyes._present()
+    start = time.perf_counter()
+    for _ in range(frames):
+        eyes.render()
+        eyes._present()
+    elapsed = time.perf_counter() - start
+    eyes.quit()
+    return elapsed / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the RoboEyes surface and texture backends")
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=320)
+    parser.add_argument("--headless", action="store_true", help="use SDL's dummy video driver")
+    args = parser.parse_args()
+
+    if args.headless:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+
+    for shape in ("square", "round", "angry"):
+        for backend in (SURFACE, TEXTURE):
+            frame_time = benchmark(backend, args.frames, (args.width, args.height), shape)
+            print(f"{backend:8s} {shape:7s} {frame_time * 1000:.3f} ms/frame ({1 / frame_time:.0f} fps unpaced)")
+
+
+if __name__ == "__main__":
+    main()
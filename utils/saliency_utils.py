@@ -0,0 +1,226 @@
+"""
+Motion saliency utilities for RoboEyes
+Handles a camera-style gaze source: grayscale frames (NumPy arrays from any
+source, including recorded .npy sequences) are processed on a worker
+thread. Each frame is block-downsampled, differenced against the previous
+one, and the centroid of the motion energy becomes a look_at() target, so
+the eyes follow movement in front of the robot.
+
+Benchmark the worker on a synthetic 640x480 clip (or a recorded one) with:
+    python -m utils.saliency_utils [clip.npy]
+"""
+
+import sys
+import threading
+import time
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, only motion saliency needs it
+    np = None
+
+
+class MotionSaliencySource:
+    def __init__(self, eyes, block=8, threshold=12, min_energy=0.002, mirror=True, recenter_after=1.5):
+        """Turn motion in grayscale frames into gaze targets for a RoboEyes instance"""
+        self.eyes = eyes
+        self.block = block  # Downsampling factor (block mean per axis)
+        self.threshold = threshold  # Per-block intensity change counted as motion
+        self.min_energy = min_energy  # Fraction of moving blocks needed to retarget
+        self.mirror = mirror  # Camera faces the viewer: flip x so the eyes follow
+        self.recenter_after = recenter_after  # Seconds without motion before looking back to center
+
+        self._previous = None
+        self._grid_shape = None
+        self._xs = None  # Normalized block coordinates, -1..1
+        self._ys = None
+        self._last_motion_time = 0.0
+        self._centered = True
+
+        # Latest-frame slot: a slow consumer only ever sees the newest frame
+        self._condition = threading.Condition()
+        self._pending = None
+        self._running = False
+        self._thread = None
+
+        # Statistics
+        self.frames = 0
+        self.dropped = 0
+        self.process_time = 0.0
+        self.last_centroid = None
+        self.last_energy = 0.0
+
+    def start(self, frames=None, fps=None, loop=False):
+        """Start the worker; optionally feed it from an iterable of frames
+
+        frames may be any iterable of 2-D arrays, e.g. np.load("clip.npy",
+        mmap_mode="r"); fps paces playback (None feeds as fast as possible).
+        With loop=True a one-shot iterator is read into a list first.
+        Without frames, push them with submit() from a camera callback.
+        """
+        if np is None:
+            print("Warning: numpy is required for motion saliency (pip install numpy).")
+            return False
+        if self._running:
+            return True
+        self._running = True
+        self._thread = threading.Thread(target=self._worker, name="robo-eyes-saliency", daemon=True)
+        self._thread.start()
+        if frames is not None:
+            threading.Thread(target=self._feed, args=(frames, fps, loop), daemon=True).start()
+        return True
+
+    def stop(self):
+        """Stop the worker thread"""
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        return True
+
+    def submit(self, frame, timestamp=None):
+        """Hand a new frame to the worker (replaces an unprocessed one); thread-safe"""
+        if timestamp is None:
+            timestamp = time.perf_counter()
+        with self._condition:
+            if self._pending is not None:
+                self.dropped += 1
+            self._pending = (frame, timestamp)
+            self._condition.notify()
+
+    def _feed(self, frames, fps, loop):
+        if loop and iter(frames) is frames:
+            frames = list(frames)  # One-shot iterators (generators) can't be replayed
+        period = 1.0 / fps if fps else 0.0
+        next_time = time.perf_counter()
+        while self._running:
+            fed = False
+            for frame in frames:
+                if not self._running:
+                    return
+                fed = True
+                if period:
+                    delay = next_time - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                    next_time += period
+                self.submit(frame)
+            if not loop or not fed:
+                return
+
+    def _worker(self):
+        while True:
+            with self._condition:
+                while self._running and self._pending is None:
+                    self._condition.wait()
+                if not self._running:
+                    return
+                frame, timestamp = self._pending
+                self._pending = None
+            started = time.perf_counter()
+            self.process(frame, timestamp)
+            self.process_time += time.perf_counter() - started
+            self.frames += 1
+
+    def _prepare(self, height, width):
+        """Precompute the block grid coordinates for a frame size"""
+        rows = height // self.block
+        cols = width // self.block
+        self._grid_shape = (height, width)
+        self._xs = np.linspace(-1.0, 1.0, cols, dtype=np.float32)
+        if self.mirror:
+            self._xs = -self._xs
+        self._ys = np.linspace(-1.0, 1.0, rows, dtype=np.float32)
+        self._previous = None
+
+    def process(self, frame, timestamp=None):
+        """Process one frame synchronously; returns the motion centroid or None"""
+        frame = np.asarray(frame)
+        if frame.ndim == 3:
+            frame = frame[:, :, 0]  # Take one channel of color input
+        if frame.shape != self._grid_shape:
+            self._prepare(*frame.shape)
+
+        # Block mean downsample (sum in int32 to avoid overflow)
+        block = self.block
+        rows = len(self._ys)
+        cols = len(self._xs)
+        small = frame[:rows * block, :cols * block].reshape(rows, block, cols, block).sum(axis=(1, 3), dtype=np.int32)
+        previous = self._previous
+        self._previous = small
+        if previous is None:
+            return None
+
+        # Motion energy: block changes above threshold (in mean intensity units)
+        diff = np.abs(small - previous)
+        diff[diff < self.threshold * block * block] = 0
+        total = float(diff.sum())
+        moving = float(np.count_nonzero(diff)) / diff.size
+        self.last_energy = moving
+
+        now = time.perf_counter()
+        if moving < self.min_energy or total <= 0:
+            if not self._centered and now - self._last_motion_time > self.recenter_after:
+                self._centered = True
+                self.eyes.look_at(0.0, 0.0, timestamp)
+            return None
+
+        # Energy-weighted centroid from the row/column marginals
+        x = float(diff.sum(axis=0) @ self._xs) / total
+        y = float(diff.sum(axis=1) @ self._ys) / total
+        self.last_centroid = (x, y)
+        self._last_motion_time = now
+        self._centered = False
+        self.eyes.look_at(x, y, timestamp)
+        return x, y
+
+    def get_stats(self):
+        """Get processed/dropped frame counts and mean processing time"""
+        return {
+            "frames": self.frames,
+            "dropped": self.dropped,
+            "process_time_avg": self.process_time / self.frames if self.frames else 0.0,
+            "last_centroid": self.last_centroid,
+            "last_energy": self.last_energy,
+        }
+
+
+def synthetic_clip(frames=90, width=640, height=480, radius=40):
+    """A noisy gray clip with a bright blob moving left to right"""
+    rng = np.random.default_rng(0)
+    ys, xs = np.mgrid[0:height, 0:width]
+    clip = np.empty((frames, height, width), dtype=np.uint8)
+    for i in range(frames):
+        cx = radius + (width - 2 * radius) * i / max(1, frames - 1)
+        cy = height / 2
+        blob = ((xs - cx) ** 2 + (ys - cy) ** 2) < radius * radius
+        frame = rng.integers(60, 68, size=(height, width), dtype=np.uint8)
+        frame[blob] = 220
+        clip[i] = frame
+    return clip
+
+
+class _NullEyes:
+    def look_at(self, x, y, timestamp=None):
+        return True
+
+
+def main():
+    if np is None:
+        print("numpy is required for motion saliency (pip install numpy).")
+        return
+    clip = np.load(sys.argv[1], mmap_mode="r") if len(sys.argv) > 1 else synthetic_clip()
+    source = MotionSaliencySource(_NullEyes())
+    started = time.perf_counter()
+    for frame in clip:
+        source.process(frame)
+    elapsed = time.perf_counter() - started
+    height, width = clip.shape[1:3]
+    print(f"{len(clip)} frames of {width}x{height}: {elapsed / len(clip) * 1000:.2f} ms/frame "
+          f"({len(clip) / elapsed:.0f} fps on one core), last centroid {source.last_centroid}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Animation scheduler utilities for RoboEyes
+Handles pluggable animations: animations are registered objects (or
+generator coroutines) with a priority and declared channels. Only active
+animations are ticked, and channel conflicts are resolved by priority
+(OVERRIDE) or summed (ADDITIVE).
+"""
+
+# Channels and their neutral values
+POSITION = "position"  # (dx, dy) pixel offset from the resting eye position
+LIDS = "lids"  # Eyelid closure, 0 (open) .. 1 (closed)
+SIZE = "size"  # (dw, dh) pixel offset added to the eye size
+NEUTRAL = {POSITION: (0.0, 0.0), LIDS: 0.0, SIZE: (0.0, 0.0)}
+
+# Blend modes
+OVERRIDE = "override"  # Highest-priority value on the channel wins
+ADDITIVE = "additive"  # Added on top of the winning value
+
+
+def _add(a, b):
+    """Sum two channel values (scalars or 2-tuples)"""
+    if isinstance(a, tuple):
+        return (a[0] + b[0], a[1] + b[1])
+    return a + b
+
+
+class Animation:
+    """Base class for scheduled animations
+
+    Subclasses set channels/priority/blend and implement update(), returning
+    a dict of channel -> value, or None once the animation has finished.
+    """
+
+    channels = (POSITION,)
+    priority = 0
+    blend = OVERRIDE
+
+    def start(self, now):
+        """Called when the animation becomes active"""
+        self.start_time = now
+
+    def update(self, now, dt):
+        """Return channel values for this frame, or None when finished"""
+        return None
+
+    def stop(self):
+        """Called when the animation is removed before finishing"""
+
+
+class CoroutineAnimation(Animation):
+    """Wrap a generator function as an animation
+
+    The generator receives the current time through send() and yields a dict
+    of channel values per frame; returning ends the animation.
+    """
+
+    def __init__(self, factory, channels=(POSITION,), priority=0, blend=OVERRIDE):
+        self.factory = factory
+        self.channels = tuple(channels)
+        self.priority = priority
+        self.blend = blend
+        self._generator = None
+
+    def start(self, now):
+        self.start_time = now
+        self._generator = self.factory()
+        next(self._generator)  # Run up to the first yield
+
+    def update(self, now, dt):
+        try:
+            return self._generator.send(now)
+        except StopIteration:
+            return None
+
+    def stop(self):
+        if self._generator is not None:
+            self._generator.close()
+            self._generator = None
+
+
+class AnimationScheduler:
+    def __init__(self):
+        """Registry of animations plus the set currently running"""
+        self.animations = {}  # name -> Animation
+        self.active = []  # Running animations, highest priority first
+        self.last_time = None
+
+    def register(self, name, animation):
+        """Add (or replace) a named animation"""
+        if name in self.animations:
+            self.stop(name)
+        self.animations[name] = animation
+        return True
+
+    def unregister(self, name):
+        """Remove a named animation"""
+        self.stop(name)
+        self.animations.pop(name, None)
+        return True
+
+    def start(self, name, now):
+        """Activate a registered animation (restarts it if already running)"""
+        animation = self.animations.get(name)
+        if animation is None:
+            print(f"Warning: Unknown animation '{name}'.")
+            return False
+        if animation in self.active:
+            self.active.remove(animation)
+        animation.start(now)
+        # Stable sort: among equal priorities the most recently started comes first (and wins)
+        self.active.insert(0, animation)
+        self.active.sort(key=lambda a: -a.priority)
+        return True
+
+    def stop(self, name):
+        """Deactivate a running animation"""
+        animation = self.animations.get(name)
+        if animation is not None and animation in self.active:
+            self.active.remove(animation)
+            animation.stop()
+        return True
+
+    def is_active(self, name):
+        """Check whether a named animation is running"""
+        animation = self.animations.get(name)
+        return animation is not None and animation in self.active
+
+    def tick(self, now):
+        """Update active animations; return resolved channel values (only channels in use)"""
+        dt = 0.0 if self.last_time is None else now - self.last_time
+        self.last_time = now
+        if not self.active:
+            return {}
+
+        resolved = {}
+        overridden = set()
+        finished = None
+        # Highest priority first: the first OVERRIDE value on a channel wins and
+        # every ADDITIVE value is summed on top of it
+        for animation in self.active:
+            values = animation.update(now, dt)
+            if values is None:
+                if finished is None:
+                    finished = []
+                finished.append(animation)
+                continue
+            additive = animation.blend == ADDITIVE
+            for channel, value in values.items():
+                if not additive:
+                    if channel in overridden:
+                        continue  # A higher-priority override already owns the channel
+                    overridden.add(channel)
+                current = resolved.get(channel)
+                resolved[channel] = value if current is None else _add(current, value)
+        if finished:
+            for animation in finished:
+                self.active.remove(animation)
+        return resolved
@@ -0,0 +1,208 @@
+"""
+Sentiment utilities for RoboEyes
+Handles local, streaming text-to-expression mapping: a keyword/phrase lexicon
+is compiled into an Aho-Corasick automaton that scans transcript text in a
+single pass and emits mood changes (with hysteresis) and animation triggers.
+"""
+
+import time
+
+from utils.moods_utils import DEFAULT, TIRED, SAD, EXCITED
+
+# Animation trigger labels
+LAUGH = "laugh"
+CONFUSED = "confused"
+
+# Phrase -> (label, weight); labels are mood constants or animation triggers
+DEFAULT_LEXICON = {
+    # EXCITED
+    "great": (EXCITED, 1.0), "awesome": (EXCITED, 1.5), "amazing": (EXCITED, 1.5),
+    "love": (EXCITED, 1.0), "yay": (EXCITED, 1.5), "wow": (EXCITED, 1.0),
+    "excited": (EXCITED, 1.5), "fantastic": (EXCITED, 1.5), "happy": (EXCITED, 1.0),
+    "can't wait": (EXCITED, 1.5), "cool": (EXCITED, 0.5), "thank you": (EXCITED, 0.5),
+    # SAD
+    "sad": (SAD, 1.5), "sorry": (SAD, 0.75), "unfortunately": (SAD, 1.0), "miss": (SAD, 0.75),
+    "lost": (SAD, 0.75), "cry": (SAD, 1.5), "terrible": (SAD, 1.5), "bad news": (SAD, 1.5),
+    "angry": (SAD, 1.5), "hate": (SAD, 1.0), "annoyed": (SAD, 1.0), "upset": (SAD, 1.5),
+    # TIRED
+    "tired": (TIRED, 1.5), "sleepy": (TIRED, 1.5), "exhausted": (TIRED, 1.5), "yawn": (TIRED, 1.5),
+    "bored": (TIRED, 1.0), "long day": (TIRED, 1.5), "so late": (TIRED, 1.0), "nap": (TIRED, 1.0),
+    # Animation triggers
+    "haha": (LAUGH, 1.0), "hahaha": (LAUGH, 1.0), "lol": (LAUGH, 1.0), "hehe": (LAUGH, 1.0),
+    "funny": (LAUGH, 1.0), "hilarious": (LAUGH, 1.0),
+    "huh": (CONFUSED, 1.0), "hmm": (CONFUSED, 1.0), "confused": (CONFUSED, 1.0),
+    "what do you mean": (CONFUSED, 1.0), "not sure": (CONFUSED, 1.0), "pardon": (CONFUSED, 1.0),
+}
+
+TRIGGERS = (LAUGH, CONFUSED)
+
+
+def normalize_char(char):
+    """Lowercase letters/digits/apostrophes; everything else becomes a word break"""
+    if char.isalnum() or char == "'":
+        return char.lower()
+    return " "
+
+
+class PhraseAutomaton:
+    """Aho-Corasick automaton compiled to a dense transition table"""
+
+    def __init__(self, lexicon):
+        # Phrases are padded with spaces so matches fall on word boundaries
+        goto = [{}]
+        outputs = [[]]
+        for phrase, (label, weight) in lexicon.items():
+            key = " " + " ".join("".join(normalize_char(c) for c in phrase).split()) + " "
+            state = 0
+            for char in key:
+                nxt = goto[state].get(char)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][char] = nxt
+                    goto.append({})
+                    outputs.append([])
+                state = nxt
+            outputs[state].append((label, weight))
+
+        # Breadth-first failure links, folded into a full transition table so
+        # scanning never follows failure chains
+        fail = [0] * len(goto)
+        delta = [dict(edges) for edges in goto]
+        order = list(goto[0].values())
+        for state in order:
+            fail[state] = 0
+        head = 0
+        while head < len(order):
+            state = order[head]
+            head += 1
+            for char, nxt in goto[state].items():
+                order.append(nxt)
+                f = fail[state]
+                while f and char not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(char, 0)
+                outputs[nxt] = outputs[nxt] + outputs[fail[nxt]]
+        for state in order:
+            for char, target in delta[fail[state]].items():
+                delta[state].setdefault(char, target)
+
+        self.delta = delta
+        self.outputs = [tuple(out) for out in outputs]
+        # State reached by a single word break, where every phrase starts
+        self.space_state = goto[0].get(" ", 0)
+
+    def scan(self, text, state, previous):
+        """Scan text from a saved state; return (matches, state, last char)"""
+        delta = self.delta
+        outputs = self.outputs
+        matches = []
+        for char in text:
+            char = normalize_char(char)
+            if char == " " and previous == " ":
+                continue  # Collapse runs of separators
+            previous = char
+            state = delta[state].get(char, 0)
+            if outputs[state]:
+                matches.extend(outputs[state])
+        return matches, state, previous
+
+
+class StreamingSentimentClassifier:
+    def __init__(self, lexicon=None, half_life=3.0, enter_threshold=1.5, switch_ratio=1.5,
+                 exit_threshold=0.5, min_dwell=1.5, trigger_cooldown=1.0):
+        """Map streaming text to mood changes and animation triggers"""
+        self.automaton = PhraseAutomaton(DEFAULT_LEXICON if lexicon is None else lexicon)
+        self.half_life = half_life  # Seconds for a mood score to halve
+        self.enter_threshold = enter_threshold  # Score needed to leave the current mood
+        self.switch_ratio = switch_ratio  # Challenger must beat the current mood by this factor
+        self.exit_threshold = exit_threshold  # Below this the mood falls back to DEFAULT
+        self.min_dwell = min_dwell  # Seconds a mood is held before it may change again
+        self.trigger_cooldown = trigger_cooldown  # Seconds between repeats of a trigger
+
+        self.reset()
+
+    def reset(self):
+        """Forget scores and scanning state"""
+        self.state = self.automaton.space_state  # The stream starts at a word break
+        self.previous = " "
+        self.scores = {}
+        self.mood = DEFAULT
+        self.mood_since = None  # No switch yet: the first one needs no hold
+        self.last_decay = None
+        self.last_trigger = {}
+
+    def _decay(self, now):
+        if self.last_decay is not None and self.scores:
+            factor = 0.5 ** ((now - self.last_decay) / self.half_life)
+            for label in self.scores:
+                self.scores[label] *= factor
+        self.last_decay = now
+
+    def feed(self, text, now=None):
+        """Scan a chunk of streaming text; return a list of events
+
+        Events are ("mood", mood) or ("animation", LAUGH / CONFUSED).
+        """
+        if now is None:
+            now = time.monotonic()
+        self._decay(now)
+        matches, self.state, self.previous = self.automaton.scan(text, self.state, self.previous)
+
+        events = []
+        scores = self.scores
+        for label, weight in matches:
+            if label in TRIGGERS:
+                if now - self.last_trigger.get(label, -self.trigger_cooldown) >= self.trigger_cooldown:
+                    self.last_trigger[label] = now
+                    events.append(("animation", label))
+            else:
+                scores[label] = scores.get(label, 0.0) + weight
+
+        mood = self._choose_mood(now)
+        if mood != self.mood:
+            self.mood = mood
+            self.mood_since = now
+            events.append(("mood", mood))
+        return events
+
+    def end_of_line(self, now=None):
+        """Mark a word break (e.g. end of a transcript line) so trailing phrases match"""
+        return self.feed(" ", now)
+
+    def _choose_mood(self, now):
+        """Hysteresis: a mood must clearly win, and hold for min_dwell, before switching"""
+        if self.mood_since is not None and now - self.mood_since < self.min_dwell:
+            return self.mood
+        scores = self.scores
+        current = scores.get(self.mood, 0.0)
+        best = max(scores, key=scores.get) if scores else DEFAULT
+        best_score = scores.get(best, 0.0)
+        if (best != self.mood and best_score >= self.enter_threshold
+                and best_score >= current * self.switch_ratio):
+            return best
+        if self.mood != DEFAULT and current < self.exit_threshold and best_score < self.enter_threshold:
+            return DEFAULT
+        return self.mood
+
+
+class SentimentMoodMapper:
+    def __init__(self, eyes, classifier=None):
+        """Apply classifier events to a RoboEyes instance through its command queue"""
+        self.eyes = eyes
+        self.classifier = classifier or StreamingSentimentClassifier()
+
+    def feed(self, text, now=None):
+        """Classify streaming text and queue the resulting expression changes"""
+        events = self.classifier.feed(text, now)
+        for kind, value in events:
+            if kind == "mood":
+                self.eyes.post_command("set_mood", value)
+            elif value == LAUGH:
+                self.eyes.post_command("anim_laugh")
+            elif value == CONFUSED:
+                self.eyes.post_command("anim_confused")
+        return events
+
+    def feed_line(self, line, now=None):
+        """Classify one complete transcript line"""
+        return self.feed(line + "\n", now)
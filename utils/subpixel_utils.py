@@ -0,0 +1,101 @@
+"""
+Subpixel utilities for RoboEyes
+Handles subpixel-accurate eye drawing: each eye body is rendered once,
+supersampled and downscaled into an anti-aliased sprite for every
+fractional offset on a small phase grid (4x4 by default). At draw time the
+sprite matching the position's fractional part is blitted at the integer
+part, so slow drifts move smoothly with no per-frame anti-aliasing work.
+Sprites are cached per size bucket and stretched to the exact size, so
+sizes animating every frame (mood fades, blinks, audio squash) still hit
+the cache.
+"""
+
+import math
+from collections import OrderedDict
+
+import pygame
+
+from utils.glow_utils import SIZE_BUCKET
+
+WHITE = (255, 255, 255)
+# Transparent white: only alpha carries coverage, so downsampling doesn't darken edges
+TRANSPARENT = (255, 255, 255, 0)
+
+
+class SubpixelSpriteCache:
+    def __init__(self, shapes, phases=4, supersample=4, max_sprites=256):
+        """Bounded cache of phase-shifted, anti-aliased eye sprites"""
+        self.shapes = shapes
+        self.phases = phases  # Fractional offsets per axis
+        # Rasterization scale before downsampling; at least one step per phase
+        self.supersample = max(supersample, phases)
+        self.max_sprites = max_sprites
+        self._sprites = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def set_phases(self, phases):
+        """Change the phase grid (clears the cache)"""
+        self.phases = max(1, int(phases))
+        self.supersample = max(self.supersample, self.phases)
+        self._sprites.clear()
+        return True
+
+    def draw(self, screen, shape, x, y, width, height, color, is_left_eye):
+        """Blit one eye at a fractional position"""
+        width = int(round(width))
+        height = int(round(height))
+        if width <= 0 or height <= 0:
+            return
+        base_x = math.floor(x)
+        base_y = math.floor(y)
+        phases = self.phases
+        phase_x = min(phases - 1, int((x - base_x) * phases))
+        phase_y = min(phases - 1, int((y - base_y) * phases))
+        side = is_left_eye if shape == "angry" else None
+        bucket_w = max(SIZE_BUCKET, int(round(width / SIZE_BUCKET)) * SIZE_BUCKET)
+        bucket_h = max(SIZE_BUCKET, int(round(height / SIZE_BUCKET)) * SIZE_BUCKET)
+
+        key = (shape, side, bucket_w, bucket_h, phase_x, phase_y, color, self.shapes.cheap_shapes)
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            self.misses += 1
+            sprite = self._build(shape, is_left_eye, bucket_w, bucket_h, phase_x, phase_y, color)
+            self._sprites[key] = sprite
+            if len(self._sprites) > self.max_sprites:
+                self._sprites.popitem(last=False)
+        else:
+            self.hits += 1
+            self._sprites.move_to_end(key)
+        if bucket_w != width or bucket_h != height:
+            # Stretch the bucket's sprite (including its spare edge pixel) to the exact size
+            sprite = pygame.transform.smoothscale(sprite, (width + 1, height + 1))
+        screen.blit(sprite, (base_x, base_y))
+
+    def _build(self, shape, is_left_eye, width, height, phase_x, phase_y, color):
+        """Rasterize supersampled at the phase offset, then downsample with smoothscale"""
+        ss = self.supersample
+        # One spare pixel per axis holds the shifted anti-aliased edge
+        big = pygame.Surface(((width + 1) * ss, (height + 1) * ss), pygame.SRCALPHA)
+        big.fill(TRANSPARENT)
+        offset_x = phase_x * ss // self.phases
+        offset_y = phase_y * ss // self.phases
+        self.shapes.draw_shape(big, WHITE, shape, pygame.Rect(offset_x, offset_y, width * ss, height * ss),
+                               is_left_eye, bg_color=TRANSPARENT)
+        sprite = pygame.transform.smoothscale(big, (width + 1, height + 1))
+        # Tint the white coverage with the eye color, keeping the alpha edge
+        sprite.fill((color[0], color[1], color[2], 255), special_flags=pygame.BLEND_RGBA_MULT)
+        return sprite
+
+    def clear(self):
+        self._sprites.clear()
+
+    def get_cache_stats(self):
+        """Get sprite cache size and hit counters"""
+        total = self.hits + self.misses
+        return {
+            "sprites": len(self._sprites),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }